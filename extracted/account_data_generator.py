@@ -1,7 +1,15 @@
-import json
+import argparse
 import random
-from datetime import datetime, timedelta
-import uuid
+
+from company_names import CompanyNamer
+from generator_io import OUTPUT_FORMATS, default_output_path, open_writer
+from generator_metrics import add_metrics_arguments, metrics_from_args
+from generator_providers import (add_reference_date_arguments, day_label, phone_number, reference_date,
+                                 set_reference_date, zip_code)
+from generator_random import generate_uuid, make_rng, random_seed
+from generator_shards import add_shard_arguments, iter_shard_results, shard_ranges
+from generator_templates import TemplateSet
+from workload_profiles import DEFAULT_PROFILE, SkewSummary, add_profile_arguments, load_profile
 
 # Lists for generating random data
 industries = ["Technology", "Healthcare", "Finance", "Manufacturing", "Retail", "Education", 
@@ -33,199 +41,238 @@ cities_us = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philad
 
 account_statuses = ["Active", "Inactive", "Prospect", "Lead", "Customer", "Former Customer", "On Hold"]
 
+contact_first_names = ["John", "Jane", "Robert", "Mary", "Michael", "Linda", "William", "Patricia", "David", "Jennifer",
+                       "Richard", "Elizabeth", "Joseph", "Susan", "Thomas", "Jessica", "Charles", "Sarah", "Daniel", "Karen"]
+
+contact_last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+                      "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin"]
+
+contact_titles = ["CEO", "CTO", "CFO", "COO", "President", "Vice President", "Director", "Manager", "Supervisor",
+                  "Team Lead", "Specialist", "Analyst", "Coordinator", "Administrator", "Assistant"]
+
+letters = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T",
+           "U", "V", "W", "X", "Y", "Z"]
+
+street_names = ["Main", "First", "Second", "Third", "Fourth", "Fifth", "Oak", "Pine", "Maple", "Cedar", "Elm",
+                "Washington", "Lincoln", "Jefferson", "Roosevelt", "Madison", "Adams", "Wilson", "Jackson", "Monroe"]
+
+street_types = ["Street", "Avenue", "Boulevard", "Road", "Lane", "Drive", "Court", "Place", "Circle", "Way"]
+
+email_domains = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "aol.com", "protonmail.com"]
+
+email_first_names = [name.lower() for name in contact_first_names]
+
+email_last_names = [name.lower() for name in contact_last_names]
+
+email_generic_prefixes = ["info", "sales", "support", "contact"]
+
+account_owners = ["Alex Johnson", "Sam Williams", "Taylor Smith", "Jordan Brown", "Casey Davis"]
+
+# Default fan-out ranges (a WorkloadProfile can reshape or widen them)
+contacts_per_account = (1, 3)
+notes_per_account = (0, 5)
+
+# Templates and vocabularies for account notes
+note_templates = [
+    "Had a call with {contact_name} about their {topic}. They expressed interest in our {product} solution. Follow up in {days} days.",
+    "Met with {contact_name} to discuss {topic}. They have concerns about {concern} but are open to a proposal.",
+    "{contact_name} requested information about {topic}. Sent over materials and scheduled a follow-up for next {day_of_week}.",
+    "Quarterly review with {contact_name}. Account is {status}. Key issues: {concern}. Next steps: {next_steps}.",
+    "Support call with {contact_name} regarding {concern}. Issue {resolution_status}. Follow-up needed: {follow_up}.",
+    "Contract renewal discussion with {contact_name}. Current contract expires on {date}. They want to {renewal_action}.",
+    "Product demo for {contact_name} and team. They were particularly interested in {feature}. Questions about {topic}.",
+    "Strategy meeting with {contact_name}. Discussed expansion opportunities in {area}. They plan to {plan}.",
+    "Troubleshooting session with {contact_name} on {topic}. Issue was related to {concern}. Resolution: {resolution}.",
+    "Annual review with {contact_name}. Overall satisfaction: {satisfaction}. Areas for improvement: {improvement}."
+]
+
+topics = ["product features", "pricing", "implementation timeline", "technical specifications", "support options", 
+          "integration capabilities", "customization options", "training requirements", "contract terms", "expansion plans"]
+
+products = ["CRM", "ERP", "HCM", "SCM", "BI", "AI", "ML", "IoT", "Cloud", "Security", "Analytics", "Mobile", "Web", "Desktop"]
+
+concerns = ["pricing", "implementation timeline", "technical complexity", "resource requirements", "ROI", 
+            "compatibility", "scalability", "security", "compliance", "support availability"]
+
+days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+note_statuses = ["performing well", "stable", "growing", "declining", "at risk", "exceeding expectations", "below target"]
+
+note_next_steps = ["schedule follow-up call", "send proposal", "arrange demo", "provide case studies", 
+                   "connect with technical team", "review contract", "discuss discount options"]
+
+resolution_statuses = ["resolved", "pending", "escalated", "under investigation", "requires further action"]
+
+follow_ups = ["Yes", "No"]
+
+renewal_actions = ["renew at current terms", "upgrade package", "downgrade package", "renegotiate terms", 
+                   "evaluate competitors", "extend for short term", "cancel service"]
+
+features = ["reporting dashboard", "mobile access", "automation tools", "integration capabilities", 
+            "customization options", "user management", "analytics", "security features"]
+
+areas = ["North America", "Europe", "Asia", "Latin America", "Australia", "Africa", "Middle East"]
+
+plans = ["increase budget", "add more users", "expand to new department", "implement additional modules", 
+         "upgrade to premium tier", "pilot new features", "roll out globally"]
+
+resolutions = ["configuration change", "software update", "training provided", "workaround implemented", 
+               "feature request submitted", "bug fix scheduled", "hardware upgrade recommended"]
+
+satisfactions = ["Excellent", "Good", "Satisfactory", "Mixed", "Poor", "Very Poor"]
+
+improvements = ["response time", "product reliability", "feature set", "user interface", "documentation", 
+                "training materials", "support availability", "pricing structure"]
+
+# Function to generate a contract expiry date for the {date} note slot
+def generate_contract_date(rng=random):
+    return day_label(rng.randint(30, 365))
+
+# Note templates compiled once; {contact_name} is supplied per note, every other slot is drawn
+note_vocabularies = {
+    "topic": topics,
+    "product": products,
+    "days": lambda rng: str(rng.randint(3, 30)),
+    "concern": concerns,
+    "day_of_week": days_of_week,
+    "status": note_statuses,
+    "next_steps": note_next_steps,
+    "resolution_status": resolution_statuses,
+    "follow_up": follow_ups,
+    "date": generate_contract_date,
+    "renewal_action": renewal_actions,
+    "feature": features,
+    "area": areas,
+    "plan": plans,
+    "resolution": resolutions,
+    "satisfaction": satisfactions,
+    "improvement": improvements,
+}
+
+note_template_set = TemplateSet(note_templates, note_vocabularies)
+
 # Function to generate a random company name
-def generate_company_name():
-    name_pattern = random.choice([
-        f"{random.choice(company_prefixes)} {random.choice(company_suffixes)}",
-        f"{random.choice(company_prefixes)} {random.choice(company_descriptors)} {random.choice(company_suffixes)}",
-        f"{random.choice(company_prefixes)}{random.choice(company_suffixes)}",
-        f"{random.choice(['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z'])}-{random.choice(company_descriptors)}",
+def generate_company_name(rng=random):
+    name_pattern = rng.choice([
+        f"{rng.choice(company_prefixes)} {rng.choice(company_suffixes)}",
+        f"{rng.choice(company_prefixes)} {rng.choice(company_descriptors)} {rng.choice(company_suffixes)}",
+        f"{rng.choice(company_prefixes)}{rng.choice(company_suffixes)}",
+        f"{rng.choice(letters)}-{rng.choice(company_descriptors)}",
     ])
     return name_pattern
 
 # Function to generate a random address
-def generate_address():
-    country = random.choice(countries)
+def generate_address(rng=random):
+    country = rng.choice(countries)
     
     if country == "United States":
-        state = random.choice(states_us)
-        city = random.choice(cities_us)
+        state = rng.choice(states_us)
+        city = rng.choice(cities_us)
     else:
         state = ""
         city = f"{country} City"
     
-    street_number = random.randint(1, 9999)
-    street_name = f"{random.choice(['Main', 'First', 'Second', 'Third', 'Fourth', 'Fifth', 'Oak', 'Pine', 'Maple', 'Cedar', 'Elm', 'Washington', 'Lincoln', 'Jefferson', 'Roosevelt', 'Madison', 'Adams', 'Wilson', 'Jackson', 'Monroe'])} {random.choice(['Street', 'Avenue', 'Boulevard', 'Road', 'Lane', 'Drive', 'Court', 'Place', 'Circle', 'Way'])}"
-    
-    zip_code = f"{random.randint(10000, 99999)}"
+    street_number = rng.randint(1, 9999)
+    street_name = f"{rng.choice(street_names)} {rng.choice(street_types)}"
     
     return {
         "street": f"{street_number} {street_name}",
         "city": city,
         "state": state,
-        "zip": zip_code,
+        "zip": zip_code(rng),
         "country": country
     }
 
 # Function to generate a random phone number
-def generate_phone():
-    return f"+{random.randint(1, 9)}{random.randint(100, 999)}{random.randint(100, 999)}{random.randint(1000, 9999)}"
+def generate_phone(rng=random):
+    return phone_number(rng)
+
+# Function to derive a company's web/email domain from its name
+def company_domain(company_name):
+    return company_name.lower().replace(" ", "").replace("-", "") + ".com"
 
 # Function to generate a random email
-def generate_email(company_name):
-    domains = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "aol.com", "protonmail.com"]
-    company_domain = company_name.lower().replace(" ", "").replace("-", "") + ".com"
-    
-    if random.random() < 0.7:  # 70% chance of company email
-        email_domain = company_domain
+def generate_email(company_name, rng=random):
+    if rng.random() < 0.7:  # 70% chance of company email
+        email_domain = company_domain(company_name)
     else:
-        email_domain = random.choice(domains)
+        email_domain = rng.choice(email_domains)
     
-    first_names = ["john", "jane", "robert", "mary", "michael", "linda", "william", "patricia", "david", "jennifer", "richard", "elizabeth", "joseph", "susan", "thomas", "jessica", "charles", "sarah", "daniel", "karen"]
-    last_names = ["smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis", "rodriguez", "martinez", "hernandez", "lopez", "gonzalez", "wilson", "anderson", "thomas", "taylor", "moore", "jackson", "martin"]
-    
-    email_prefix = random.choice([
-        f"{random.choice(first_names)}.{random.choice(last_names)}",
-        f"{random.choice(first_names)}{random.choice(last_names)}",
-        f"{random.choice(first_names)[0]}{random.choice(last_names)}",
-        f"info",
-        f"sales",
-        f"support",
-        f"contact"
+    email_prefix = rng.choice([
+        f"{rng.choice(email_first_names)}.{rng.choice(email_last_names)}",
+        f"{rng.choice(email_first_names)}{rng.choice(email_last_names)}",
+        f"{rng.choice(email_first_names)[0]}{rng.choice(email_last_names)}",
+        *email_generic_prefixes
     ])
     
     return f"{email_prefix}@{email_domain}"
 
 # Function to generate a random date within the past 5 years
-def generate_date(days_ago_max=1825):  # 5 years = 1825 days
-    days_ago = random.randint(0, days_ago_max)
-    return (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+def generate_date(days_ago_max=1825, rng=random):  # 5 years = 1825 days
+    return day_label(-rng.randint(0, days_ago_max))
 
 # Function to generate random revenue
-def generate_revenue():
-    revenue_base = random.choice([
-        random.randint(10000, 999999),  # Small to medium
-        random.randint(1000000, 9999999),  # Medium to large
-        random.randint(10000000, 999999999)  # Large to enterprise
+def generate_revenue(rng=random):
+    revenue_base = rng.choice([
+        rng.randint(10000, 999999),  # Small to medium
+        rng.randint(1000000, 9999999),  # Medium to large
+        rng.randint(10000000, 999999999)  # Large to enterprise
     ])
     return revenue_base
 
 # Function to generate a random account
-def generate_account(account_id):
-    company_name = generate_company_name()
-    industry = random.choice(industries)
-    company_type = random.choice(company_types)
-    address = generate_address()
+# With annotate=True each note also gets an "entities" list of [slot, start, end]
+# spans locating its filled template slots in the content (see note_corpus.py);
+# the random draws, and so every other field, are the same either way.
+def generate_account(account_id, rng=random, company_name=None, profile=DEFAULT_PROFILE, annotate=False):
+    company_name = company_name or generate_company_name(rng)
+    industry = rng.choice(industries)
+    company_type = rng.choice(company_types)
+    address = generate_address(rng)
     
-    # Generate 1-3 random contacts for this account
-    num_contacts = random.randint(1, 3)
+    # Generate 1-3 random contacts for this account (or as many as the profile draws)
+    num_contacts = profile.count("contacts_per_account", rng, contacts_per_account)
     contacts = []
     
     for _ in range(num_contacts):
         contact = {
-            "contact_id": str(uuid.uuid4()),
-            "first_name": random.choice(["John", "Jane", "Robert", "Mary", "Michael", "Linda", "William", "Patricia", "David", "Jennifer", "Richard", "Elizabeth", "Joseph", "Susan", "Thomas", "Jessica", "Charles", "Sarah", "Daniel", "Karen"]),
-            "last_name": random.choice(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin"]),
-            "title": random.choice(["CEO", "CTO", "CFO", "COO", "President", "Vice President", "Director", "Manager", "Supervisor", "Team Lead", "Specialist", "Analyst", "Coordinator", "Administrator", "Assistant"]),
-            "email": generate_email(company_name),
-            "phone": generate_phone(),
+            "contact_id": generate_uuid(rng),
+            "first_name": rng.choice(contact_first_names),
+            "last_name": rng.choice(contact_last_names),
+            "title": rng.choice(contact_titles),
+            "email": generate_email(company_name, rng),
+            "phone": generate_phone(rng),
             "primary": _ == 0  # First contact is primary
         }
         contacts.append(contact)
     
-    # Generate 0-5 random notes for this account
-    num_notes = random.randint(0, 5)
+    # Generate 0-5 random notes for this account (or as many as the profile draws)
+    num_notes = profile.count("notes_per_account", rng, notes_per_account)
     notes = []
     
-    note_templates = [
-        "Had a call with {contact_name} about their {topic}. They expressed interest in our {product} solution. Follow up in {days} days.",
-        "Met with {contact_name} to discuss {topic}. They have concerns about {concern} but are open to a proposal.",
-        "{contact_name} requested information about {topic}. Sent over materials and scheduled a follow-up for next {day_of_week}.",
-        "Quarterly review with {contact_name}. Account is {status}. Key issues: {concern}. Next steps: {next_steps}.",
-        "Support call with {contact_name} regarding {concern}. Issue {resolution_status}. Follow-up needed: {follow_up}.",
-        "Contract renewal discussion with {contact_name}. Current contract expires on {date}. They want to {renewal_action}.",
-        "Product demo for {contact_name} and team. They were particularly interested in {feature}. Questions about {topic}.",
-        "Strategy meeting with {contact_name}. Discussed expansion opportunities in {area}. They plan to {plan}.",
-        "Troubleshooting session with {contact_name} on {topic}. Issue was related to {concern}. Resolution: {resolution}.",
-        "Annual review with {contact_name}. Overall satisfaction: {satisfaction}. Areas for improvement: {improvement}."
-    ]
-    
-    topics = ["product features", "pricing", "implementation timeline", "technical specifications", "support options", 
-              "integration capabilities", "customization options", "training requirements", "contract terms", "expansion plans"]
-    
-    products = ["CRM", "ERP", "HCM", "SCM", "BI", "AI", "ML", "IoT", "Cloud", "Security", "Analytics", "Mobile", "Web", "Desktop"]
-    
-    concerns = ["pricing", "implementation timeline", "technical complexity", "resource requirements", "ROI", 
-                "compatibility", "scalability", "security", "compliance", "support availability"]
-    
-    days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    
-    statuses = ["performing well", "stable", "growing", "declining", "at risk", "exceeding expectations", "below target"]
-    
-    next_steps = ["schedule follow-up call", "send proposal", "arrange demo", "provide case studies", 
-                  "connect with technical team", "review contract", "discuss discount options"]
-    
-    resolution_statuses = ["resolved", "pending", "escalated", "under investigation", "requires further action"]
-    
-    follow_ups = ["Yes", "No"]
-    
-    renewal_actions = ["renew at current terms", "upgrade package", "downgrade package", "renegotiate terms", 
-                       "evaluate competitors", "extend for short term", "cancel service"]
-    
-    features = ["reporting dashboard", "mobile access", "automation tools", "integration capabilities", 
-                "customization options", "user management", "analytics", "security features"]
-    
-    areas = ["North America", "Europe", "Asia", "Latin America", "Australia", "Africa", "Middle East"]
-    
-    plans = ["increase budget", "add more users", "expand to new department", "implement additional modules", 
-             "upgrade to premium tier", "pilot new features", "roll out globally"]
-    
-    resolutions = ["configuration change", "software update", "training provided", "workaround implemented", 
-                   "feature request submitted", "bug fix scheduled", "hardware upgrade recommended"]
-    
-    satisfactions = ["Excellent", "Good", "Satisfactory", "Mixed", "Poor", "Very Poor"]
-    
-    improvements = ["response time", "product reliability", "feature set", "user interface", "documentation", 
-                    "training materials", "support availability", "pricing structure"]
-    
     for i in range(num_notes):
         # Select a random contact from this account's contacts
-        contact = random.choice(contacts)
+        contact = rng.choice(contacts)
         contact_name = f"{contact['first_name']} {contact['last_name']}"
         
         # Generate a date for this note (more recent notes for lower i values)
-        note_date = generate_date(days_ago_max=365 - i*60)  # Spread notes over roughly a year
+        note_date = generate_date(days_ago_max=max(365 - i*60, 30), rng=rng)  # Spread notes over roughly a year
         
-        # Fill in the template with random values
-        template = random.choice(note_templates)
-        note_text = template.format(
-            contact_name=contact_name,
-            topic=random.choice(topics),
-            product=random.choice(products),
-            days=random.randint(3, 30),
-            concern=random.choice(concerns),
-            day_of_week=random.choice(days_of_week),
-            status=random.choice(statuses),
-            next_steps=random.choice(next_steps),
-            resolution_status=random.choice(resolution_statuses),
-            follow_up=random.choice(follow_ups),
-            date=(datetime.now() + timedelta(days=random.randint(30, 365))).strftime("%Y-%m-%d"),
-            renewal_action=random.choice(renewal_actions),
-            feature=random.choice(features),
-            area=random.choice(areas),
-            plan=random.choice(plans),
-            resolution=random.choice(resolutions),
-            satisfaction=random.choice(satisfactions),
-            improvement=random.choice(improvements)
-        )
+        # Fill in a randomly chosen template; only its own slots are drawn
+        if annotate:
+            note_text, spans = note_template_set.render_spans(rng, contact_name=contact_name)
+        else:
+            note_text = note_template_set.render(rng, contact_name=contact_name)
         
         note = {
-            "note_id": str(uuid.uuid4()),
+            "note_id": generate_uuid(rng),
             "date": note_date,
-            "author": random.choice(["Alex Johnson", "Sam Williams", "Taylor Smith", "Jordan Brown", "Casey Davis"]),
+            "author": profile.choose("account_owner", rng, account_owners),
             "content": note_text,
             "related_contact": contact["contact_id"]
         }
+        if annotate:
+            note["entities"] = [list(span) for span in spans]
         notes.append(note)
     
     return {
@@ -233,29 +280,82 @@ def generate_account(account_id):
         "company_name": company_name,
         "industry": industry,
         "company_type": company_type,
-        "annual_revenue": generate_revenue(),
-        "employee_count": random.randint(5, 10000),
-        "website": f"https://www.{company_name.lower().replace(' ', '').replace('-', '')}.com",
+        "annual_revenue": generate_revenue(rng),
+        "employee_count": rng.randint(5, 10000),
+        "website": f"https://www.{company_domain(company_name)}",
         "address": address,
-        "phone": generate_phone(),
-        "email": f"info@{company_name.lower().replace(' ', '').replace('-', '')}.com",
-        "status": random.choice(account_statuses),
-        "created_date": generate_date(),
-        "last_contact_date": generate_date(days_ago_max=90),
-        "account_owner": random.choice(["Alex Johnson", "Sam Williams", "Taylor Smith", "Jordan Brown", "Casey Davis"]),
+        "phone": generate_phone(rng),
+        "email": f"info@{company_domain(company_name)}",
+        "status": rng.choice(account_statuses),
+        "created_date": generate_date(rng=rng),
+        "last_contact_date": generate_date(days_ago_max=90, rng=rng),
+        "account_owner": profile.choose("account_owner", rng, account_owners),
         "contacts": contacts,
         "notes": notes
     }
 
-# Generate 50 accounts
-accounts = []
-for i in range(1, 51):
-    account_id = f"ACC{i:04d}"
-    account = generate_account(account_id)
-    accounts.append(account)
+# Function to lazily generate accounts ACC{start:04d} onwards, one at a time.
+# With a CompanyNamer, account ACCn is named by index n - 1, so names and domains never repeat.
+def generate_accounts(count, start=1, rng=random, namer=None, profile=DEFAULT_PROFILE, annotate=False):
+    for i in range(start, start + count):
+        yield generate_account(f"ACC{i:04d}", rng, namer.name(i - 1) if namer else None, profile, annotate)
+
+
+# Function to generate one shard's accounts (runs in a worker process)
+def _generate_account_shard(args):
+    seed, shard, start, count, namer, profile = args
+    return list(generate_accounts(count, start, make_rng(seed, shard), namer, profile))
+
+
+# Function to generate accounts ACC0001..ACC{count} split across shards, yielded in ID order.
+# Each shard owns a contiguous ID range and its own RNG, so the output depends only
+# on the seed and shard count, not on the number of workers.
+def generate_sharded_accounts(count, seed, shards=1, workers=1, unique_names=False, profile=DEFAULT_PROFILE):
+    namer = CompanyNamer(seed, count) if unique_names else None
+    shard_args = [(seed, shard, start, shard_count, namer, profile)
+                  for shard, (start, shard_count) in enumerate(shard_ranges(count, shards, start=1))]
+    if workers <= 1:
+        # In-process: stream each shard straight through instead of building its list
+        for seed, shard, start, shard_count, namer, profile in shard_args:
+            yield from generate_accounts(shard_count, start, make_rng(seed, shard), namer, profile)
+        return
+
+    for accounts in iter_shard_results(_generate_account_shard, shard_args, workers):
+        yield from accounts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate random CRM accounts.")
+    parser.add_argument("--count", type=int, default=50, help="number of accounts to generate")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="json",
+                        help="json writes a pretty-printed array, ndjson writes one compact record per line")
+    parser.add_argument("--output", help="output file (default: accounts.json or accounts.ndjson)")
+    parser.add_argument("--unique-names", action="store_true",
+                        help="give every account a distinct company name and domain (see company_names.py)")
+    add_shard_arguments(parser)
+    add_profile_arguments(parser)
+    add_reference_date_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    set_reference_date(args.reference_date)
+    seed = args.seed if args.seed is not None else random_seed()
+    shards = args.shards or args.workers
+    profile = load_profile(args.profile)
+    output = args.output or default_output_path("accounts", args.output_format)
+    skew = SkewSummary()
+    with metrics_from_args(args) as metrics:
+        accounts = generate_sharded_accounts(args.count, seed, shards, args.workers, args.unique_names, profile)
+        with metrics.timed_writer(open_writer(output, args.output_format), "accounts") as writer:
+            for account in skew.observe_accounts(accounts):
+                writer.write(account)
+    count = writer.count
+
+    print(f"Generated {count} accounts and saved to {output} "
+          f"(seed {seed}, {shards} shard(s), dates relative to {reference_date()})")
+    skew.report(profile, args.skew_report)
+    metrics.write_report(args.metrics, {"accounts": count}, [output], command="account_data_generator", seed=seed)
 
-# Save to JSON file
-with open('accounts.json', 'w') as f:
-    json.dump(accounts, f, indent=2)
 
-print(f"Generated {len(accounts)} accounts and saved to accounts.json")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import argparse
+import json
+import mmap
+import shutil
+import struct
+import tempfile
+from array import array
+from datetime import date
+
+import numpy as np
+
+from generator_io import iter_records
+
+# Compact columnar binary format for activities (.actcol).
+#
+# Layout:
+#   magic (8 bytes) | header length (uint32 LE) | JSON header | column data...
+#
+# Each column starts on an 8-byte boundary at the offset recorded in the header:
+#   - IDs ("ACT0042") are stored as their numeric part (uint32) plus the prefix
+#   - low-cardinality fields (type, status, priority, outcome, assigned_to, time)
+#     are dictionary-encoded as uint8 codes; code 0 is always None
+#   - dates are int32 proleptic Gregorian day numbers (date.toordinal())
+#   - duration_minutes is int16 with -1 for None
+#   - free text (description, notes) is a uint64 offsets array (rows + 1) plus a
+#     UTF-8 blob, with a uint8 validity column for nullable text
+#
+# The writer spills every column to its own temporary file as records stream
+# in, so memory stays flat. The reader memory-maps the file and exposes columns
+# as zero-copy NumPy views, so filters run over the code arrays without
+# deserializing any rows.
+
+MAGIC = b"ACTCOL1\0"
+FLUSH_ROWS = 65536
+ID_COLUMNS = {"activity_id": "ACT", "prospect_id": "PROS", "account_id": "ACC"}
+CATEGORICAL_COLUMNS = ["type", "status", "priority", "outcome", "assigned_to", "time"]
+TEXT_COLUMNS = ["description", "notes"]
+NULLABLE_TEXT_COLUMNS = {"notes"}
+
+# array typecodes / NumPy dtypes for each physical column kind
+_KINDS = {
+    "id": ("I", "<u4"),
+    "code": ("B", "u1"),
+    "day": ("i", "<i4"),
+    "int16": ("h", "<i2"),
+    "offsets": ("Q", "<u8"),
+    "valid": ("B", "u1"),
+}
+
+
+class _SpillColumn:
+    """An append-only typed column buffered in memory and spilled to a temp file."""
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.file = tempfile.TemporaryFile()
+        self.buffer = array(_KINDS[kind][0]) if kind != "blob" else bytearray()
+        self.size = 0
+
+    def append(self, value):
+        self.buffer.append(value)
+
+    def extend(self, data):
+        self.buffer.extend(data)
+
+    def flush(self):
+        data = self.buffer.tobytes() if isinstance(self.buffer, array) else bytes(self.buffer)
+        self.file.write(data)
+        self.size += len(data)
+        del self.buffer[:]
+
+
+class ActivityColumnWriter:
+    """Record sink that writes activities to a .actcol file (same write()/count interface as generator_io)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.dictionaries = {name: [None] for name in CATEGORICAL_COLUMNS}
+        self._codes = {name: {None: 0} for name in CATEGORICAL_COLUMNS}
+        self._day_numbers = {}
+        self._text_offsets = {name: 0 for name in TEXT_COLUMNS}
+
+        self._columns = {}
+        for name in ID_COLUMNS:
+            self._columns[name] = _SpillColumn(name, "id")
+        for name in CATEGORICAL_COLUMNS:
+            self._columns[name] = _SpillColumn(name, "code")
+        self._columns["date"] = _SpillColumn("date", "day")
+        self._columns["duration_minutes"] = _SpillColumn("duration_minutes", "int16")
+        for name in TEXT_COLUMNS:
+            offsets = self._columns[f"{name}.offsets"] = _SpillColumn(f"{name}.offsets", "offsets")
+            offsets.append(0)
+            self._columns[f"{name}.blob"] = _SpillColumn(f"{name}.blob", "blob")
+            if name in NULLABLE_TEXT_COLUMNS:
+                self._columns[f"{name}.valid"] = _SpillColumn(f"{name}.valid", "valid")
+
+    def _code(self, name, value):
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            if code > 255:
+                raise ValueError(f"column {name!r} has more than 255 distinct values")
+            codes[value] = code
+            self.dictionaries[name].append(value)
+        return code
+
+    def _day_number(self, value):
+        day = self._day_numbers.get(value)
+        if day is None:
+            day = self._day_numbers[value] = date.fromisoformat(value).toordinal()
+        return day
+
+    def write(self, activity):
+        columns = self._columns
+        for name, prefix in ID_COLUMNS.items():
+            columns[name].append(int(activity[name][len(prefix):]))
+        for name in CATEGORICAL_COLUMNS:
+            columns[name].append(self._code(name, activity[name]))
+        columns["date"].append(self._day_number(activity["date"]))
+        duration = activity["duration_minutes"]
+        columns["duration_minutes"].append(-1 if duration is None else duration)
+        for name in TEXT_COLUMNS:
+            text = activity[name]
+            if name in NULLABLE_TEXT_COLUMNS:
+                columns[f"{name}.valid"].append(text is not None)
+            data = (text or "").encode("utf-8")
+            columns[f"{name}.blob"].extend(data)
+            self._text_offsets[name] += len(data)
+            columns[f"{name}.offsets"].append(self._text_offsets[name])
+
+        self.count += 1
+        if self.count % FLUSH_ROWS == 0:
+            for column in columns.values():
+                column.flush()
+
+    def close(self):
+        for column in self._columns.values():
+            column.flush()
+
+        # Lay out the columns after the header, each aligned to 8 bytes
+        layout = []
+        offset = 0
+        for column in self._columns.values():
+            offset = (offset + 7) & ~7
+            layout.append({"name": column.name, "kind": column.kind, "offset": offset, "size": column.size})
+            offset += column.size
+        header = {
+            "rows": self.count,
+            "id_prefixes": ID_COLUMNS,
+            "dictionaries": self.dictionaries,
+            "columns": layout,
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = (len(MAGIC) + 4 + len(header_bytes) + 7) & ~7
+
+        with open(self.path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for entry, column in zip(layout, self._columns.values()):
+                f.write(b"\0" * (data_start + entry["offset"] - f.tell()))
+                column.file.seek(0)
+                shutil.copyfileobj(column.file, f)
+                column.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ActivityColumnReader:
+    """Memory-mapped reader for .actcol files.
+
+    column(name) returns a zero-copy NumPy view of the stored values (codes for
+    categoricals, day numbers for dates, numeric parts for IDs). where() builds
+    a boolean mask from the code arrays, so filters never touch row data.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an activity column file")
+        (header_length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mm[header_start:header_start + header_length])
+        data_start = (header_start + header_length + 7) & ~7
+
+        self.row_count = header["rows"]
+        self.id_prefixes = header["id_prefixes"]
+        self.dictionaries = header["dictionaries"]
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in self.dictionaries.items()}
+        self._views = {}
+        for entry in header["columns"]:
+            if entry["kind"] == "blob":
+                view = memoryview(self._mm)[data_start + entry["offset"]:data_start + entry["offset"] + entry["size"]]
+            else:
+                dtype = np.dtype(_KINDS[entry["kind"]][1])
+                view = np.frombuffer(self._mm, dtype=dtype, count=entry["size"] // dtype.itemsize,
+                                     offset=data_start + entry["offset"])
+            self._views[entry["name"]] = view
+
+    def __len__(self):
+        return self.row_count
+
+    # Arrays handed out by column() stay valid after close(): while any are still referenced the
+    # mapping can't be unmapped, so it is left for the garbage collector to release with them
+    def close(self):
+        for view in self._views.values():
+            if isinstance(view, memoryview):
+                view.release()
+        self._views.clear()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Function to get a zero-copy view of a stored column
+    def column(self, name):
+        return self._views[name]
+
+    # Function to get the code for a categorical value (-1 if it never occurs, so it matches nothing)
+    def code(self, name, value):
+        return self._codes[name].get(value, -1)
+
+    # Function to build a boolean row mask from equality filters, e.g. where(priority="High").
+    # Categorical filters compare codes; ID filters compare numeric parts; a list/tuple/set means "any of".
+    def where(self, **filters):
+        mask = np.ones(self.row_count, dtype=bool)
+        for name, value in filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if name in self._codes:
+                wanted = [self.code(name, v) for v in values]
+            elif name in self.id_prefixes:
+                prefix = self.id_prefixes[name]
+                wanted = [int(v[len(prefix):]) if isinstance(v, str) else v for v in values]
+            else:
+                raise KeyError(f"can't filter on column {name!r}")
+            mask &= np.isin(self._views[name], wanted)
+        return mask
+
+    # Function to get a boolean mask for dates in [start, end] (ISO strings or date objects)
+    def date_between(self, start, end):
+        start = date.fromisoformat(start) if isinstance(start, str) else start
+        end = date.fromisoformat(end) if isinstance(end, str) else end
+        days = self._views["date"]
+        return (days >= start.toordinal()) & (days <= end.toordinal())
+
+    # Function to get matching row indices for equality filters
+    def find(self, **filters):
+        return np.flatnonzero(self.where(**filters))
+
+    def _text(self, name, i):
+        if name in NULLABLE_TEXT_COLUMNS and not self._views[f"{name}.valid"][i]:
+            return None
+        offsets = self._views[f"{name}.offsets"]
+        return bytes(self._views[f"{name}.blob"][offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    # Function to materialize one row back into the generator's activity dict shape
+    def row(self, i):
+        i = int(i)
+        record = {}
+        for name, prefix in self.id_prefixes.items():
+            record[name] = f"{prefix}{int(self._views[name][i]):04d}"
+        activity = {
+            "activity_id": record["activity_id"],
+            "prospect_id": record["prospect_id"],
+            "account_id": record["account_id"],
+            "type": self.dictionaries["type"][self._views["type"][i]],
+            "description": self._text("description", i),
+            "date": date.fromordinal(int(self._views["date"][i])).isoformat(),
+            "time": self.dictionaries["time"][self._views["time"][i]],
+            "status": self.dictionaries["status"][self._views["status"][i]],
+            "priority": self.dictionaries["priority"][self._views["priority"][i]],
+            "assigned_to": self.dictionaries["assigned_to"][self._views["assigned_to"][i]],
+            "outcome": self.dictionaries["outcome"][self._views["outcome"][i]],
+            "notes": self._text("notes", i),
+        }
+        duration = int(self._views["duration_minutes"][i])
+        activity["duration_minutes"] = None if duration < 0 else duration
+        return activity
+
+    # Function to materialize rows for a mask or index array
+    def rows(self, selection=None):
+        if selection is None:
+            indices = range(self.row_count)
+        elif getattr(selection, "dtype", None) == bool:
+            indices = np.flatnonzero(selection)
+        else:
+            indices = selection
+        for i in indices:
+            yield self.row(i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an activities file (JSON array or NDJSON) to .actcol.")
+    parser.add_argument("--activities", default="activities.json", help="activities file to convert")
+    parser.add_argument("--output", default="activities.actcol", help="columnar file to write")
+    args = parser.parse_args()
+
+    with ActivityColumnWriter(args.output) as writer:
+        for activity in iter_records(args.activities):
+            writer.write(activity)
+    print(f"Wrote {writer.count} activities to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
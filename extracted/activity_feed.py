@@ -0,0 +1,174 @@
+import argparse
+import heapq
+import json
+import os
+import shutil
+import tempfile
+
+from generator_io import OUTPUT_FORMATS, iter_records, open_writer
+
+# Globally time-ordered activity feed with bounded memory.
+#
+# Generated activities come out grouped by prospect, with dates spread over
+# the last 90 days and the next 30. TimeOrderedWriter wraps any activities
+# sink and re-emits everything in (date, time, activity number) order:
+#
+#   1. each prospect's activities (consecutive records with the same
+#      prospect_id) are sorted as a small group
+#   2. groups are collected into a run of up to `run_records` activities,
+#      k-way merged with heapq.merge and spilled to a temporary NDJSON file
+#   3. close() k-way merges all runs into the wrapped sink
+#
+# Memory is one run plus one buffered record per run file; when more than
+# MAX_RUNS runs pile up they are merged into one first, so open files stay
+# bounded too. A run is held as slotted Activity records (see record_model.py),
+# a fraction of the size of the parsed dicts, and converted back to dicts as it
+# is written out. The result is ordinary NDJSON/JSON (or any other sink), e.g.
+# the --activities input of replay_notes.py.
+#
+#   python generate_dataset.py --count 100000 --time-ordered
+#   python activity_feed.py --activities activities.ndjson --output feed.ndjson
+
+RUN_RECORDS = 200000
+MAX_RUNS = 128
+
+_compact_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+# Function to get an activity's position in the feed: date, then time (unscheduled first), then ID number
+def activity_sort_key(activity):
+    return activity["date"], activity["time"] or "", int(activity["activity_id"][3:])
+
+
+# Function to get a held Activity record's position in the feed (day numbers sort like ISO dates)
+def _record_sort_key(record):
+    return record.date, record["time"] or "", record.activity_id
+
+
+def _to_dicts(records):
+    for record in records:
+        yield record.to_dict()
+
+
+# Function to k-way merge NDJSON run files into one record stream
+def _merge_runs(paths):
+    files = [open(path, encoding="utf-8") for path in paths]
+    try:
+        streams = [map(json.loads, f) for f in files]
+        yield from heapq.merge(*streams, key=activity_sort_key)
+    finally:
+        for f in files:
+            f.close()
+
+
+class TimeOrderedWriter:
+    """Activities sink that forwards records to `writer` in global time order when closed.
+
+    Same write()/count/close() interface as the generator_io writers, so it can
+    stand in for any activities sink.
+    """
+
+    def __init__(self, writer, run_records=RUN_RECORDS, directory=None):
+        self.writer = writer
+        self.run_records = run_records
+        self.count = 0
+        self.runs = []
+        # Imported here: record_model takes its vocabularies from the generators, which import this module
+        from record_model import Activity
+        self._to_record = Activity.from_dict
+        self._directory = tempfile.mkdtemp(prefix="activity_feed_", dir=directory)
+        self._run_number = 0
+        self._groups = []
+        self._buffered = 0
+        self._group = []
+
+    def write(self, activity):
+        if self._group and activity["prospect_id"] != self._group[-1]["prospect_id"]:
+            self._end_group()
+        self._group.append(activity)
+        self.count += 1
+
+    def _end_group(self):
+        group = self._group
+        self._group = []
+        keys = [activity_sort_key(activity) for activity in group]
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            group = [activity for _, activity in sorted(zip(keys, group), key=lambda pair: pair[0])]
+        self._groups.append([self._to_record(activity) for activity in group])
+        self._buffered += len(group)
+        if self._buffered >= self.run_records:
+            self._spill()
+
+    def _new_run_path(self):
+        self._run_number += 1
+        return os.path.join(self._directory, f"run-{self._run_number:06d}.ndjson")
+
+    # Function to write records to a new run file and return its path
+    def _write_run(self, records):
+        path = self._new_run_path()
+        encode = _compact_encoder.encode
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(encode(record) + "\n")
+        return path
+
+    def _spill(self):
+        if not self._groups:
+            return
+        self.runs.append(self._write_run(_to_dicts(heapq.merge(*self._groups, key=_record_sort_key))))
+        self._groups = []
+        self._buffered = 0
+        if len(self.runs) >= MAX_RUNS:
+            merged = self._write_run(_merge_runs(self.runs))
+            for path in self.runs:
+                os.remove(path)
+            self.runs = [merged]
+
+    def close(self):
+        try:
+            if self._group:
+                self._end_group()
+            if not self.runs:
+                # Everything fit in one run: merge the groups straight into the sink
+                records = _to_dicts(heapq.merge(*self._groups, key=_record_sort_key))
+            else:
+                self._spill()
+                records = _merge_runs(self.runs)
+            for record in records:
+                self.writer.write(record)
+            self._groups = []
+        finally:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Function to add the --time-ordered option to a generator's parser
+def add_time_ordered_arguments(parser):
+    parser.add_argument("--time-ordered", action="store_true",
+                        help="write activities in global date/time order (see activity_feed.py)")
+    parser.add_argument("--run-records", type=int, default=RUN_RECORDS,
+                        help="activities sorted in memory per run with --time-ordered")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite an activities file in global date/time order.")
+    parser.add_argument("--activities", default="activities.json", help="activities file (any generator format)")
+    parser.add_argument("--output", default="activities_feed.ndjson", help="time-ordered output file")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="ndjson")
+    parser.add_argument("--run-records", type=int, default=RUN_RECORDS, help="activities sorted in memory per run")
+    args = parser.parse_args()
+
+    with TimeOrderedWriter(open_writer(args.output, args.output_format), args.run_records) as feed:
+        for activity in iter_records(args.activities):
+            feed.write(activity)
+    print(f"Wrote {feed.count} activities to {args.output} in time order ({max(len(feed.runs), 1)} runs merged)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+import argparse
+import uuid
+
+import numpy as np
+
+import account_data_generator as acc
+import prospect_activity_generator as pag
+from generator_io import OUTPUT_FORMATS, default_output_path, write_records
+from generator_providers import DAYS_AHEAD, DAYS_BACK, add_reference_date_arguments, date_table, set_reference_date
+from generator_random import random_seed
+
+# NumPy batch engine for accounts and prospects.
+#
+# The scalar generators spend almost all their time in per-field random.choice /
+# random.randint calls. Here a whole batch is drawn column by column with
+# vectorized draws (category indices, integer ranges, day offsets), and records
+# are only assembled into dicts when they are iterated for output. Field schema
+# and value distributions match generate_account() and generate_prospect().
+
+DEFAULT_BATCH_SIZE = 50000
+
+# Day offsets covered by the date lookup table: 5 years back to 1 year ahead
+_MIN_DAY_OFFSET = -DAYS_BACK
+_MAX_DAY_OFFSET = DAYS_AHEAD
+
+
+# Function to get the list of "%Y-%m-%d" strings for every day offset the generators use
+def _build_date_table():
+    return date_table().labels
+
+
+# Function to draw `size` inclusive integers in [low, high]; low/high may be arrays
+def _between(rng, low, high, size):
+    return rng.integers(low, np.asarray(high) + 1, size=size)
+
+
+# Function to draw `size` indices into a list of length `n`
+def _pick(rng, n, size):
+    return rng.integers(0, n, size=size)
+
+
+# Function to expand per-parent counts into (parent index, position within parent) arrays
+def _expand(counts):
+    parents = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    positions = np.arange(len(parents)) - np.repeat(starts, counts)
+    return parents, positions, starts
+
+
+# Function to turn a block of random bytes into version 4 UUID strings
+def _uuids(rng, size):
+    raw = rng.bytes(16 * size)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * size, 16)]
+
+
+# Function to convert an object's NumPy columns to plain lists once drawing is done.
+# Record assembly indexes columns one element at a time, which is far cheaper on
+# lists than on arrays, and it keeps NumPy scalar types out of the JSON output.
+def _columns_to_lists(obj):
+    for name, value in vars(obj).items():
+        if isinstance(value, np.ndarray):
+            setattr(obj, name, value.tolist())
+        elif isinstance(value, dict):
+            setattr(obj, name, {key: column.tolist() for key, column in value.items()})
+
+
+# Function to render a phone number column set into strings
+def _phones(a, b, c, d):
+    return [f"+{w}{x}{y}{z}" for w, x, y, z in zip(a.tolist(), b.tolist(), c.tolist(), d.tolist())]
+
+
+def _draw_phones(rng, size):
+    return _phones(_between(rng, 1, 9, size), _between(rng, 100, 999, size),
+                   _between(rng, 100, 999, size), _between(rng, 1000, 9999, size))
+
+
+class AccountBatch:
+    """Column arrays for a batch of accounts; iterate to get account dicts."""
+
+    def __init__(self, rng, count, first_id=1, date_table=None):
+        self.count = count
+        self.first_id = first_id
+        self.dates = date_table or _build_date_table()
+        n = count
+
+        # Company names: draw every component column, pick one of the four patterns per row
+        self.name_pattern = _pick(rng, 4, n)
+        self.name_prefix = _pick(rng, len(acc.company_prefixes), n)
+        self.name_suffix = _pick(rng, len(acc.company_suffixes), n)
+        self.name_descriptor = _pick(rng, len(acc.company_descriptors), n)
+        self.name_letter = _pick(rng, len(acc.letters), n)
+
+        self.industry = _pick(rng, len(acc.industries), n)
+        self.company_type = _pick(rng, len(acc.company_types), n)
+
+        self.country = _pick(rng, len(acc.countries), n)
+        self.state = _pick(rng, len(acc.states_us), n)
+        self.city = _pick(rng, len(acc.cities_us), n)
+        self.street_number = _between(rng, 1, 9999, n)
+        self.street_name = _pick(rng, len(acc.street_names), n)
+        self.street_type = _pick(rng, len(acc.street_types), n)
+        self.zip = _between(rng, 10000, 99999, n)
+
+        # Revenue: pick one of three bands uniformly, then a value within the band
+        revenue_band = _pick(rng, 3, n)
+        self.revenue = _between(rng, np.array([10000, 1000000, 10000000])[revenue_band],
+                                np.array([999999, 9999999, 999999999])[revenue_band], n)
+        self.employee_count = _between(rng, 5, 10000, n)
+        self.phone = _draw_phones(rng, n)
+        self.status = _pick(rng, len(acc.account_statuses), n)
+        self.created_offset = _between(rng, 0, 1825, n)
+        self.last_contact_offset = _between(rng, 0, 90, n)
+        self.owner = _pick(rng, len(acc.account_owners), n)
+
+        # Contacts: 1-3 per account
+        self.num_contacts = _between(rng, 1, 3, n)
+        self.contact_account, self.contact_position, self.contact_start = _expand(self.num_contacts)
+        m = len(self.contact_account)
+        self.contact_id = _uuids(rng, m)
+        self.contact_first = _pick(rng, len(acc.contact_first_names), m)
+        self.contact_last = _pick(rng, len(acc.contact_last_names), m)
+        self.contact_title = _pick(rng, len(acc.contact_titles), m)
+        self.contact_phone = _draw_phones(rng, m)
+        self.email_company = rng.random(m) < 0.7  # 70% chance of company email
+        self.email_domain = _pick(rng, len(acc.email_domains), m)
+        self.email_pattern = _pick(rng, 3 + len(acc.email_generic_prefixes), m)
+        self.email_first = _pick(rng, len(acc.email_first_names), m)
+        self.email_last = _pick(rng, len(acc.email_last_names), m)
+
+        # Notes: 0-5 per account, each tied to one of the account's contacts
+        self.num_notes = _between(rng, 0, 5, n)
+        self.note_account, note_position, self.note_start = _expand(self.num_notes)
+        k = len(self.note_account)
+        self.note_id = _uuids(rng, k)
+        self.note_contact = (self.contact_start[self.note_account]
+                             + (rng.random(k) * self.num_contacts[self.note_account]).astype(np.int64))
+        # More recent notes for lower positions, spread over roughly a year
+        self.note_offset = _between(rng, 0, 365 - note_position * 60, k)
+        self.note_author = _pick(rng, len(acc.account_owners), k)
+        self.note_template = _pick(rng, len(acc.note_template_set), k)
+        self.note_slots = {
+            "topic": _pick(rng, len(acc.topics), k),
+            "product": _pick(rng, len(acc.products), k),
+            "days": _between(rng, 3, 30, k),
+            "concern": _pick(rng, len(acc.concerns), k),
+            "day_of_week": _pick(rng, len(acc.days_of_week), k),
+            "status": _pick(rng, len(acc.note_statuses), k),
+            "next_steps": _pick(rng, len(acc.note_next_steps), k),
+            "resolution_status": _pick(rng, len(acc.resolution_statuses), k),
+            "follow_up": _pick(rng, len(acc.follow_ups), k),
+            "date": _between(rng, 30, 365, k),
+            "renewal_action": _pick(rng, len(acc.renewal_actions), k),
+            "feature": _pick(rng, len(acc.features), k),
+            "area": _pick(rng, len(acc.areas), k),
+            "plan": _pick(rng, len(acc.plans), k),
+            "resolution": _pick(rng, len(acc.resolutions), k),
+            "satisfaction": _pick(rng, len(acc.satisfactions), k),
+            "improvement": _pick(rng, len(acc.improvements), k),
+        }
+        _columns_to_lists(self)
+
+    def __len__(self):
+        return self.count
+
+    def _company_name(self, i):
+        pattern = self.name_pattern[i]
+        prefix = acc.company_prefixes[self.name_prefix[i]]
+        suffix = acc.company_suffixes[self.name_suffix[i]]
+        descriptor = acc.company_descriptors[self.name_descriptor[i]]
+        if pattern == 0:
+            return f"{prefix} {suffix}"
+        if pattern == 1:
+            return f"{prefix} {descriptor} {suffix}"
+        if pattern == 2:
+            return f"{prefix}{suffix}"
+        return f"{acc.letters[self.name_letter[i]]}-{descriptor}"
+
+    def _email(self, j, domain):
+        if not self.email_company[j]:
+            domain = acc.email_domains[self.email_domain[j]]
+        pattern = self.email_pattern[j]
+        first = acc.email_first_names[self.email_first[j]]
+        last = acc.email_last_names[self.email_last[j]]
+        if pattern == 0:
+            prefix = f"{first}.{last}"
+        elif pattern == 1:
+            prefix = f"{first}{last}"
+        elif pattern == 2:
+            prefix = f"{first[0]}{last}"
+        else:
+            prefix = acc.email_generic_prefixes[pattern - 3]
+        return f"{prefix}@{domain}"
+
+    def _address(self, i):
+        country = acc.countries[self.country[i]]
+        if country == "United States":
+            state = acc.states_us[self.state[i]]
+            city = acc.cities_us[self.city[i]]
+        else:
+            state = ""
+            city = f"{country} City"
+        return {
+            "street": f"{self.street_number[i]} {acc.street_names[self.street_name[i]]} {acc.street_types[self.street_type[i]]}",
+            "city": city,
+            "state": state,
+            "zip": f"{self.zip[i]}",
+            "country": country
+        }
+
+    def _note_content(self, j, contact_name):
+        # Only the chosen template's slots are looked up; "days" and "date" are drawn as numbers
+        template = acc.note_template_set[self.note_template[j]]
+        values = {"contact_name": contact_name}
+        for slot in template.slots:
+            if slot == "contact_name":
+                continue
+            value = self.note_slots[slot][j]
+            if slot == "date":
+                value = self.dates[value - _MIN_DAY_OFFSET]
+            elif slot != "days":
+                value = acc.note_vocabularies[slot][value]
+            values[slot] = value
+        return template.format(values)
+
+    def _past_date(self, offset):
+        return self.dates[-offset - _MIN_DAY_OFFSET]
+
+    def records(self):
+        for i in range(self.count):
+            company_name = self._company_name(i)
+            domain = acc.company_domain(company_name)
+
+            contacts = []
+            start = self.contact_start[i]
+            for j in range(start, start + self.num_contacts[i]):
+                contacts.append({
+                    "contact_id": self.contact_id[j],
+                    "first_name": acc.contact_first_names[self.contact_first[j]],
+                    "last_name": acc.contact_last_names[self.contact_last[j]],
+                    "title": acc.contact_titles[self.contact_title[j]],
+                    "email": self._email(j, domain),
+                    "phone": self.contact_phone[j],
+                    "primary": j == start  # First contact is primary
+                })
+
+            notes = []
+            start = self.note_start[i]
+            for j in range(start, start + self.num_notes[i]):
+                contact = contacts[self.note_contact[j] - self.contact_start[i]]
+                notes.append({
+                    "note_id": self.note_id[j],
+                    "date": self._past_date(self.note_offset[j]),
+                    "author": acc.account_owners[self.note_author[j]],
+                    "content": self._note_content(j, f"{contact['first_name']} {contact['last_name']}"),
+                    "related_contact": contact["contact_id"]
+                })
+
+            yield {
+                "account_id": f"ACC{self.first_id + i:04d}",
+                "company_name": company_name,
+                "industry": acc.industries[self.industry[i]],
+                "company_type": acc.company_types[self.company_type[i]],
+                "annual_revenue": int(self.revenue[i]),
+                "employee_count": int(self.employee_count[i]),
+                "website": f"https://www.{domain}",
+                "address": self._address(i),
+                "phone": self.phone[i],
+                "email": f"info@{domain}",
+                "status": acc.account_statuses[self.status[i]],
+                "created_date": self._past_date(self.created_offset[i]),
+                "last_contact_date": self._past_date(self.last_contact_offset[i]),
+                "account_owner": acc.account_owners[self.owner[i]],
+                "contacts": contacts,
+                "notes": notes
+            }
+
+    __iter__ = records
+
+
+# Status-indexed lookup arrays for the prospect value and probability bands
+_status_value_low = np.array([pag.estimated_value_ranges[s][0] for s in pag.prospect_statuses])
+_status_value_high = np.array([pag.estimated_value_ranges[s][1] for s in pag.prospect_statuses])
+_status_probability_low = np.array([pag.probability_ranges[s][0] for s in pag.prospect_statuses])
+_status_probability_high = np.array([pag.probability_ranges[s][1] for s in pag.prospect_statuses])
+
+
+class ProspectBatch:
+    """Column arrays for the prospects of a list of accounts; iterate to get prospect dicts."""
+
+    def __init__(self, rng, accounts, first_id=1, date_table=None):
+        self.accounts = accounts
+        self.first_id = first_id
+        self.dates = date_table or _build_date_table()
+        n = len(accounts)
+
+        # 1-3 prospects per account
+        self.num_prospects = _between(rng, 1, 3, n)
+        self.account_index, _, _ = _expand(self.num_prospects)
+        m = len(self.account_index)
+        self.count = m
+
+        # Pick one of the account's contacts (or fall back to random contact info)
+        num_contacts = np.array([len(account["contacts"]) for account in accounts], dtype=np.int64)[self.account_index]
+        self.contact = (rng.random(m) * num_contacts).astype(np.int64)
+        self.fallback_first = _pick(rng, len(pag.fallback_first_names), m)
+        self.fallback_last = _pick(rng, len(pag.fallback_last_names), m)
+        self.fallback_title = _pick(rng, len(pag.fallback_titles), m)
+        self.fallback_phone = _draw_phones(rng, m)
+
+        self.status = _pick(rng, len(pag.prospect_statuses), m)
+        self.estimated_value = _between(rng, _status_value_low[self.status], _status_value_high[self.status], m)
+        self.probability = _between(rng, _status_probability_low[self.status], _status_probability_high[self.status], m)
+        self.source = _pick(rng, len(pag.prospect_sources), m)
+        self.created_offset = _between(rng, 0, 365, m)
+        self.last_contact_offset = _between(rng, 0, 30, m)
+        # 1-3 distinct interests: the first k entries of a random permutation per row
+        self.num_interests = _between(rng, 1, 3, m)
+        self.interests = np.argsort(rng.random((m, len(pag.prospect_interests))), axis=1)[:, :3]
+        self.assigned_to = _pick(rng, len(pag.sales_reps), m)
+        self.next_step = _pick(rng, len(pag.prospect_next_steps), m)
+        _columns_to_lists(self)
+
+    def __len__(self):
+        return self.count
+
+    def _past_date(self, offset):
+        return self.dates[-offset - _MIN_DAY_OFFSET]
+
+    def records(self):
+        for j in range(self.count):
+            account = self.accounts[self.account_index[j]]
+            if account["contacts"]:
+                contact = account["contacts"][self.contact[j]]
+                first_name = contact["first_name"]
+                last_name = contact["last_name"]
+                email = contact["email"]
+                phone = contact["phone"]
+                title = contact["title"]
+            else:
+                first_name = pag.fallback_first_names[self.fallback_first[j]]
+                last_name = pag.fallback_last_names[self.fallback_last[j]]
+                email = f"{first_name.lower()}.{last_name.lower()}@{account['company_name'].lower().replace(' ', '').replace('-', '')}.com"
+                phone = self.fallback_phone[j]
+                title = pag.fallback_titles[self.fallback_title[j]]
+
+            yield {
+                "prospect_id": f"PROS{self.first_id + j:04d}",
+                "account_id": account["account_id"],
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "phone": phone,
+                "title": title,
+                "status": pag.prospect_statuses[self.status[j]],
+                "source": pag.prospect_sources[self.source[j]],
+                "created_date": self._past_date(self.created_offset[j]),
+                "last_contact_date": self._past_date(self.last_contact_offset[j]),
+                "estimated_value": int(self.estimated_value[j]),
+                "probability": int(self.probability[j]),
+                "interests": [pag.prospect_interests[k] for k in self.interests[j][:self.num_interests[j]]],
+                "assigned_to": pag.sales_reps[self.assigned_to[j]],
+                "next_step": pag.prospect_next_steps[self.next_step[j]]
+            }
+
+    __iter__ = records
+
+
+# Function to generate `count` accounts in batches of `batch_size`, yielded one at a time
+def generate_accounts_batched(count, seed, batch_size=DEFAULT_BATCH_SIZE):
+    rng = np.random.default_rng(seed)
+    date_table = _build_date_table()
+    for start in range(0, count, batch_size):
+        yield from AccountBatch(rng, min(batch_size, count - start), first_id=start + 1, date_table=date_table)
+
+
+# Function to generate prospects for a list of accounts in batches, yielded one at a time
+def generate_prospects_batched(accounts, seed, batch_size=DEFAULT_BATCH_SIZE):
+    rng = np.random.default_rng(seed)
+    date_table = _build_date_table()
+    first_id = 1
+    for start in range(0, len(accounts), batch_size):
+        batch = ProspectBatch(rng, accounts[start:start + batch_size], first_id=first_id, date_table=date_table)
+        yield from batch
+        first_id += len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate random CRM accounts with the NumPy batch engine.")
+    parser.add_argument("--count", type=int, default=50, help="number of accounts to generate")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="json")
+    parser.add_argument("--output", help="output file (default: accounts.json or accounts.ndjson)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible output (default: random)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="records drawn per vectorized batch")
+    add_reference_date_arguments(parser)
+    args = parser.parse_args()
+
+    set_reference_date(args.reference_date)
+    seed = args.seed if args.seed is not None else random_seed()
+    output = args.output or default_output_path("accounts", args.output_format)
+    count = write_records(generate_accounts_batched(args.count, seed, args.batch_size), output, args.output_format)
+
+    print(f"Generated {count} accounts and saved to {output} (seed {seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import random
+import time
+
+import account_data_generator as acc
+import batch_generator
+import prospect_activity_generator as pag
+
+# Benchmark: records/sec of the scalar generators vs the NumPy batch engine.
+#
+#   python bench_batch_generator.py --count 100000
+
+
+# Function to time how long it takes to fully consume an iterable of records
+def _time_records(records):
+    started = time.perf_counter()
+    count = sum(1 for _ in records)
+    return count, time.perf_counter() - started
+
+
+def _report(label, count, elapsed, baseline=None):
+    rate = count / elapsed if elapsed else float("inf")
+    speedup = f"  ({rate / baseline:.1f}x)" if baseline else ""
+    print(f"  {label:<8} {count:>10,} records in {elapsed:8.3f}s  {rate:>12,.0f} records/sec{speedup}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scalar and batch generator throughput.")
+    parser.add_argument("--count", type=int, default=20000, help="number of accounts to generate")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=batch_generator.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(f"accounts (count={args.count:,})")
+    count, elapsed = _time_records(acc.generate_accounts(args.count, rng=random.Random(args.seed)))
+    scalar_rate = _report("scalar", count, elapsed)
+    count, elapsed = _time_records(batch_generator.generate_accounts_batched(args.count, args.seed, args.batch_size))
+    _report("batch", count, elapsed, scalar_rate)
+
+    # Both prospect paths run over the same account list so only prospect generation is timed
+    accounts = list(batch_generator.generate_accounts_batched(args.count, args.seed, args.batch_size))
+    rng = random.Random(args.seed)
+
+    def scalar_prospects():
+        prospect_id_counter = 1
+        for account in accounts:
+            for _ in range(rng.randint(1, 3)):
+                yield pag.generate_prospect(account, f"PROS{prospect_id_counter:04d}", rng)
+                prospect_id_counter += 1
+
+    print(f"prospects (accounts={len(accounts):,})")
+    count, elapsed = _time_records(scalar_prospects())
+    scalar_rate = _report("scalar", count, elapsed)
+    count, elapsed = _time_records(batch_generator.generate_prospects_batched(accounts, args.seed, args.batch_size))
+    _report("batch", count, elapsed, scalar_rate)
+
+
+if __name__ == "__main__":
+    main()
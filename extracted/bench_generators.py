@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from account_data_generator import generate_accounts
+from generator_io import default_output_path, iter_records, open_writer
+from generator_metrics import GeneratorMetrics, peak_rss
+from generator_random import make_rng
+from prospect_activity_generator import DEFAULT_SHARD_SIZE, generate_sharded_prospect_groups, write_prospect_groups
+
+# Benchmark suite: both generators at 1e3 to 1e6 records.
+#
+# For every size the account generator writes that many accounts, then the
+# prospect/activity generator reads the first size/12 of them (about 12
+# prospects plus activities come out per account) so both write roughly `size`
+# records. Each run gets a fresh process and reports records/sec, bytes
+# written, peak RSS and RSS growth over the idle worker; --stages adds the
+# per-stage breakdown from generator_metrics.py (instrumented runs are slower).
+#
+# Results are saved as sorted, indented JSON under --results, named after the
+# git revision (or --label), so runs of two versions can be diffed as text or
+# compared directly:
+#
+#   python bench_generators.py                                   # 1e3..1e6, saves bench_results/generators-<rev>.json
+#   python bench_generators.py --sizes 1000,10000 --compare bench_results/generators-abc1234.json
+#   python bench_generators.py --compare old.json new.json       # compare two saved results, no runs
+#   python bench_generators.py --compare old.json --max-regression 10   # exit 1 if records/sec drops >10%
+
+SIZES = (1000, 10000, 100000, 1000000)
+RECORDS_PER_ACCOUNT = 12  # prospects plus activities per account, on average
+
+
+# Function to run one generator at one size (runs in a fresh worker process)
+def _run(generator, size, directory, output_format, seed, stages):
+    idle = peak_rss()
+    metrics = GeneratorMetrics(stages=stages)
+    accounts_output = os.path.join(directory, default_output_path(f"accounts-{size}", output_format))
+    if generator == "accounts":
+        outputs = [accounts_output]
+        with metrics, metrics.timed_writer(open_writer(accounts_output, output_format), "accounts") as writer:
+            for account in generate_accounts(size, 1, make_rng(seed, 0)):
+                writer.write(account)
+        records = {"accounts": writer.count}
+    else:
+        outputs = [os.path.join(directory, default_output_path(f"{name}-{size}", output_format))
+                   for name in ("prospects", "activities")]
+        with metrics, \
+                metrics.timed_writer(open_writer(outputs[0], output_format), "prospects") as prospects_writer, \
+                metrics.timed_writer(open_writer(outputs[1], output_format), "activities") as activities_writer:
+            accounts = islice(iter_records(accounts_output), max(size // RECORDS_PER_ACCOUNT, 1))
+            groups = generate_sharded_prospect_groups(accounts, seed, DEFAULT_SHARD_SIZE)
+            write_prospect_groups(groups, prospects_writer, activities_writer)
+        records = {"prospects": prospects_writer.count, "activities": activities_writer.count}
+    report = metrics.report(records, outputs)
+    result = {
+        "generator": generator,
+        "size": size,
+        "records": sum(records.values()),
+        "records_per_second": report["records_per_second"],
+        "wall_seconds": report["wall_seconds"],
+        "bytes_written": sum(report["bytes_written"].values()),
+        "peak_rss_bytes": report["peak_rss_bytes"],
+        "rss_growth_bytes": report["peak_rss_bytes"] - idle,
+    }
+    if stages:
+        result["stages"] = report["stages"]
+    return result
+
+
+# Function to name results after the current git revision, falling back to a timestamp
+def default_label():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return time.strftime("%Y%m%d-%H%M%S")
+
+
+# Function to run the suite, printing each run as it finishes; returns the results document
+def run_suite(sizes, output_format="ndjson", seed=1, stages=False, label=None):
+    results = {
+        "label": label or default_label(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "format": output_format,
+        "seed": seed,
+        "runs": [],
+    }
+    directory = tempfile.mkdtemp(prefix="bench_generators_")
+    try:
+        for size in sizes:
+            for generator in ("accounts", "prospects"):
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    run = pool.submit(_run, generator, size, directory, output_format, seed, stages).result()
+                results["runs"].append(run)
+                print(f"  {generator:<9} {size:>9,}: {run['records']:>10,} records {run['records_per_second']:>10,.0f}/s "
+                      f"{run['bytes_written'] / 1e6:9.1f} MB written, peak RSS {run['peak_rss_bytes'] / 1e6:7.1f} MB "
+                      f"(+{run['rss_growth_bytes'] / 1e6:.1f} MB)")
+            # The next size regenerates its own accounts; keep the disk footprint to one size
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+# Function to compare two results documents run by run; returns the worst records/sec change in percent
+def compare_results(old, new):
+    old_runs = {(run["generator"], run["size"]): run for run in old["runs"]}
+    print(f"{old['label']} -> {new['label']}")
+    worst = 0.0
+    for run in new["runs"]:
+        before = old_runs.get((run["generator"], run["size"]))
+        if before is None:
+            continue
+        speed = (run["records_per_second"] / before["records_per_second"] - 1) * 100
+        rss = (run["peak_rss_bytes"] - before["peak_rss_bytes"]) / 1e6
+        written = (run["bytes_written"] - before["bytes_written"]) / 1e6
+        worst = min(worst, speed)
+        print(f"  {run['generator']:<9} {run['size']:>9,}: records/sec {speed:+6.1f}%, "
+              f"peak RSS {rss:+7.1f} MB, written {written:+7.1f} MB")
+    return worst
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark both generators at increasing sizes and store the results.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated record counts")
+    parser.add_argument("--format", dest="output_format", choices=["json", "ndjson", "ndjson.gz"], default="ndjson")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--stages", action="store_true", help="include per-stage timings (slower runs)")
+    parser.add_argument("--label", help="name for this result set (default: git describe)")
+    parser.add_argument("--results", default="bench_results", help="directory results are saved to")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="saved results to compare this run against, or two saved results to compare")
+    parser.add_argument("--max-regression", type=float,
+                        help="with --compare, exit 1 if any run's records/sec drops by more than this percent")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes one or two results files")
+    if args.compare and len(args.compare) == 2:
+        old, new = map(_load, args.compare)
+    else:
+        new = run_suite([int(size) for size in args.sizes.split(",")], args.output_format, args.seed, args.stages,
+                        args.label)
+        os.makedirs(args.results, exist_ok=True)
+        path = os.path.join(args.results, f"generators-{new['label']}.json")
+        with open(path, "w") as f:
+            f.write(json.dumps(new, indent=2, sort_keys=True) + "\n")
+        print(f"Saved results to {path}")
+        old = _load(args.compare[0]) if args.compare else None
+
+    if old is not None:
+        worst = compare_results(old, new)
+        if args.max_regression is not None and worst < -args.max_regression:
+            print(f"records/sec regressed by {-worst:.1f}% (limit {args.max_regression}%)", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import importlib
+import re
+import time
+from collections import Counter
+
+from generator_io import iter_records
+from note_corpus import ENTITY_TYPES, generate_note_corpus, gold_entities
+
+# Benchmark: entity-extraction throughput and accuracy over an annotated note
+# corpus (see note_corpus.py).
+#
+# An extractor is any function taking a note's content and returning
+# (type, start, end) spans, with types named as in ENTITY_TYPES. The default,
+# regex_extractor, is a port of the regexes in
+# NoteProcessorAgent._extractEntities; --extractor module:function plugs in
+# another one. Each run reports:
+#
+#   - throughput: notes/sec and MB/sec of content over the whole corpus (best
+#     of --repeat timed passes; contents are held in memory so only
+#     extraction is timed)
+#   - precision/recall/F1 per entity type and overall, counting a span as
+#     correct only if type, start and end all match an annotated slot
+#
+#   python bench_note_extraction.py --count 100000 --seed 7
+#   python bench_note_extraction.py --corpus notes_corpus.ndjson --extractor my_extractors:extract
+
+PEOPLE_RE = re.compile(r"[A-Z][a-z]+ [A-Z][a-z]+")
+DATE_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}-\d{1,2}-\d{2,4}")
+MONEY_RE = re.compile(r"\$\d+(?:,\d+)*(?:\.\d+)?")
+PRODUCT_RE = re.compile(r"[A-Z][a-zA-Z]+ (?:Suite|Platform|Software|Solution|System|Tool)")
+COMPANY_RE = re.compile(r"[A-Z][a-zA-Z]+ (?:Inc|LLC|Ltd|GmbH|Corp|Corporation|Company)")
+
+REGEX_EXTRACTORS = (
+    ("people", PEOPLE_RE),
+    ("dates", DATE_RE),
+    ("monetaryValues", MONEY_RE),
+    ("products", PRODUCT_RE),
+    ("companies", COMPANY_RE),
+)
+
+
+# Function to extract entities with the NoteProcessorAgent._extractEntities regexes
+def regex_extractor(content):
+    return [(entity_type, match.start(), match.end())
+            for entity_type, pattern in REGEX_EXTRACTORS
+            for match in pattern.finditer(content)]
+
+
+# Function to load an extractor given as "module:function"
+def load_extractor(spec):
+    module_name, _, function_name = spec.partition(":")
+    if not function_name:
+        raise ValueError(f"extractor {spec!r} is not module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# Function to time extraction over all contents, returning the best pass in seconds
+def time_extraction(extract, contents, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for content in contents:
+            extract(content)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# Function to count true positives, false positives and false negatives per entity type
+def score_extraction(extract, corpus):
+    counts = {entity_type: Counter() for entity_type in ENTITY_TYPES}
+    for record in corpus:
+        gold = gold_entities(record)
+        found = set(extract(record["content"]))
+        for entity_type, _, _ in found & gold:
+            counts[entity_type]["tp"] += 1
+        for entity_type, _, _ in found - gold:
+            counts.setdefault(entity_type, Counter())["fp"] += 1
+        for entity_type, _, _ in gold - found:
+            counts[entity_type]["fn"] += 1
+    return counts
+
+
+# Function to compute (precision, recall, F1) from tp/fp/fn counts; None where undefined
+def precision_recall(counts):
+    tp, fp, fn = counts["tp"], counts["fp"], counts["fn"]
+    precision = tp / (tp + fp) if tp + fp else None
+    recall = tp / (tp + fn) if tp + fn else None
+    f1 = 2 * precision * recall / (precision + recall) if precision and recall else None
+    return precision, recall, f1
+
+
+def _percent(value):
+    return f"{value:7.1%}" if value is not None else "      -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity extraction speed and accuracy on annotated notes.")
+    parser.add_argument("--corpus", help="annotated notes file from note_corpus.py (default: generate one)")
+    parser.add_argument("--count", type=int, default=20000, help="accounts whose notes to generate without --corpus")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--extractor", help="extractor as module:function (default: the _extractEntities regexes)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes; the best one is reported")
+    args = parser.parse_args()
+
+    extract = load_extractor(args.extractor) if args.extractor else regex_extractor
+    name = args.extractor or "regex_extractor"
+
+    started = time.perf_counter()
+    corpus = list(iter_records(args.corpus) if args.corpus else generate_note_corpus(args.count, args.seed))
+    contents = [record["content"] for record in corpus]
+    megabytes = sum(len(content.encode("utf-8")) for content in contents) / 1e6
+    print(f"corpus: {len(corpus):,} notes, {megabytes:.1f} MB of content "
+          f"(loaded in {time.perf_counter() - started:.1f}s)")
+
+    elapsed = time_extraction(extract, contents, args.repeat)
+    print(f"{name}: {len(contents) / elapsed:,.0f} notes/s, {megabytes / elapsed:.1f} MB/s "
+          f"({elapsed:.2f}s per pass, best of {args.repeat})")
+
+    counts = score_extraction(extract, corpus)
+    total = Counter()
+    print(f"  {'type':<15} {'gold':>8} {'found':>8} {'precision':>9} {'recall':>7} {'F1':>7}")
+    for entity_type, type_counts in counts.items():
+        total.update(type_counts)
+        precision, recall, f1 = precision_recall(type_counts)
+        print(f"  {entity_type:<15} {type_counts['tp'] + type_counts['fn']:>8,} "
+              f"{type_counts['tp'] + type_counts['fp']:>8,}   {_percent(precision)} {_percent(recall)} {_percent(f1)}")
+    precision, recall, f1 = precision_recall(total)
+    print(f"  {'all':<15} {total['tp'] + total['fn']:>8,} {total['tp'] + total['fp']:>8,}   "
+          f"{_percent(precision)} {_percent(recall)} {_percent(f1)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import time
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+
+from pipeline_rollups import PipelineRollups
+
+# Benchmark: ingest and query times of pipeline_rollups.py at millions of
+# prospects, against a NumPy column scan and a row-by-row Python loop that
+# answer the same weighted-pipeline question. Prospects are synthesized
+# directly as code columns, so the benchmark does not wait on the generators.
+#
+#   python bench_pipeline_rollups.py --count 2000000
+
+
+# Function to synthesize `count` prospects as column arrays coded against rollups' dimensions
+def synthesize_prospects(rollups, count, accounts, rng):
+    today = date.today().toordinal()
+    return {
+        "prospect": np.arange(1, count + 1),
+        "account": rng.integers(1, accounts + 1, count),
+        "status": rng.integers(1, len(rollups.status), count),
+        "assigned_to": rng.integers(1, len(rollups.assigned_to), count),
+        "source": rng.integers(1, len(rollups.source), count),
+        "created_day": today - rng.integers(0, 365, count),
+        "value": rng.integers(5000, 500000, count),
+        "probability": rng.integers(0, 101, count),
+    }
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline rollups against scans and row loops.")
+    parser.add_argument("--count", type=int, default=1000000, help="prospects to synthesize")
+    parser.add_argument("--accounts", type=int, default=100000, help="accounts they belong to")
+    parser.add_argument("--batch", type=int, default=10000, help="prospects per incremental batch")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    rollups = PipelineRollups()
+    account_industry = rng.integers(1, len(rollups.industry), args.accounts + 1).astype(np.uint16)
+    rollups.account_industry = account_industry
+    columns = synthesize_prospects(rollups, args.count, args.accounts, rng)
+
+    started = time.perf_counter()
+    rollups.add_prospect_codes(**columns)
+    elapsed = time.perf_counter() - started
+    print(f"ingest: {args.count:,} prospects in {elapsed:.2f}s ({args.count / elapsed:,.0f}/sec), "
+          f"columns {rollups.prospects.nbytes / 1e6:.1f} MB, cube {rollups.pipeline_cube.data.nbytes / 1e6:.1f} MB")
+    # Column growth doubles capacity, so time several batches and report the median
+    timings = []
+    for _ in range(9):
+        extra = synthesize_prospects(rollups, args.batch, args.accounts, rng)
+        timings.append(_time(lambda: rollups.add_prospect_codes(**extra), 1)[0])
+    print(f"incremental batch of {args.batch:,}: median {sorted(timings)[4] * 1e3:.1f} ms, max {max(timings) * 1e3:.1f} ms")
+
+    # The same question three ways: weighted open pipeline by rep for two industries
+    industries = ["Finance", "Retail"]
+    cube_time, by_cube = _time(lambda: rollups.pipeline(("assigned_to",), open_only=True, industry=industries), 20)
+
+    prospects = rollups.prospects
+    industry_codes = [rollups.industry.codes[name] for name in industries]
+    closed_codes = [rollups.status.codes[name] for name in ("Closed Won", "Closed Lost")]
+
+    def scan():
+        mask = np.isin(prospects["industry"], industry_codes) & ~np.isin(prospects["status"], closed_codes)
+        weighted = prospects["value"][mask] * prospects["probability"][mask] / 100
+        return np.bincount(prospects["assigned_to"][mask], weights=weighted, minlength=len(rollups.assigned_to))
+
+    scan_time, by_scan = _time(scan, 5)
+
+    rows = list(zip(prospects["industry"].tolist(), prospects["status"].tolist(), prospects["assigned_to"].tolist(),
+                    prospects["value"].tolist(), prospects["probability"].tolist()))
+    wanted_industries, closed = set(industry_codes), set(closed_codes)
+
+    def loop():
+        totals = defaultdict(float)
+        for industry, status, rep, value, probability in rows:
+            if industry in wanted_industries and status not in closed:
+                totals[rep] += value * probability / 100
+        return totals
+
+    loop_time, by_loop = _time(loop, 1)
+
+    for result in by_cube:
+        code = rollups.assigned_to.codes[result["assigned_to"]]
+        assert abs(result["weighted"] - by_scan[code]) < 1 and abs(result["weighted"] - by_loop[code]) < 1
+    print(f"query (weighted open pipeline by rep, 2 industries) over {prospects.count:,} prospects:")
+    print(f"  {'rollup cube':<14} {cube_time * 1e3:9.2f} ms")
+    print(f"  {'column scan':<14} {scan_time * 1e3:9.2f} ms")
+    print(f"  {'python loop':<14} {loop_time * 1e3:9.2f} ms")
+
+    forecast_time, _ = _time(lambda: rollups.forecast(group_by=("industry",)), 20)
+    pipeline_time, _ = _time(lambda: rollups.pipeline(("status", "assigned_to", "source", "industry")), 20)
+    print(f"  forecast by month x industry   {forecast_time * 1e3:7.2f} ms")
+    print(f"  pipeline by all 4 dimensions   {pipeline_time * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
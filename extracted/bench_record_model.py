@@ -0,0 +1,76 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from generate_dataset import generate_dataset
+from generator_io import iter_records, open_writer
+from generator_metrics import peak_rss
+from record_model import Activity, RecordTable
+
+# Benchmark: memory per activity when a reader holds N activities as parsed
+# dicts, as slotted Activity records and as a RecordTable. Each shape is loaded
+# in its own fresh process and measured as peak RSS over an idle worker.
+#
+#   python bench_record_model.py --count 1000000
+#   python bench_record_model.py --count 1000000 --activities activities.ndjson
+
+
+def _load(shape, path, count):
+    idle = peak_rss()
+    started = time.perf_counter()
+    records = islice(iter_records(path), count)
+    if shape == "dicts":
+        held = list(records)
+    elif shape == "slots":
+        held = [Activity.from_dict(record) for record in records]
+    else:
+        held = RecordTable(Activity)
+        held.extend(records)
+    elapsed = time.perf_counter() - started
+    return len(held), elapsed, peak_rss() - idle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-record memory of the compact record model.")
+    parser.add_argument("--count", type=int, default=1000000, help="activities to hold")
+    parser.add_argument("--activities", help="existing activities file (default: generate one)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    directory = None
+    path = args.activities
+    try:
+        if path is None:
+            directory = tempfile.mkdtemp(prefix="bench_records_")
+            paths = [os.path.join(directory, f"{name}.ndjson") for name in ("accounts", "prospects", "activities")]
+            path = paths[2]
+            started = time.perf_counter()
+            writers = [open_writer(name, "ndjson") for name in paths]
+            try:
+                # About ten activities per account
+                generate_dataset(args.count // 9 + 1, args.seed, *writers)
+            finally:
+                for writer in writers:
+                    writer.close()
+            print(f"generated {writers[2].count:,} activities in {time.perf_counter() - started:.1f}s")
+
+        baseline = None
+        for shape in ("dicts", "slots", "table"):
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                count, elapsed, grown = pool.submit(_load, shape, path, args.count).result()
+            per_record = grown / count
+            baseline = baseline or per_record
+            ratio = f", {baseline / per_record:.1f}x smaller than dicts" if shape != "dicts" else ""
+            print(f"  {shape:<6} {count:,} activities: {per_record:7.0f} bytes/record "
+                  f"({grown / 1e6:.1f} MB{ratio}), loaded in {elapsed:.1f}s")
+    finally:
+        if directory:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
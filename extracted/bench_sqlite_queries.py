@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from crm_queries import CRMDatabase
+from account_data_generator import industries
+from generate_dataset import generate_dataset
+from sqlite_sink import SQLiteSink
+
+# Benchmark: bulk-load time and per-query latency of the SQLite backend for
+# each accountController.js access pattern.
+#
+#   python bench_sqlite_queries.py --count 100000
+#   python bench_sqlite_queries.py --database crm.db   # reuse an existing database
+
+
+# Function to time `queries` calls of fn(arg) over randomly chosen arguments
+def _time_query(fn, args, queries, rng):
+    timings = []
+    for _ in range(queries):
+        arg = rng.choice(args)
+        started = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings
+
+
+def _report(label, timings):
+    total = sum(timings)
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6
+    print(f"  {label:<32} p50 {p50:9.1f}us  p99 {p99:9.1f}us  {len(timings) / total:>10,.0f} queries/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite backend's controller query patterns.")
+    parser.add_argument("--count", type=int, default=20000, help="accounts to generate when building a database")
+    parser.add_argument("--database", help="existing database to benchmark instead of generating one")
+    parser.add_argument("--queries", type=int, default=2000, help="queries per access pattern")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.database
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.remove(path)
+        started = time.perf_counter()
+        with SQLiteSink(path) as sink:
+            generate_dataset(args.count, args.seed, sink.accounts, sink.prospects, sink.activities)
+        elapsed = time.perf_counter() - started
+        rows = sink.accounts.count + sink.prospects.count + sink.activities.count
+        print(f"load: {sink.accounts.count:,} accounts, {sink.prospects.count:,} prospects, "
+              f"{sink.activities.count:,} activities in {elapsed:.2f}s ({rows / elapsed:,.0f} records/sec, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB)")
+
+    rng = random.Random(args.seed)
+    try:
+        with CRMDatabase(path) as db:
+            account_ids = [row[0] for row in db.conn.execute("SELECT account_id FROM accounts")]
+            print(f"queries ({len(account_ids):,} accounts, {args.queries:,} per pattern)")
+            _report("get_account", _time_query(db.get_account, account_ids, args.queries, rng))
+            _report("get_account_notes", _time_query(db.get_account_notes, account_ids, args.queries, rng))
+            _report("get_account_prospects", _time_query(db.get_account_prospects, account_ids, args.queries, rng))
+            _report("get_account_activities", _time_query(db.get_account_activities, account_ids, args.queries, rng))
+            _report("filter_accounts_by_industry[50]",
+                    _time_query(lambda industry: db.filter_accounts_by_industry(industry, limit=50),
+                                industries, args.queries, rng))
+            _report("get_recent_accounts", _time_query(lambda _: db.get_recent_accounts(), [None], args.queries, rng))
+    finally:
+        if args.database is None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
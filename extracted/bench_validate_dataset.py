@@ -0,0 +1,96 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from generate_dataset import generate_dataset
+from generator_io import iter_records, open_writer
+from generator_metrics import peak_rss
+from validate_dataset import validate_files
+
+# Benchmark: throughput and peak RSS of validate_dataset.py against a baseline
+# that indexes the same checks with dicts/sets of ID strings. Each validator
+# runs in its own fresh process so the peak RSS figures are comparable.
+#
+#   python bench_validate_dataset.py --count 100000
+#   python bench_validate_dataset.py --dir data/   # reuse accounts/prospects/activities.ndjson
+
+
+# Function to run the same checks with string-keyed dicts/sets (the baseline)
+def validate_with_dicts(accounts_path, prospects_path, activities_path):
+    violations = 0
+    accounts, prospect_accounts, activity_ids = set(), {}, set()
+    for account in iter_records(accounts_path):
+        if account["account_id"] in accounts:
+            violations += 1
+        accounts.add(account["account_id"])
+        contact_ids = {contact["contact_id"] for contact in account["contacts"]}
+        violations += sum(note["related_contact"] not in contact_ids for note in account["notes"])
+    for prospect in iter_records(prospects_path):
+        if prospect["prospect_id"] in prospect_accounts or prospect["account_id"] not in accounts:
+            violations += 1
+        prospect_accounts.setdefault(prospect["prospect_id"], prospect["account_id"])
+    for activity in iter_records(activities_path):
+        if activity["activity_id"] in activity_ids:
+            violations += 1
+        activity_ids.add(activity["activity_id"])
+        if prospect_accounts.get(activity["prospect_id"]) != activity["account_id"]:
+            violations += 1
+    return violations
+
+
+def _run(name, paths):
+    started = time.perf_counter()
+    if name == "bitmap":
+        violations = len(validate_files(*paths).violations)
+    else:
+        violations = validate_with_dicts(*paths)
+    return time.perf_counter() - started, violations, peak_rss()
+
+
+# Function to measure the baseline RSS of a fresh worker process (imports only)
+def _idle():
+    return peak_rss()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming dataset validator.")
+    parser.add_argument("--count", type=int, default=20000, help="accounts to generate when building a dataset")
+    parser.add_argument("--dir", help="existing directory with accounts/prospects/activities.ndjson")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="bench_validate_")
+    paths = [os.path.join(directory, f"{name}.ndjson") for name in ("accounts", "prospects", "activities")]
+    try:
+        if args.dir is None:
+            started = time.perf_counter()
+            writers = [open_writer(path, "ndjson") for path in paths]
+            try:
+                generate_dataset(args.count, args.seed, *writers)
+            finally:
+                for writer in writers:
+                    writer.close()
+            print(f"generated {args.count:,} accounts in {time.perf_counter() - started:.2f}s")
+
+        rows = sum(1 for path in paths for _ in iter_records(path))
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"dataset: {rows:,} records, {size / 1e6:.1f} MB")
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            idle = pool.submit(_idle).result()
+        print(f"  {'worker baseline':<8} peak RSS {idle / 1e6:8.1f} MB")
+        for name in ("bitmap", "dicts"):
+            # A fresh pool per run, so each peak RSS starts from a clean process
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                elapsed, violations, rss = pool.submit(_run, name, paths).result()
+            print(f"  {name:<15} {elapsed:7.2f}s {rows / elapsed:>10,.0f} records/sec  "
+                  f"peak RSS {rss / 1e6:8.1f} MB (+{(rss - idle) / 1e6:.1f} MB)  {violations} violations")
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import gzip
+import json
+import lzma
+import re
+import sys
+
+# Block-compressed, seekable NDJSON (.ndjson.gz / .ndjson.xz).
+#
+# Records are written as NDJSON, but the stream is cut into blocks of about
+# BLOCK_SIZE uncompressed bytes and each block is compressed on its own. A gzip
+# file made of independent members (or an xz file of independent streams) is
+# still a valid file, so zcat/xzcat and iter_records() read it like any other
+# compressed NDJSON.
+#
+# Next to the data file the writer leaves a sidecar index (<path>.idx, JSON)
+# with the byte offset and length of every block and, for every top-level ID
+# field ("account_id", "prospect_id", "activity_id"), the lowest and highest ID
+# number in that block. A reader can then fetch one record, every activity of
+# an account, or an ID range by decompressing only the blocks whose ranges
+# cover it.
+#
+#   python block_ndjson.py pack activities.ndjson --codec lzma
+#   python block_ndjson.py get activities.ndjson.xz ACT0042
+#   python block_ndjson.py get activities.ndjson.xz ACT0100 ACT0200
+
+BLOCK_SIZE = 256 * 1024  # uncompressed bytes per block
+INDEX_SUFFIX = ".idx"
+INDEX_FORMAT = "block-ndjson/1"
+
+CODECS = {
+    "gzip": (lambda data: gzip.compress(data, compresslevel=6, mtime=0), gzip.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+CODEC_EXTENSIONS = {"gzip": ".ndjson.gz", "lzma": ".ndjson.xz"}
+
+_ID_PATTERN = re.compile(r"([A-Z]+)(\d+)$")
+_compact_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+# Function to split an ID like "ACT0042" into ("ACT", 42)
+def split_id(record_id):
+    match = _ID_PATTERN.match(record_id)
+    if not match:
+        raise KeyError(record_id)
+    return match.group(1), int(match.group(2))
+
+
+# Function to find a record's top-level ID fields as {field: prefix}, e.g. {"activity_id": "ACT", ...}
+def _id_fields(record):
+    fields = {}
+    for name, value in record.items():
+        if name.endswith("_id") and isinstance(value, str) and _ID_PATTERN.match(value):
+            fields[name] = _ID_PATTERN.match(value).group(1)
+    return fields
+
+
+class BlockNDJSONWriter:
+    """Record sink that writes block-compressed NDJSON plus a sidecar block index.
+
+    The ID fields to index are taken from the first record; its first ID field
+    is the key that get() looks records up by.
+    """
+
+    def __init__(self, path, codec="gzip", block_size=BLOCK_SIZE):
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec {codec!r} (expected one of {', '.join(sorted(CODECS))})")
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.codec = codec
+        self.block_size = block_size
+        self.count = 0
+        self.fields = None
+        self.blocks = []
+        self._compress = CODECS[codec][0]
+        self._encode = _compact_encoder.encode
+        self._file = open(path, "wb")
+        self._lines = []
+        self._buffered = 0
+        self._ranges = {}
+
+    def write(self, record):
+        if self.fields is None:
+            self.fields = _id_fields(record)
+        ranges = self._ranges
+        for name in self.fields:
+            number = int(record[name][len(self.fields[name]):])
+            low_high = ranges.get(name)
+            if low_high is None:
+                ranges[name] = [number, number]
+            elif number < low_high[0]:
+                low_high[0] = number
+            elif number > low_high[1]:
+                low_high[1] = number
+
+        line = self._encode(record) + "\n"
+        self._lines.append(line)
+        self._buffered += len(line)
+        self.count += 1
+        if self._buffered >= self.block_size:
+            self._flush_block()
+
+    def _flush_block(self):
+        if not self._lines:
+            return
+        data = self._compress("".join(self._lines).encode("utf-8"))
+        self.blocks.append({
+            "offset": self._file.tell(),
+            "length": len(data),
+            "records": len(self._lines),
+            "ranges": self._ranges,
+        })
+        self._file.write(data)
+        self._lines = []
+        self._buffered = 0
+        self._ranges = {}
+
+    def close(self):
+        self._flush_block()
+        self._file.close()
+        fields = self.fields or {}
+        index = {
+            "format": INDEX_FORMAT,
+            "codec": self.codec,
+            "records": self.count,
+            "key": next(iter(fields), None),
+            "fields": fields,
+            "blocks": self.blocks,
+        }
+        with open(self.index_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BlockNDJSONReader:
+    """Random access into a block-compressed NDJSON file through its sidecar index.
+
+    get("ACT0042") returns one record by its key field; find("ACC0007") returns
+    every record whose ID field with that prefix matches (e.g. all activities of
+    an account); range("ACT0100", "ACT0200") yields records in an ID range.
+    Only the blocks whose ID ranges cover the request are read and decompressed.
+    """
+
+    def __init__(self, path, index_path=None):
+        with open(index_path or path + INDEX_SUFFIX) as f:
+            index = json.load(f)
+        if index.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{path} has no block-ndjson index")
+        self.path = path
+        self.codec = index["codec"]
+        self.key = index["key"]
+        self.fields = index["fields"]
+        self.blocks = index["blocks"]
+        self.record_count = index["records"]
+        self.blocks_read = 0
+        self._field_for_prefix = {prefix: name for name, prefix in self.fields.items()}
+        self._decompress = CODECS[self.codec][1]
+        self._file = open(path, "rb")
+        self._cached_block = (None, None)
+
+    def __len__(self):
+        return self.record_count
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Function to decompress one block into its NDJSON lines (the last block read is cached)
+    def _block_lines(self, number):
+        if self._cached_block[0] == number:
+            return self._cached_block[1]
+        block = self.blocks[number]
+        self._file.seek(block["offset"])
+        lines = self._decompress(self._file.read(block["length"])).decode("utf-8").splitlines()
+        self.blocks_read += 1
+        self._cached_block = (number, lines)
+        return lines
+
+    # Function to list the blocks whose range for `field` overlaps [low, high]
+    def _blocks_covering(self, field, low, high):
+        for number, block in enumerate(self.blocks):
+            block_low, block_high = block["ranges"][field]
+            if block_low <= high and low <= block_high:
+                yield number
+
+    def _field(self, prefix):
+        field = self._field_for_prefix.get(prefix)
+        if field is None:
+            raise KeyError(f"{self.path} has no {prefix} IDs (indexed: {', '.join(self.fields.values())})")
+        return field
+
+    # Function to get every record whose ID field matches record_id (in file order)
+    def find(self, record_id):
+        prefix, number = split_id(record_id)
+        field = self._field(prefix)
+        needle = f'"{record_id}"'
+        matches = []
+        for block in self._blocks_covering(field, number, number):
+            for line in self._block_lines(block):
+                # Only decode lines that mention the ID at all
+                if needle in line:
+                    record = json.loads(line)
+                    if record[field] == record_id:
+                        matches.append(record)
+        return matches
+
+    # Function to get a single record by its key ID (KeyError if absent)
+    def get(self, record_id):
+        prefix, _ = split_id(record_id)
+        if self._field(prefix) != self.key:
+            raise KeyError(f"get() looks up {self.key} values; use find({record_id!r}) for related records")
+        matches = self.find(record_id)
+        if not matches:
+            raise KeyError(record_id)
+        return matches[0]
+
+    # Function to yield records whose ID field is in [first_id, last_id] (same prefix), in file order
+    def range(self, first_id, last_id):
+        prefix, low = split_id(first_id)
+        last_prefix, high = split_id(last_id)
+        if prefix != last_prefix:
+            raise ValueError(f"range endpoints {first_id} and {last_id} have different prefixes")
+        field = self._field(prefix)
+        width = len(prefix)
+        for block in self._blocks_covering(field, low, high):
+            for line in self._block_lines(block):
+                record = json.loads(line)
+                if low <= int(record[field][width:]) <= high:
+                    yield record
+
+    # Function to yield every record in file order
+    def __iter__(self):
+        for number in range(len(self.blocks)):
+            for line in self._block_lines(number):
+                yield json.loads(line)
+
+
+def main():
+    # generator_io registers the block formats, so import it here rather than at module level
+    from generator_io import iter_records
+
+    parser = argparse.ArgumentParser(description="Pack NDJSON/JSON into block-compressed NDJSON, or read records back.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="compress an accounts/prospects/activities file")
+    pack.add_argument("source", help="JSON array or NDJSON file to compress")
+    pack.add_argument("--codec", choices=sorted(CODECS), default="gzip")
+    pack.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="uncompressed bytes per block")
+    pack.add_argument("--output", help="output file (default: source name with .ndjson.gz/.ndjson.xz)")
+    get = commands.add_parser("get", help="print the record(s) for an ID, or an ID range")
+    get.add_argument("path", help="block-compressed NDJSON file")
+    get.add_argument("first_id", help="ID to fetch (ACC..., PROS... or ACT...)")
+    get.add_argument("last_id", nargs="?", help="fetch the range first_id..last_id instead")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        output = args.output or re.sub(r"\.(nd)?json$", "", args.source) + CODEC_EXTENSIONS[args.codec]
+        with BlockNDJSONWriter(output, args.codec, args.block_size) as writer:
+            for record in iter_records(args.source):
+                writer.write(record)
+        print(f"Wrote {writer.count} records in {len(writer.blocks)} blocks to {output} ({writer.index_path})")
+        return
+
+    with BlockNDJSONReader(args.path) as reader:
+        if args.last_id:
+            records = list(reader.range(args.first_id, args.last_id))
+        else:
+            records = reader.find(args.first_id)
+        for record in records:
+            print(json.dumps(record))
+        print(f"{len(records)} records from {reader.blocks_read} of {len(reader.blocks)} blocks", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
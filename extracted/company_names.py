@@ -0,0 +1,186 @@
+import hashlib
+
+# Collision-free company names and domains.
+#
+# generate_company_name() picks from a small space, so at 100k+ accounts names
+# and the domains derived from them repeat. CompanyNamer instead maps every
+# account index to a distinct name with no seen-set:
+#
+#   index --keyed permutation--> slot --mixed-radix decode--> words --> name
+#
+# The name space is a sequence of tiers of increasing length ("Tech Solutions",
+# "Tech Analytics Solutions", "Pacific Tech Analytics Solutions", ... + " LLC").
+# A namer built for `capacity` names only permutes the first `capacity` slots,
+# so small datasets get short names and long ones only appear when needed.
+#
+# Domains drop spaces and hyphens (see account_data_generator.company_domain),
+# so the vocabularies are checked at import to be uniquely decodable: no
+# concatenation of words can be split into words in two different ways. Each
+# tier has a different word count, so distinct slots always give distinct
+# domains, and therefore distinct names.
+
+regions = ["Pacific", "Atlantic", "Northern", "Southern", "Eastern", "Western", "Central", "Coastal",
+           "Summit", "Harbor", "Meridian", "Keystone", "Cascade", "Evergreen", "Redwood", "Granite",
+           "Lakeside", "Riverside", "Highland", "Prairie", "Bayview", "Frontier", "Horizon", "Pinnacle",
+           "Liberty", "Heritage", "Crescent", "Northstar", "Sterling", "Beacon", "Orchard", "Canyon",
+           "Ironwood", "Willow", "Aspen", "Oakmont", "Sunrise", "Tidewater", "Westbrook", "Fairview"]
+
+prefixes = ["Tech", "Global", "Advanced", "Premier", "Elite", "Innovative", "Strategic", "Dynamic",
+            "Precision", "Unified", "Integrated", "Smart", "Digital", "Modern", "Apex", "Vertex",
+            "Quantum", "Nova", "Fusion", "Prime", "Bright", "Clear", "Agile", "Stellar",
+            "Vector", "Optimal", "Synergy", "Velocity", "Catalyst", "Insight", "Momentum", "Vital",
+            "Keen", "Rapid", "Secure", "Total", "First", "United", "Allied", "Superior",
+            "Pioneer", "Visionary", "Trusted", "Proven", "Nimble", "Bold", "Infinite", "Radiant"]
+
+descriptors = ["International", "Consulting", "Development", "Management", "Analytics", "Engineering",
+               "Communications", "Healthcare", "Financial", "Manufacturing", "Data", "Cloud",
+               "Energy", "Security", "Marketing", "Research", "Medical", "Retail",
+               "Industrial", "Environmental", "Automotive", "Aerospace", "Biotech", "Education",
+               "Legal", "Insurance", "Realty", "Construction", "Transport", "Telecom",
+               "Wireless", "Mobile", "Payments", "Supply", "Learning", "Imaging",
+               "Hospitality", "Agricultural", "Pharma", "Design"]
+
+suffixes = ["Solutions", "Systems", "Technologies", "Industries", "Enterprises", "Group", "Partners",
+            "Associates", "Services", "Innovations", "Networks", "Dynamics", "Labs", "Works",
+            "Holdings", "Ventures", "Logistics", "Consultants", "Resources", "Software",
+            "Capital", "Concepts", "Collective", "Alliance", "Interactive", "Media",
+            "Platforms", "Robotics", "Sciences", "Studios", "Experts", "Advisors"]
+
+entity_types = ["Inc", "LLC", "Ltd", "PLC", "GmbH", "Corp"]
+
+# Word lists for each position of each tier, shortest tier first
+TIERS = [
+    (prefixes, suffixes),
+    (prefixes, descriptors, suffixes),
+    (regions, prefixes, descriptors, suffixes),
+    (regions, prefixes, descriptors, suffixes, entity_types),
+]
+
+
+# Function to check that a set of words is a uniquely decodable code (Sardinas-Patterson test)
+def is_uniquely_decodable(words):
+    words = {word.lower() for word in words}
+
+    def dangling(a_set, b_set):
+        return {b[len(a):] for a in a_set for b in b_set if b != a and b.startswith(a)}
+
+    current = dangling(words, words)
+    seen = set()
+    while current:
+        if current & words:
+            return False
+        key = frozenset(current)
+        if key in seen:
+            return True
+        seen.add(key)
+        current = dangling(current, words) | dangling(words, current)
+    return True
+
+
+def _check_vocabularies():
+    for tier in TIERS:
+        for words in tier:
+            if len(set(words)) != len(words):
+                raise ValueError("duplicate word in a company name vocabulary")
+            if any(" " in word or "-" in word for word in words):
+                raise ValueError("company name words can't contain spaces or hyphens")
+    if len({len(tier) for tier in TIERS}) != len(TIERS):
+        raise ValueError("company name tiers must have distinct word counts")
+    all_words = {word for tier in TIERS for words in tier for word in words}
+    if not is_uniquely_decodable(all_words):
+        raise ValueError("company name vocabulary is not uniquely decodable; domains could collide")
+
+
+_check_vocabularies()
+
+
+def _tier_size(tier):
+    size = 1
+    for words in tier:
+        size *= len(words)
+    return size
+
+
+TIER_SIZES = [_tier_size(tier) for tier in TIERS]
+CAPACITY = sum(TIER_SIZES)
+
+# A prime that doesn't divide any tier size (tier sizes only have the factors 2, 3 and 5)
+_TIER_SPREAD = 1000003
+
+
+# Function to decode a slot in [0, CAPACITY) into its list of words
+def slot_words(slot):
+    if not 0 <= slot < CAPACITY:
+        raise IndexError(f"company name slot {slot} out of range (capacity {CAPACITY})")
+    for tier, size in zip(TIERS, TIER_SIZES):
+        if slot < size:
+            break
+        slot -= size
+    # Spread the tier's slots with a multiplier coprime to its size (a bijection on the tier),
+    # so a partially used tier still mixes every word position instead of only the first words
+    slot = slot * _TIER_SPREAD % size
+    # Mixed-radix decode, last position varying fastest
+    words = []
+    for vocabulary in reversed(tier):
+        slot, digit = divmod(slot, len(vocabulary))
+        words.append(vocabulary[digit])
+    words.reverse()
+    return words
+
+
+class KeyedPermutation:
+    """A keyed bijection on range(size): a 4-round Feistel network with cycle walking."""
+
+    ROUNDS = 4
+
+    def __init__(self, size, key):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.half_bits = bits // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        digest = hashlib.blake2b(str(key).encode(), digest_size=8 * self.ROUNDS).digest()
+        self.round_keys = [int.from_bytes(digest[8 * i:8 * i + 8], "little") for i in range(self.ROUNDS)]
+
+    def _round(self, value, round_key):
+        value = ((value ^ round_key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return (value ^ (value >> 29)) & self.half_mask
+
+    def _encrypt(self, value):
+        left, right = value >> self.half_bits, value & self.half_mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << self.half_bits) | right
+
+    def __call__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(f"index {index} out of range for permutation of size {self.size}")
+        # The Feistel domain is at most 4x size, so this loop exits after a few steps on average
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class CompanyNamer:
+    """Maps account indices in range(capacity) to distinct company names in O(1)."""
+
+    def __init__(self, seed, capacity=CAPACITY):
+        if capacity > CAPACITY:
+            raise ValueError(f"at most {CAPACITY:,} unique company names are available")
+        self.seed = seed
+        self.capacity = capacity
+        self._permutation = KeyedPermutation(max(capacity, 1), f"company-names/{seed}")
+
+    def __reduce__(self):
+        return CompanyNamer, (self.seed, self.capacity)
+
+    # Function to get the company name for a 0-based account index
+    def name(self, index):
+        slot = self._permutation(index)
+        words = slot_words(slot)
+        # Two-word names are written either spaced or joined ("Tech Solutions" / "TechSolutions");
+        # both give the same domain, so the style is a fixed function of the slot, not an extra name
+        if len(words) == 2 and slot % 3 == 0:
+            return "".join(words)
+        return " ".join(words)
@@ -0,0 +1,34 @@
+import pytest
+
+from generate_dataset import generate_dataset
+from generator_io import NDJSONWriter
+from generator_providers import reference_date, set_reference_date
+
+# Shared fixtures for the generator tests: a small seeded dataset with a pinned
+# reference date, written once per session as NDJSON.
+
+SEED = 7
+REFERENCE_DATE = "2026-01-01"
+
+
+@pytest.fixture
+def pinned_reference_date():
+    previous = reference_date()
+    set_reference_date(REFERENCE_DATE)
+    yield REFERENCE_DATE
+    set_reference_date(previous)
+
+
+@pytest.fixture(scope="session")
+def small_dataset(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("dataset")
+    paths = {name: str(directory / f"{name}.ndjson") for name in ("accounts", "prospects", "activities")}
+    previous = reference_date()
+    set_reference_date(REFERENCE_DATE)
+    try:
+        with NDJSONWriter(paths["accounts"]) as accounts, NDJSONWriter(paths["prospects"]) as prospects, \
+                NDJSONWriter(paths["activities"]) as activities:
+            generate_dataset(40, SEED, accounts, prospects, activities)
+    finally:
+        set_reference_date(previous)
+    return paths
@@ -0,0 +1,84 @@
+import json
+import sqlite3
+
+# Python query layer over the SQLite database built by sqlite_sink.py.
+#
+# Each method mirrors a handler in accountController.js and is served by one of
+# the indexes in sqlite_sink.INDEXES. Rows come back as dicts in the generator's
+# record shape (accounts without their nested contacts/notes; use
+# get_account() for the full record).
+
+
+class CRMDatabase:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _all(self, sql, params=()):
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    # getAccount: one account with its contacts and notes
+    def get_account(self, account_id):
+        row = self.conn.execute("SELECT * FROM accounts WHERE account_id = ?", (account_id,)).fetchone()
+        if row is None:
+            return None
+        account = dict(row)
+        account["address"] = {key: account.pop(key) for key in ("street", "city", "state", "zip", "country")}
+        account["contacts"] = self._all("SELECT * FROM contacts WHERE account_id = ?", (account_id,))
+        for contact in account["contacts"]:
+            contact["primary"] = bool(contact.pop("is_primary"))
+            del contact["account_id"]
+        account["notes"] = self.get_account_notes(account_id)
+        return account
+
+    # getAccounts: all accounts sorted by name
+    def get_accounts(self, limit=None, offset=0):
+        return self._all("SELECT * FROM accounts ORDER BY company_name LIMIT ? OFFSET ?",
+                         (-1 if limit is None else limit, offset))
+
+    # searchAccounts: case-insensitive name match, sorted by name
+    def search_accounts(self, query, limit=50):
+        return self._all("SELECT * FROM accounts WHERE company_name LIKE ? ORDER BY company_name LIMIT ?",
+                         (f"%{query}%", limit))
+
+    # filterAccountsByIndustry: accounts in an industry, sorted by name
+    def filter_accounts_by_industry(self, industry, limit=None, offset=0):
+        return self._all("SELECT * FROM accounts WHERE industry = ? ORDER BY company_name LIMIT ? OFFSET ?",
+                         (industry, -1 if limit is None else limit, offset))
+
+    # getRecentAccounts: most recently contacted accounts
+    def get_recent_accounts(self, limit=5):
+        return self._all("SELECT * FROM accounts ORDER BY last_contact_date DESC LIMIT ?", (limit,))
+
+    # getAccountNotes: an account's notes, newest first
+    def get_account_notes(self, account_id):
+        notes = self._all("SELECT * FROM notes WHERE account_id = ? ORDER BY date DESC", (account_id,))
+        for note in notes:
+            del note["account_id"]
+        return notes
+
+    # getAccountProspects: an account's prospects sorted by name
+    def get_account_prospects(self, account_id):
+        prospects = self._all("SELECT * FROM prospects WHERE account_id = ? ORDER BY last_name, first_name",
+                              (account_id,))
+        for prospect in prospects:
+            prospect["interests"] = json.loads(prospect["interests"])
+        return prospects
+
+    # getAccountActivities: an account's latest activities
+    def get_account_activities(self, account_id, limit=5):
+        return self._all("SELECT * FROM activities WHERE account_id = ? ORDER BY date DESC LIMIT ?",
+                         (account_id, limit))
+
+    # Activities logged against one prospect, newest first
+    def get_prospect_activities(self, prospect_id):
+        return self._all("SELECT * FROM activities WHERE prospect_id = ? ORDER BY date DESC", (prospect_id,))
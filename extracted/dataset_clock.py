@@ -0,0 +1,429 @@
+import argparse
+import json
+import os
+import random
+import time
+from array import array
+from datetime import date
+
+import numpy as np
+
+from generator_io import iter_records
+from prospect_activity_generator import (activity_notes, activity_outcomes, activity_types, generate_activity,
+                                         generate_time, probability_ranges, prospect_statuses)
+
+# "Advance the clock" simulation over a generated dataset.
+#
+# init builds a checkpoint from existing prospects/activities files once;
+# advance moves simulated time forward N days and appends only what changed to
+# an append-only change log (NDJSON):
+#
+#   {"seq": 1, "date": "2026-10-17", "op": "create", "entity": "activity", "id": "ACT30414", "record": {...}}
+#   {"seq": 2, "date": "2026-10-17", "op": "update", "entity": "prospect", "id": "PROS0042",
+#    "changes": {"status": "Proposal", "probability": 61, "last_contact_date": "2026-10-17"}}
+#
+# Changes are new activities, prospect status transitions (with a probability
+# drawn for the new status), scheduled activities coming due (Completed with
+# an outcome and notes, or Cancelled) and updated last_contact_date.
+#
+# The checkpoint is a directory:
+#   state.json       RNG state, simulated date, next activity/sequence numbers, name vocabularies
+#                    and the last day's pending writes
+#   prospects.bin    fixed-width compact state per prospect number (memory-mapped, updated in place)
+#   agenda/          one file per future day listing the prospects due for an activity that day
+#                    and the scheduled activities that come due that day
+#
+# Each simulated day is committed on its own: the day's changes are buffered,
+# its log lines are written, then state.json is replaced with the new day and
+# the day's prospect rows, agenda appends and spent agenda files as "pending".
+# Only after that are prospects.bin and agenda/ touched. Loading a checkpoint
+# re-applies the pending writes (they are idempotent) and an advance first
+# drops log lines numbered after the saved seq, so an interrupted advance
+# resumes from the last completed day as if it had never been cut short.
+#
+# Advancing reads only the agenda files of the days it passes and touches only
+# the prospects that act, so its cost follows the number of changes, not the
+# size of the dataset. Output depends only on the checkpoint, so replaying the
+# same advance from a copy of the checkpoint gives the same log.
+#
+#   python dataset_clock.py init --checkpoint sim/ --prospects prospects.ndjson --activities activities.ndjson --seed 1
+#   python dataset_clock.py advance --checkpoint sim/ --days 7
+
+STATE_FILE = "state.json"
+PROSPECTS_FILE = "prospects.bin"
+AGENDA_DIR = "agenda"
+CHANGE_LOG = "changes.ndjson"
+CHECKPOINT_FORMAT = "dataset-clock/1"
+
+MEAN_DAYS_BETWEEN_ACTIVITIES = 14
+SCHEDULE_AHEAD_DAYS = 30
+COMPLETION_RATE = 0.8  # share of scheduled activities that are Completed (the rest are Cancelled)
+
+# Per-activity chance of moving a prospect to another status: {status: [(next status, chance), ...]}
+STATUS_TRANSITIONS = {
+    "Lead": [("Qualified Lead", 0.10), ("Closed Lost", 0.02), ("On Hold", 0.01)],
+    "Qualified Lead": [("Opportunity", 0.10), ("Closed Lost", 0.03), ("On Hold", 0.01)],
+    "Opportunity": [("Proposal", 0.10), ("Closed Lost", 0.04), ("On Hold", 0.02)],
+    "Proposal": [("Negotiation", 0.12), ("Closed Lost", 0.05), ("On Hold", 0.02)],
+    "Negotiation": [("Closed Won", 0.12), ("Closed Lost", 0.06)],
+    "On Hold": [("Opportunity", 0.10), ("Closed Lost", 0.05)],
+}
+CLOSED_STATUSES = {"Closed Won", "Closed Lost"}
+
+# Compact per-prospect state, indexed by prospect number (account 0 = no such prospect)
+PROSPECT_DTYPE = np.dtype([
+    ("account", "<u4"), ("first_name", "<u2"), ("assigned_to", "<u2"), ("status", "u1"), ("probability", "u1"),
+    ("last_contact", "<i4"),
+])
+
+
+def _iso(day):
+    return date.fromordinal(day).isoformat()
+
+
+class _Vocabulary:
+    """Names stored as small codes in the prospect state; the value list is saved in state.json."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _Agenda:
+    """Per-day event files: prospects due for an activity and scheduled activities coming due."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, day):
+        return os.path.join(self.directory, f"{kind}-{day}.bin")
+
+    # Function to append events to a day: `values` is a flat list of uint32 fields. With `at`, the file is
+    # first cut back to that size, so repeating the same add leaves the file unchanged.
+    def add(self, kind, day, values, at=None):
+        with open(self._path(kind, day), "ab") as f:
+            if at is not None:
+                f.truncate(at)
+            array("I", values).tofile(f)
+
+    def size(self, kind, day):
+        path = self._path(kind, day)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    # Function to read a day's events as a flat uint32 array
+    def read(self, kind, day):
+        path = self._path(kind, day)
+        events = array("I")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                events.frombytes(f.read())
+        return events
+
+    def discard(self, kind, day):
+        path = self._path(kind, day)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# Function to drop log lines past `seq` (and a torn last line) left by an interrupted advance.
+# Lines are read back from the end, so only the uncommitted tail is scanned.
+def _trim_log(path, seq):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = pos = f.seek(0, os.SEEK_END)
+        buffer = b""
+        keep = 0
+        while pos > 0 and not keep:
+            step = min(1 << 16, pos)
+            pos -= step
+            f.seek(pos)
+            buffer = f.read(step) + buffer
+            lines = buffer.split(b"\n")
+            end = pos + len(buffer)
+            for i in range(len(lines) - 1, 0 if pos else -1, -1):
+                start = end - len(lines[i])
+                try:
+                    if lines[i].strip() and json.loads(lines[i])["seq"] <= seq:
+                        keep = end + 1 if end < size else end
+                        break
+                except ValueError:
+                    pass
+                end = start - 1
+            buffer = lines[0]
+        if keep < size:
+            f.truncate(keep)
+
+
+class DatasetClock:
+    """A loaded checkpoint; advance() appends changes to the log and saves the new checkpoint."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, STATE_FILE)) as f:
+            state = json.load(f)
+        if state.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"{directory} is not a dataset clock checkpoint")
+        self.state = state
+        self.rng = random.Random()
+        version, internal, gauss = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss))
+        self.first_names = _Vocabulary(state["first_names"])
+        self.reps = _Vocabulary(state["reps"])
+        self.prospects = np.memmap(os.path.join(directory, PROSPECTS_FILE), dtype=PROSPECT_DTYPE, mode="r+")
+        self.agenda = _Agenda(os.path.join(directory, AGENDA_DIR))
+        self._rows = {}  # prospect rows read or changed today, written to prospects.bin when the day commits
+        self._adds = {}  # {(kind, day): values} agenda events added today
+        if state.get("pending"):
+            self._apply(state["pending"])
+
+    @property
+    def today(self):
+        return self.state["day"]
+
+    def _save(self):
+        self.prospects.flush()
+        version, internal, gauss = self.rng.getstate()
+        self.state["rng"] = [version, list(internal), gauss]
+        self.state["first_names"] = self.first_names.values
+        self.state["reps"] = self.reps.values
+        path = os.path.join(self.directory, STATE_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.state, f)
+        os.replace(path + ".tmp", path)
+
+    # Function to save the finished day as the checkpoint, then write its changes to prospects.bin and agenda/
+    def _commit(self, day):
+        self.state["day"] = day
+        self.state["pending"] = {
+            "prospects": [[number, int(row["status"]), int(row["probability"]), int(row["last_contact"])]
+                          for number, row in self._rows.items()],
+            "agenda": [[kind, due, self.agenda.size(kind, due), values] for (kind, due), values in self._adds.items()],
+            "spent": [["scheduled", day], ["prospects", day]],
+        }
+        self._save()
+        self._apply(self.state["pending"])
+
+    def _apply(self, pending):
+        for number, status, probability, last_contact in pending["prospects"]:
+            self.prospects["status"][number] = status
+            self.prospects["probability"][number] = probability
+            self.prospects["last_contact"][number] = last_contact
+        self.prospects.flush()
+        for kind, due, at, values in pending["agenda"]:
+            self.agenda.add(kind, due, values, at)
+        for kind, day in pending["spent"]:
+            self.agenda.discard(kind, day)
+        self._rows = {}
+        self._adds = {}
+
+    def _row(self, number):
+        row = self._rows.get(number)
+        if row is None:
+            row = self._rows[number] = self.prospects[number].copy()
+        return row
+
+    def _schedule(self, kind, day, values):
+        self._adds.setdefault((kind, day), []).extend(values)
+
+    def _next_activity_day(self, day):
+        return day + max(1, round(self.rng.expovariate(1 / MEAN_DAYS_BETWEEN_ACTIVITIES)))
+
+    def _prospect(self, number):
+        row = self.prospects[number]
+        return {
+            "prospect_id": f"PROS{number:04d}",
+            "account_id": f"ACC{int(row['account']):04d}",
+            "first_name": self.first_names.values[row["first_name"]],
+            "assigned_to": self.reps.values[row["assigned_to"]],
+        }
+
+    # Function to advance the clock by `days`, appending changes to the log; returns change counts
+    def advance(self, days, log_path=None):
+        counts = {"activities_created": 0, "activities_completed": 0, "activities_cancelled": 0,
+                  "status_changes": 0, "prospect_updates": 0}
+        log_path = log_path or os.path.join(self.directory, CHANGE_LOG)
+        _trim_log(log_path, self.state["seq"])
+        lines = []
+        with open(log_path, "a", encoding="utf-8") as log:
+            def emit(day, op, entity, record_id, **body):
+                self.state["seq"] += 1
+                lines.append(json.dumps({"seq": self.state["seq"], "date": _iso(day), "op": op, "entity": entity,
+                                         "id": record_id, **body}) + "\n")
+
+            for day in range(self.today + 1, self.today + days + 1):
+                self._complete_scheduled(day, emit, counts)
+                self._run_activities(day, emit, counts)
+                log.writelines(lines)
+                log.flush()
+                os.fsync(log.fileno())
+                lines.clear()
+                self._commit(day)
+        return counts
+
+    def _complete_scheduled(self, day, emit, counts):
+        events = self.agenda.read("scheduled", day)
+        rng = self.rng
+        for i in range(0, len(events), 3):
+            activity, prospect, activity_type = events[i:i + 3]
+            row = self._row(prospect)
+            if rng.random() < COMPLETION_RATE:
+                outcome = rng.choice(activity_outcomes)
+                notes = activity_notes[outcome].render(rng, first_name=self.first_names.values[row["first_name"]],
+                                                       activity=activity_types[activity_type].lower())
+                emit(day, "update", "activity", f"ACT{activity:04d}",
+                     changes={"status": "Completed", "outcome": outcome, "notes": notes})
+                counts["activities_completed"] += 1
+                if day > row["last_contact"]:
+                    row["last_contact"] = day
+                    emit(day, "update", "prospect", f"PROS{prospect:04d}", changes={"last_contact_date": _iso(day)})
+                    counts["prospect_updates"] += 1
+            else:
+                emit(day, "update", "activity", f"ACT{activity:04d}", changes={"status": "Cancelled"})
+                counts["activities_cancelled"] += 1
+
+    def _run_activities(self, day, emit, counts):
+        rng = self.rng
+        for prospect in self.agenda.read("prospects", day):
+            row = self._row(prospect)
+            status = prospect_statuses[row["status"]]
+            if status in CLOSED_STATUSES:
+                continue
+
+            number = self.state["next_activity"]
+            self.state["next_activity"] += 1
+            activity = generate_activity(self._prospect(prospect), f"ACT{number:04d}", 0, rng)
+            changes = {}
+            if activity["status"] == "Scheduled":
+                due = day + rng.randint(1, SCHEDULE_AHEAD_DAYS)
+                activity["date"] = _iso(due)
+                activity["time"] = generate_time(rng)
+                self._schedule("scheduled", due, [number, prospect, activity_types.index(activity["type"])])
+            else:
+                activity["date"] = _iso(day)
+                if activity["status"] == "Completed" and day > row["last_contact"]:
+                    row["last_contact"] = day
+                    changes["last_contact_date"] = _iso(day)
+            emit(day, "create", "activity", activity["activity_id"], record=activity)
+            counts["activities_created"] += 1
+
+            draw = rng.random()
+            for next_status, chance in STATUS_TRANSITIONS[status]:
+                if draw < chance:
+                    row["status"] = prospect_statuses.index(next_status)
+                    row["probability"] = rng.randint(*probability_ranges[next_status])
+                    changes["status"] = next_status
+                    changes["probability"] = int(row["probability"])
+                    counts["status_changes"] += 1
+                    break
+                draw -= chance
+
+            if changes:
+                emit(day, "update", "prospect", f"PROS{prospect:04d}", changes=changes)
+                counts["prospect_updates"] += 1
+            if prospect_statuses[row["status"]] not in CLOSED_STATUSES:
+                self._schedule("prospects", self._next_activity_day(day), [prospect])
+
+
+# Function to build a checkpoint directory from generated prospects and activities files
+def init_checkpoint(directory, prospects_path, activities_path, seed, start=None):
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(os.path.join(directory, STATE_FILE)):
+        raise FileExistsError(f"{directory} already holds a checkpoint")
+    rng = random.Random(seed)
+    first_names = _Vocabulary()
+    reps = _Vocabulary()
+
+    rows = {}
+    latest = None  # the dataset's own date: the last day anything already happened on
+    for prospect in iter_records(prospects_path):
+        last_contact = date.fromisoformat(prospect["last_contact_date"]).toordinal()
+        rows[int(prospect["prospect_id"][4:])] = (
+            int(prospect["account_id"][3:]), first_names.code(prospect["first_name"]),
+            reps.code(prospect["assigned_to"]), prospect_statuses.index(prospect["status"]), prospect["probability"],
+            last_contact)
+        latest = last_contact if latest is None else max(latest, last_contact)
+    state = np.zeros(max(rows, default=0) + 1, dtype=PROSPECT_DTYPE)
+    for number, row in rows.items():
+        state[number] = row
+    state.tofile(os.path.join(directory, PROSPECTS_FILE))
+
+    pending = []
+    next_activity = 1
+    for activity in iter_records(activities_path):
+        number = int(activity["activity_id"][3:])
+        next_activity = max(next_activity, number + 1)
+        day = date.fromisoformat(activity["date"]).toordinal()
+        if activity["status"] == "Scheduled":
+            pending.append((day, number, int(activity["prospect_id"][4:]), activity_types.index(activity["type"])))
+        else:
+            latest = day if latest is None else max(latest, day)
+    if start:
+        start = date.fromisoformat(start).toordinal()
+    else:
+        start = latest if latest is not None else date.today().toordinal()
+
+    agenda = _Agenda(os.path.join(directory, AGENDA_DIR))
+    scheduled = {}
+    for day, number, prospect, activity_type in pending:
+        scheduled.setdefault(max(day, start + 1), []).extend([number, prospect, activity_type])
+    for due in sorted(scheduled):
+        agenda.add("scheduled", due, scheduled[due])
+
+    due_prospects = {}
+    for number, row in sorted(rows.items()):
+        if prospect_statuses[row[3]] not in CLOSED_STATUSES:
+            day = start + max(1, round(rng.expovariate(1 / MEAN_DAYS_BETWEEN_ACTIVITIES)))
+            due_prospects.setdefault(day, []).append(number)
+    for day in sorted(due_prospects):
+        agenda.add("prospects", day, due_prospects[day])
+
+    version, internal, gauss = rng.getstate()
+    with open(os.path.join(directory, STATE_FILE), "w") as f:
+        json.dump({"format": CHECKPOINT_FORMAT, "day": start, "next_activity": next_activity, "seq": 0,
+                   "rng": [version, list(internal), gauss], "first_names": first_names.values,
+                   "reps": reps.values}, f)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evolve a generated dataset day by day as an append-only change log.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    init = commands.add_parser("init", help="create a checkpoint from generated files")
+    init.add_argument("--checkpoint", required=True, help="checkpoint directory to create")
+    init.add_argument("--prospects", default="prospects.json", help="prospects file")
+    init.add_argument("--activities", default="activities.json", help="activities file")
+    init.add_argument("--seed", type=int, default=1, help="seed for the simulation RNG")
+    init.add_argument("--start", help="simulated date the dataset is at (default: the latest activity or "
+                                     "last contact date in the files)")
+    advance = commands.add_parser("advance", help="advance simulated time and append the changes")
+    advance.add_argument("--checkpoint", required=True, help="checkpoint directory")
+    advance.add_argument("--days", type=int, default=1, help="days to advance")
+    advance.add_argument("--log", help=f"change log to append to (default: <checkpoint>/{CHANGE_LOG})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == "init":
+        prospects = init_checkpoint(args.checkpoint, args.prospects, args.activities, args.seed, args.start)
+        print(f"Checkpoint for {prospects} prospects written to {args.checkpoint} "
+              f"({time.perf_counter() - started:.2f}s)")
+        return
+
+    clock = DatasetClock(args.checkpoint)
+    first_day = clock.today + 1
+    counts = clock.advance(args.days, args.log)
+    print(f"Advanced {_iso(first_day)} .. {_iso(clock.today)}: "
+          + ", ".join(f"{value} {name.replace('_', ' ')}" for name, value in counts.items())
+          + f" ({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+
+from account_data_generator import generate_sharded_accounts
+from activity_feed import TimeOrderedWriter, add_time_ordered_arguments
+from generator_io import OUTPUT_FORMATS, default_output_path, open_writer
+from generator_metrics import add_metrics_arguments, metrics_from_args
+from generator_providers import add_reference_date_arguments, reference_date, set_reference_date
+from generator_random import random_seed
+from prospect_activity_generator import DEFAULT_SHARD_SIZE, generate_sharded_prospect_groups, write_prospect_groups
+from sqlite_sink import SQLiteSink
+from workload_profiles import DEFAULT_PROFILE, SkewSummary, add_profile_arguments, load_profile
+
+# Single-process streaming pipeline: accounts -> prospects -> activities.
+#
+# Each account is written to the accounts sink and handed straight on to
+# prospect and activity generation, whose output goes to the other two sinks.
+# There is no intermediate accounts file and nothing is collected into lists,
+# so memory stays bounded however large the dataset is.
+#
+# For a given seed the three files match what running account_data_generator.py
+# and then prospect_activity_generator.py with the same seed, --shards and
+# --shard-size would produce. --workers runs account and prospect shards on
+# process pools; the output stays the same for any number of workers.
+
+
+# Function to pass records through to a sink while yielding them on to the next stage
+def tee_to_writer(records, writer):
+    for record in records:
+        writer.write(record)
+        yield record
+
+
+# Function to stream a complete dataset into three sinks; returns the sinks for their counts
+# (a SkewSummary, if given, observes every account and prospect group on the way through)
+def generate_dataset(count, seed, accounts_writer, prospects_writer, activities_writer,
+                     shards=1, shard_size=DEFAULT_SHARD_SIZE, unique_names=False, profile=DEFAULT_PROFILE, skew=None,
+                     workers=1):
+    accounts = generate_sharded_accounts(count, seed, shards, workers, unique_names, profile)
+    if skew is not None:
+        accounts = skew.observe_accounts(accounts)
+    accounts = tee_to_writer(accounts, accounts_writer)
+    groups = generate_sharded_prospect_groups(accounts, seed, shard_size, workers, profile)
+    if skew is not None:
+        groups = skew.observe_groups(groups)
+    write_prospect_groups(groups, prospects_writer, activities_writer)
+    return accounts_writer, prospects_writer, activities_writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate accounts, prospects and activities in one streaming pass.")
+    parser.add_argument("--count", type=int, default=50, help="number of accounts to generate")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS) + ["sqlite"], default="ndjson",
+                        help="json writes pretty-printed arrays, ndjson writes one compact record per line, "
+                             "sqlite bulk-loads everything into one indexed database")
+    parser.add_argument("--database", default="crm.db", help="database file for --format sqlite")
+    parser.add_argument("--seed", type=int, help="seed for reproducible output (default: random)")
+    parser.add_argument("--shards", type=int, default=1, help="account shards (see account_data_generator.py)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="accounts per prospect shard (see prospect_activity_generator.py)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for account and prospect shards (output is the same for any number)")
+    parser.add_argument("--unique-names", action="store_true",
+                        help="give every account a distinct company name and domain")
+    parser.add_argument("--columnar-activities", action="store_true",
+                        help="write activities to activities.actcol (see activity_columns.py) instead")
+    add_time_ordered_arguments(parser)
+    add_profile_arguments(parser)
+    add_reference_date_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    set_reference_date(args.reference_date)
+    seed = args.seed if args.seed is not None else random_seed()
+    profile = load_profile(args.profile)
+    skew = SkewSummary()
+    metrics = metrics_from_args(args)
+
+    if args.output_format == "sqlite":
+        outputs = [args.database]
+        with metrics, SQLiteSink(args.database) as sink:
+            activities_sink = metrics.timed_writer(sink.activities, "activities")
+            if args.time_ordered:
+                activities_sink = TimeOrderedWriter(activities_sink, args.run_records)
+            with activities_sink:
+                accounts_writer, prospects_writer, activities_writer = generate_dataset(
+                    args.count, seed, metrics.timed_writer(sink.accounts, "accounts"),
+                    metrics.timed_writer(sink.prospects, "prospects"), activities_sink, args.shards, args.shard_size,
+                    args.unique_names, profile, skew, args.workers)
+    else:
+        outputs = [default_output_path(name, args.output_format) for name in ("accounts", "prospects", "activities")]
+        if args.columnar_activities:
+            outputs[2] = "activities.actcol"
+            from activity_columns import ActivityColumnWriter  # NumPy is only needed for the columnar format
+            activities_sink = ActivityColumnWriter(outputs[2])
+        else:
+            activities_sink = open_writer(outputs[2], args.output_format)
+        activities_sink = metrics.timed_writer(activities_sink, "activities")
+        if args.time_ordered:
+            activities_sink = TimeOrderedWriter(activities_sink, args.run_records)
+        with metrics, \
+                metrics.timed_writer(open_writer(outputs[0], args.output_format), "accounts") as accounts_writer, \
+                metrics.timed_writer(open_writer(outputs[1], args.output_format), "prospects") as prospects_writer, \
+                activities_sink as activities_writer:
+            generate_dataset(args.count, seed, accounts_writer, prospects_writer, activities_writer,
+                             args.shards, args.shard_size, args.unique_names, profile, skew, args.workers)
+
+    print(f"Generated {accounts_writer.count} accounts, {prospects_writer.count} prospects and "
+          f"{activities_writer.count} activities (seed {seed}, dates relative to {reference_date()})")
+    print(f"Saved to {', '.join(outputs)}")
+    skew.report(profile, args.skew_report)
+    metrics.write_report(args.metrics, {"accounts": accounts_writer.count, "prospects": prospects_writer.count,
+                                        "activities": activities_writer.count},
+                         outputs, command="generate_dataset", seed=seed)
+
+
+if __name__ == "__main__":
+    main()
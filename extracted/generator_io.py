@@ -0,0 +1,191 @@
+import gzip
+import json
+import lzma
+from functools import partial
+
+from block_ndjson import CODEC_EXTENSIONS, BlockNDJSONWriter
+
+# Shared input/output helpers for the data generator scripts.
+#
+# Writers take records one at a time and readers yield them one at a time, so
+# generators can be chained straight into output files (or from an existing
+# file) with memory that stays flat regardless of how many records flow through.
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+READ_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+_compact_encoder = json.JSONEncoder(separators=(",", ":"))
+_pretty_encoder = json.JSONEncoder(indent=2)
+_decoder = json.JSONDecoder()
+
+
+class NDJSONWriter:
+    """Writes records as newline-delimited JSON (one compact object per line)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "w", buffering=WRITE_BUFFER_SIZE)
+        self._encode = _compact_encoder.encode
+
+    def write(self, record):
+        self._file.write(self._encode(record) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JSONArrayWriter:
+    """Writes records as a pretty-printed JSON array.
+
+    The output is byte-identical to json.dump(list(records), f, indent=2), but
+    records are encoded one at a time instead of materializing the whole list.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "w", buffering=WRITE_BUFFER_SIZE)
+        self._encode = _pretty_encoder.encode
+
+    def write(self, record):
+        self._file.write(("[\n  " if self.count == 0 else ",\n  ") + self._encode(record).replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]" if self.count else "[]")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+OUTPUT_FORMATS = {
+    "json": JSONArrayWriter,
+    "ndjson": NDJSONWriter,
+    "ndjson.gz": partial(BlockNDJSONWriter, codec="gzip"),
+    "ndjson.xz": partial(BlockNDJSONWriter, codec="lzma"),
+}
+
+DEFAULT_EXTENSIONS = {
+    "json": ".json",
+    "ndjson": ".ndjson",
+    "ndjson.gz": CODEC_EXTENSIONS["gzip"],
+    "ndjson.xz": CODEC_EXTENSIONS["lzma"],
+}
+
+# Leading bytes of compressed inputs that iter_records() can read
+_COMPRESSED_OPENERS = {
+    b"\x1f\x8b": gzip.open,
+    b"\xfd7zXZ\x00": lzma.open,
+}
+
+
+# Function to open a record writer (sink) for the named output format
+def open_writer(path, output_format="json"):
+    return OUTPUT_FORMATS[output_format](path)
+
+
+# Function to write records as newline-delimited JSON
+def write_ndjson(records, path):
+    return write_records(records, path, "ndjson")
+
+
+# Function to write records as a pretty-printed JSON array
+def write_json_array(records, path):
+    return write_records(records, path, "json")
+
+
+# Function to write records in the named output format
+def write_records(records, path, output_format="json"):
+    with open_writer(path, output_format) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+# Function to pick the default output path for a base name and format
+def default_output_path(base_name, output_format="json"):
+    return base_name + DEFAULT_EXTENSIONS[output_format]
+
+
+# Function to yield the elements of a top-level JSON array without loading the whole file.
+# Chunks are appended to a buffer and complete elements are decoded off its front.
+def _iter_json_array(f, buffer):
+    pos = buffer.index("[") + 1
+    while True:
+        # Skip whitespace and separators up to the next element
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer):
+                break
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("unterminated JSON array")
+            buffer, pos = chunk, 0
+
+        if buffer[pos] == "]":
+            return
+
+        while True:
+            try:
+                record, end = _decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+        yield record
+        pos = end
+
+
+# Function to open a text file for reading, decompressing gzip/xz input (e.g. block-compressed NDJSON)
+def _open_text(path):
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    for prefix, opener in _COMPRESSED_OPENERS.items():
+        if magic.startswith(prefix):
+            return opener(path, "rt")
+    return open(path, "r")
+
+
+# Function to read records incrementally from a JSON array or NDJSON file (optionally gzip/xz compressed).
+# The format is detected from the first non-whitespace character.
+def iter_records(path):
+    with _open_text(path) as f:
+        buffer = ""
+        while not buffer.strip():
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            buffer += chunk
+
+        if buffer.lstrip()[0] == "[":
+            yield from _iter_json_array(f, buffer)
+            return
+
+        # NDJSON: the first chunk may end mid-line, so stitch it onto the rest of the file
+        lines = buffer.split("\n")
+        tail = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        for line in f:
+            if tail:
+                line, tail = tail + line, ""
+            if line.strip():
+                yield json.loads(line)
+        if tail.strip():
+            yield json.loads(tail)
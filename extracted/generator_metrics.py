@@ -0,0 +1,261 @@
+import cProfile
+import importlib
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Opt-in per-stage instrumentation for the generator scripts.
+#
+# Nothing here runs unless asked for: the generators call their helpers through
+# plain module globals, and GeneratorMetrics.install() swaps timed wrappers in
+# for those globals (and for the note/activity TemplateSets' render methods)
+# only while instrumentation is on, restoring the originals afterwards. With
+# instrumentation off the generators run their usual code, unchanged.
+#
+# Each stage records calls, total time and self time (total minus time spent in
+# nested stages), so account generation splits into company name, address,
+# contact email/phone, IDs, dates and notes, activity generation into
+# description and notes, and serialization shows up as the write.* stages of
+# sinks wrapped with timed_writer(). Each timed call adds a microsecond or two,
+# so an instrumented generate_dataset.py run is roughly 20% slower; compare
+# stage shares rather than absolute times against uninstrumented runs.
+# Optional extras:
+#
+#   --tracemalloc     traced current/peak bytes and the top allocation sites
+#   --cprofile PATH   a cProfile capture of the run (pstats file) plus its
+#                     top functions in the report
+#
+# The report is one JSON object: wall/CPU seconds, peak RSS, record counts and
+# records/sec, bytes written per output file, per-stage timings and the
+# extras. Stages are only hooked in the main process, so run with the default
+# single worker when instrumenting.
+#
+#   python account_data_generator.py --count 100000 --format ndjson --metrics metrics.json
+#   python generate_dataset.py --count 10000 --metrics - --tracemalloc --cprofile generate.prof
+
+TOP_ENTRIES = 15
+
+
+# Function to get this process's peak resident set size in bytes (0 where the platform has no getrusage)
+def peak_rss():
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+# Function to get the module whose globals a generator actually runs with: __main__ when run as a script
+def _running_module(name):
+    main = sys.modules["__main__"]
+    if os.path.splitext(os.path.basename(getattr(main, "__file__", "")))[0] == name:
+        return main
+    return importlib.import_module(name)
+
+
+class TimedWriter:
+    """Sink wrapper that times write() calls as a stage; count and close() pass through."""
+
+    def __init__(self, writer, timed_write):
+        self.writer = writer
+        self.write = timed_write
+
+    @property
+    def count(self):
+        return self.writer.count
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GeneratorMetrics:
+    """Stage timers, optional tracemalloc/cProfile capture and the metrics report for one run.
+
+    Use as a context manager around the generation: entering installs the stage
+    hooks (if `stages`) and starts the captures, leaving removes the hooks and
+    stops them. Wall time, CPU time and peak RSS are always recorded.
+    """
+
+    def __init__(self, stages=True, trace_memory=False, cprofile_path=None):
+        self.stages = stages
+        self.trace_memory = trace_memory
+        self.cprofile_path = cprofile_path
+        self.timings = {}  # stage name -> [calls, total ns, ns in nested stages]
+        self._stack = []
+        self._patched = []
+        self._profiler = None
+        self._tracemalloc = None
+        self.wall_seconds = self.cpu_seconds = 0.0
+
+    # Function to wrap a callable so each call is timed as the named stage
+    def timed(self, name, function):
+        timing = self.timings.setdefault(name, [0, 0, 0])
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def timed_call(*args, **kwargs):
+            started = clock()
+            stack.append(0)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                timing[0] += 1
+                timing[1] += elapsed
+                timing[2] += stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+        return timed_call
+
+    # Function to replace owner.attribute (a module global or a bound method) with a timed wrapper until uninstall()
+    def instrument(self, owner, attribute, name):
+        original = getattr(owner, attribute)
+        self._patched.append((owner, attribute, owner.__dict__.get(attribute)))
+        setattr(owner, attribute, self.timed(name, original))
+
+    # Function to hook the account, prospect and activity generation stages
+    def install(self):
+        accounts = _running_module("account_data_generator")
+        prospects = _running_module("prospect_activity_generator")
+
+        for attribute in ("generate_account", "generate_company_name", "generate_address", "generate_email",
+                          "generate_phone", "generate_uuid", "generate_date", "generate_revenue"):
+            self.instrument(accounts, attribute, f"accounts.{attribute}")
+        self.instrument(accounts.note_template_set, "render", "accounts.note_text")
+        for attribute in ("generate_prospect", "generate_activity", "generate_date", "generate_future_date",
+                          "generate_time"):
+            self.instrument(prospects, attribute, f"prospects.{attribute}")
+        for templates in prospects.activity_descriptions.values():
+            self.instrument(templates, "render", "prospects.activity_description")
+        for templates in prospects.activity_notes.values():
+            self.instrument(templates, "render", "prospects.activity_notes")
+
+    # Function to put back everything install()/instrument() replaced
+    def uninstall(self):
+        for owner, attribute, original in reversed(self._patched):
+            if original is None:
+                delattr(owner, attribute)  # an instance attribute shadowing the class method
+            else:
+                setattr(owner, attribute, original)
+        self._patched = []
+
+    # Function to time a sink's write() calls as the write.<name> stage (returns the sink as is when stages are off)
+    def timed_writer(self, writer, name):
+        if not self.stages:
+            return writer
+        return TimedWriter(writer, self.timed(f"write.{name}", writer.write))
+
+    def __enter__(self):
+        if self.stages:
+            self.install()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.cprofile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall_seconds = time.perf_counter() - self._started
+        self.cpu_seconds = time.process_time() - self._cpu_started
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.cprofile_path)
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ENTRIES]
+            tracemalloc.stop()
+            self._tracemalloc = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_allocations": [{"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                                     "bytes": stat.size, "blocks": stat.count} for stat in top],
+            }
+        self.uninstall()
+
+    # Function to summarize the stage timings, slowest self time first
+    def stage_report(self):
+        stages = {}
+        for name, (calls, total, nested) in sorted(self.timings.items(), key=lambda item: item[1][2] - item[1][1]):
+            if calls:
+                stages[name] = {
+                    "calls": calls,
+                    "total_seconds": round(total / 1e9, 6),
+                    "self_seconds": round((total - nested) / 1e9, 6),
+                    "self_share": round((total - nested) / 1e9 / self.wall_seconds, 4) if self.wall_seconds else None,
+                }
+        return stages
+
+    # Function to list the profiled functions with the most cumulative time
+    def _profile_report(self):
+        stats = pstats.Stats(self._profiler).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+        return {
+            "path": self.cprofile_path,
+            "top_cumulative": [{"function": f"{os.path.basename(filename)}:{line}({function})", "calls": calls,
+                                "own_seconds": round(own, 6), "cumulative_seconds": round(cumulative, 6)}
+                               for (filename, line, function), (_, calls, own, cumulative, _) in ranked],
+        }
+
+    # Function to build the machine-readable metrics report
+    def report(self, records=None, outputs=(), **details):
+        records = dict(records or {})
+        total = sum(records.values())
+        report = {
+            "argv": sys.argv,
+            "python": platform.python_version(),
+            **details,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "peak_rss_bytes": peak_rss(),
+            "records": records,
+            "records_per_second": round(total / self.wall_seconds, 1) if self.wall_seconds else None,
+            "bytes_written": {path: os.path.getsize(path) for path in outputs if os.path.isfile(path)},
+        }
+        if self.stages:
+            report["stages"] = self.stage_report()
+        if self._tracemalloc is not None:
+            report["tracemalloc"] = self._tracemalloc
+        if self._profiler is not None:
+            report["cprofile"] = self._profile_report()
+        return report
+
+    # Function to write the report as JSON to a path ("-" for stdout); does nothing without a path
+    def write_report(self, path, records=None, outputs=(), **details):
+        if not path:
+            return
+        text = json.dumps(self.report(records, outputs, **details), indent=2)
+        if path == "-":
+            print(text)
+        else:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+
+
+# Function to add the --metrics/--tracemalloc/--cprofile options to a generator's parser
+def add_metrics_arguments(parser):
+    parser.add_argument("--metrics", help="write a JSON metrics report with per-stage timings to this path (- for stdout)")
+    parser.add_argument("--tracemalloc", action="store_true", help="trace allocations; peak and top sites go in the report")
+    parser.add_argument("--cprofile", help="capture a cProfile of the run to this pstats file")
+
+
+# Function to make the metrics collector for a generator's parsed arguments; stage hooks only with --metrics
+def metrics_from_args(args):
+    return GeneratorMetrics(stages=bool(args.metrics), trace_memory=args.tracemalloc, cprofile_path=args.cprofile)
@@ -0,0 +1,92 @@
+import random
+from datetime import date
+
+# Shared value providers for the scalar generator scripts: dates, phone numbers
+# and zip codes.
+#
+# Dates are rendered from a table of "%Y-%m-%d" strings for every day offset
+# the generators use (five years back to one year ahead), built once against a
+# pinned reference date instead of calling datetime.now()/strftime per value.
+# The reference date defaults to today when the module is loaded and can be
+# pinned with --reference-date, so a seed plus a reference date reproduces a
+# dataset exactly, and a run never straddles midnight. Sharded runs hand the
+# reference date to their worker processes (see generator_shards.py).
+#
+# Phone numbers and zip codes come from a single draw each, split into digit
+# groups that are looked up in small pre-rendered tables. Formats are unchanged:
+# "+<1-9><100-999><100-999><1000-9999>" phones and five-digit zips.
+#
+#   python generate_dataset.py --count 1000 --seed 7 --reference-date 2026-01-01
+
+DAYS_BACK = 1825  # 5 years
+DAYS_AHEAD = 365
+
+_THREE_DIGITS = [str(n) for n in range(100, 1000)]
+_FOUR_DIGITS = [str(n) for n in range(1000, 10000)]
+_ZIP_HEADS = [str(n) for n in range(10, 100)]
+_ZIP_TAILS = [f"{n:03d}" for n in range(1000)]
+_PHONE_NUMBERS = 9 * 900 * 900 * 9000
+
+
+class DateTable:
+    """ISO date strings for every day offset in [-DAYS_BACK, DAYS_AHEAD] around a reference date."""
+
+    def __init__(self, reference=None):
+        self.reference = reference or date.today()
+        self.origin = self.reference.toordinal()
+        self.labels = [date.fromordinal(self.origin + offset).isoformat()
+                       for offset in range(-DAYS_BACK, DAYS_AHEAD + 1)]
+
+    # Function to get the date `offset` days from the reference date (negative: in the past)
+    def label(self, offset):
+        index = offset + DAYS_BACK
+        if 0 <= index < len(self.labels):
+            return self.labels[index]
+        return date.fromordinal(self.origin + offset).isoformat()
+
+
+_dates = DateTable()
+
+
+# Function to get the current date table
+def date_table():
+    return _dates
+
+
+# Function to get the date generated dates are relative to
+def reference_date():
+    return _dates.reference
+
+
+# Function to pin the reference date (a date, a YYYY-MM-DD string, or None for today) and rebuild the table
+def set_reference_date(reference=None):
+    global _dates
+    if isinstance(reference, str):
+        reference = date.fromisoformat(reference)
+    if reference != _dates.reference:
+        _dates = DateTable(reference)
+
+
+# Function to render the date `offset` days from the reference date as YYYY-MM-DD
+def day_label(offset):
+    return _dates.label(offset)
+
+
+# Function to generate a random phone number, e.g. "+55551234567"
+def phone_number(rng=random):
+    n, last = divmod(rng.randrange(_PHONE_NUMBERS), 9000)
+    n, middle = divmod(n, 900)
+    country, area = divmod(n, 900)
+    return f"+{country + 1}{_THREE_DIGITS[area]}{_THREE_DIGITS[middle]}{_FOUR_DIGITS[last]}"
+
+
+# Function to generate a random five-digit zip code (same draw as randint(10000, 99999))
+def zip_code(rng=random):
+    head, tail = divmod(rng.randrange(90000), 1000)
+    return _ZIP_HEADS[head] + _ZIP_TAILS[tail]
+
+
+# Function to add the --reference-date option to a generator's parser
+def add_reference_date_arguments(parser):
+    parser.add_argument("--reference-date", help="date generated dates are relative to (YYYY-MM-DD, default: today); "
+                                                 "with --seed it makes the output fully reproducible")
@@ -0,0 +1,32 @@
+import random
+
+# Shared RNG helpers for the data generator scripts.
+#
+# Every generator function takes an ``rng`` argument (defaulting to the global
+# ``random`` module) so callers can hand it an isolated, seeded random.Random.
+
+
+# Function to create an independent RNG for one stream (e.g. a shard) of a seeded run.
+# String seeds are hashed with SHA-512 by random.Random, so the result is stable
+# across processes and Python versions.
+def make_rng(seed, stream=0):
+    return random.Random(f"{seed}:{stream}")
+
+
+# Function to pick a fresh seed for runs where the caller didn't provide one
+def random_seed():
+    return random.SystemRandom().randrange(2**32)
+
+
+# Version 4 UUID bits: version nibble 4, variant bits 10
+_UUID4_CLEAR = ~((0xf000 << 64) | (0xc000 << 48))
+_UUID4_SET = (0x4000 << 64) | (0x8000 << 48)
+
+
+# Function to generate a version 4 UUID string from the given RNG.
+# Unlike uuid.uuid4() this follows the RNG's seed, so seeded runs are reproducible.
+# Same value as str(uuid.UUID(int=rng.getrandbits(128), version=4)), formatted
+# straight from the hex digits without building a UUID object.
+def generate_uuid(rng=random):
+    digits = f"{rng.getrandbits(128) & _UUID4_CLEAR | _UUID4_SET:032x}"
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
@@ -0,0 +1,55 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from generator_providers import reference_date, set_reference_date
+
+# Shared process-pool helpers for the data generator scripts.
+#
+# A run is split into a fixed number of shards, each covering a contiguous
+# slice of the ID space and drawing from its own seeded RNG. Shard results are
+# always yielded in shard order, so the merged output only depends on the seed
+# and the shard count, never on how many worker processes produced it.
+
+
+# Function to split `total` items into `shards` contiguous (start, count) ranges.
+# Earlier shards get the remainder, e.g. 10 items in 3 shards -> 4, 3, 3.
+def shard_ranges(total, shards, start=0):
+    shards = max(1, min(shards, total)) if total else 1
+    base, extra = divmod(total, shards)
+    ranges = []
+    for shard in range(shards):
+        count = base + (1 if shard < extra else 0)
+        ranges.append((start, count))
+        start += count
+    return ranges
+
+
+# Function to run `func` over each shard's arguments and yield the results in shard order.
+# With a single worker everything runs in-process. Otherwise at most two shards per
+# worker are in flight at once, so finished shards never pile up in memory while
+# the caller is still writing out an earlier one. Workers render dates against the
+# caller's reference date (see generator_providers.py).
+def iter_shard_results(func, shard_args, workers=1):
+    if workers <= 1:
+        for args in shard_args:
+            yield func(args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_reference_date,
+                             initargs=(reference_date(),)) as executor:
+        pending = deque()
+        for args in shard_args:
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, args))
+        while pending:
+            yield pending.popleft().result()
+
+
+# Function to add the shared --seed/--shards/--workers options to a generator's CLI
+def add_shard_arguments(parser):
+    parser.add_argument("--seed", type=int, help="seed for reproducible output (default: random)")
+    parser.add_argument("--shards", type=int,
+                        help="number of shards to split the ID space into (default: --workers). "
+                             "Output is identical for a given seed and shard count.")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
@@ -0,0 +1,117 @@
+import random
+from string import Formatter
+
+# Shared template engine for generated note and activity text.
+#
+# Templates are ordinary str.format strings ("Met with {contact_name} about
+# {topic}."). A TemplateSet parses each one once into literal/slot pieces and
+# binds every slot to its filler up front, so generating a record only picks a
+# template and renders that one: slots are filled from the caller's context or
+# drawn from the slot's vocabulary, and slots of templates that weren't picked
+# cost nothing.
+#
+# render_spans() renders exactly the same text from the same rng draws and also
+# returns where each slot value landed, as (slot, start, end) character spans;
+# note_corpus.py uses it to annotate generated notes with their ground truth.
+
+
+class CompiledTemplate:
+    """A format string pre-split into literal text and named slots."""
+
+    __slots__ = ("source", "pieces", "slots")
+
+    def __init__(self, source):
+        self.source = source
+        # (literal, slot name or None) pairs, in order
+        self.pieces = tuple((literal, field) for literal, field, _, _ in Formatter().parse(source))
+        self.slots = tuple(field for _, field in self.pieces if field is not None)
+
+    # Function to render with every slot value supplied by the caller
+    def format(self, values):
+        parts = []
+        for literal, field in self.pieces:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+
+class TemplateSet:
+    """A list of templates sharing one set of slot vocabularies.
+
+    Each vocabulary is either a list of strings (one is picked uniformly) or a
+    callable taking the rng and returning a string. Slots without a vocabulary
+    must be passed as context when rendering.
+    """
+
+    def __init__(self, templates=(), vocabularies=None):
+        self.vocabularies = {}
+        self.templates = []
+        self._fillers = []
+        for name, vocabulary in (vocabularies or {}).items():
+            self.add_vocabulary(name, vocabulary)
+        for template in templates:
+            self.add(template)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def __getitem__(self, index):
+        return self.templates[index]
+
+    # Function to register the vocabulary for a slot name
+    def add_vocabulary(self, name, vocabulary):
+        if callable(vocabulary):
+            self.vocabularies[name] = vocabulary
+        else:
+            values = tuple(vocabulary)
+            self.vocabularies[name] = lambda rng: rng.choice(values)
+
+    # Function to compile and register a template; its slots are bound to fillers here, once
+    def add(self, source):
+        template = CompiledTemplate(source)
+        fillers = tuple((literal, field, self.vocabularies.get(field)) for literal, field in template.pieces)
+        self.templates.append(template)
+        self._fillers.append(fillers)
+        return template
+
+    # Function to pick a template index
+    def choose(self, rng=random):
+        return rng.randrange(len(self.templates))
+
+    # Function to render one template, drawing vocabulary slots and filling the rest from context
+    def render_index(self, index, rng=random, **context):
+        parts = []
+        for literal, field, filler in self._fillers[index]:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(context[field]) if field in context or filler is None else filler(rng))
+        return "".join(parts)
+
+    # Function to pick a random template and render only that one
+    def render(self, rng=random, **context):
+        return self.render_index(self.choose(rng), rng, **context)
+
+    # Function to render one template like render_index, also returning each slot's (slot, start, end) span
+    def render_index_spans(self, index, rng=random, **context):
+        parts = []
+        spans = []
+        length = 0
+        for literal, field, filler in self._fillers[index]:
+            parts.append(literal)
+            length += len(literal)
+            if field is not None:
+                value = str(context[field]) if field in context or filler is None else filler(rng)
+                parts.append(value)
+                spans.append((field, length, length + len(value)))
+                length += len(value)
+        return "".join(parts), spans
+
+    # Function to pick a random template and render it with slot spans
+    def render_spans(self, rng=random, **context):
+        return self.render_index_spans(self.choose(rng), rng, **context)
+
+
+# Function to compile a {key: [templates]} mapping into {key: TemplateSet}
+def compile_template_groups(groups, vocabularies=None):
+    return {key: TemplateSet(templates, vocabularies) for key, templates in groups.items()}
@@ -0,0 +1,180 @@
+import argparse
+import json
+from collections.abc import Sequence
+
+from account_data_generator import generate_account
+from company_names import CompanyNamer
+from generator_io import OUTPUT_FORMATS, default_output_path, open_writer
+from generator_providers import add_reference_date_arguments, reference_date, set_reference_date
+from generator_random import make_rng
+from prospect_activity_generator import (activities_per_prospect, generate_activity, generate_prospect,
+                                         prospects_per_account, write_prospect_groups)
+
+# Random-access, counter-based dataset.
+#
+# Instead of one RNG stream consumed in order, every account draws from an RNG
+# seeded only by (seed, account index), and its prospects/activities from one
+# seeded by (seed, account index) as well. Any account and its prospects and
+# activities can therefore be regenerated on demand without generating the
+# records before it, and without any files.
+#
+# PROS/ACT IDs come from fixed strides instead of running counters: account i
+# (0-based) owns prospect numbers i*3+1 .. i*3+3 and prospect number p owns
+# activity numbers (p-1)*7+1 .. (p-1)*7+7. An account uses a prefix of its
+# range, so IDs are unique and increase in dataset order but are not contiguous.
+#
+# These per-record RNGs draw differently from the sequential generators, so a
+# lazy dataset is its own dataset, not a view of account_data_generator.py
+# output. --dump writes it out in full (accounts, prospects and activities
+# files, as the generators would), and every record in those files is what
+# LazyDataset.get() returns for the same seed, count and reference date.
+#
+#   python lazy_dataset.py ACC483921 --seed 42 --count 1000000
+#   python lazy_dataset.py --dump --seed 42 --count 10000 --format ndjson --reference-date 2026-01-01
+
+PROSPECT_STRIDE = prospects_per_account[1]
+ACTIVITY_STRIDE = activities_per_prospect[1]
+
+
+# Function to parse the numeric part of an ACC/PROS/ACT ID
+def id_number(record_id, prefix):
+    if not record_id.startswith(prefix) or not record_id[len(prefix):].isdigit():
+        raise KeyError(record_id)
+    return int(record_id[len(prefix):])
+
+
+class LazyDataset(Sequence):
+    """A seeded dataset of `count` accounts, materialized one record at a time.
+
+    dataset[i] is the account at 0-based index i (ID ACC{i+1:04d}); slicing
+    returns another LazyDataset over the selected indices in O(1). With
+    unique_names, company names come from a CompanyNamer sized to the dataset.
+    """
+
+    def __init__(self, count, seed, indices=None, unique_names=False):
+        self.count = count
+        self.seed = seed
+        self.unique_names = unique_names
+        self._namer = CompanyNamer(seed, count) if unique_names else None
+        self._indices = range(count) if indices is None else indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return LazyDataset(self.count, self.seed, self._indices[item], self.unique_names)
+        return self.account(self._indices[item])
+
+    def __repr__(self):
+        return f"LazyDataset(count={self.count}, seed={self.seed}, indices={self._indices!r})"
+
+    def _check_index(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(f"account index {index} out of range for {self.count} accounts")
+
+    # Function to materialize the account at a 0-based index
+    def account(self, index):
+        self._check_index(index)
+        company_name = self._namer.name(index) if self._namer else None
+        return generate_account(f"ACC{index + 1:04d}", make_rng(self.seed, f"account/{index}"), company_name)
+
+    # Function to materialize an account's (prospect, activities) groups
+    def prospect_groups(self, index, account=None):
+        account = account or self.account(index)
+        rng = make_rng(self.seed, f"prospects/{index}")
+        groups = []
+        for slot in range(rng.randint(*prospects_per_account)):
+            prospect_number = index * PROSPECT_STRIDE + slot + 1
+            prospect = generate_prospect(account, f"PROS{prospect_number:04d}", rng)
+            first_activity = (prospect_number - 1) * ACTIVITY_STRIDE + 1
+            activities = [generate_activity(prospect, f"ACT{first_activity + j:04d}", j, rng)
+                          for j in range(rng.randint(*activities_per_prospect))]
+            groups.append((prospect, activities))
+        return groups
+
+    # Function to materialize an account with all its prospects and activities, by ID
+    def get(self, account_id):
+        index = id_number(account_id, "ACC") - 1
+        account = self.account(index)
+        groups = self.prospect_groups(index, account)
+        return {
+            "account": account,
+            "prospects": [prospect for prospect, _ in groups],
+            "activities": [activity for _, activities in groups for activity in activities],
+        }
+
+    # Function to materialize a single prospect by ID (KeyError if the account didn't use that slot)
+    def get_prospect(self, prospect_id):
+        prospect_number = id_number(prospect_id, "PROS")
+        index = (prospect_number - 1) // PROSPECT_STRIDE
+        self._check_index(index)
+        for prospect, _ in self.prospect_groups(index):
+            if prospect["prospect_id"] == prospect_id:
+                return prospect
+        raise KeyError(prospect_id)
+
+    # Function to materialize a single activity by ID (KeyError if its slot wasn't used)
+    def get_activity(self, activity_id):
+        prospect_number = (id_number(activity_id, "ACT") - 1) // ACTIVITY_STRIDE + 1
+        index = (prospect_number - 1) // PROSPECT_STRIDE
+        self._check_index(index)
+        for _, activities in self.prospect_groups(index):
+            for activity in activities:
+                if activity["activity_id"] == activity_id:
+                    return activity
+        raise KeyError(activity_id)
+
+    # Function to iterate (account, prospect groups) pairs for this dataset's indices
+    def iter_groups(self):
+        for index in self._indices:
+            account = self.account(index)
+            yield account, self.prospect_groups(index, account)
+
+
+# Function to write a dataset's accounts, prospects and activities to three sinks, in ID order
+def write_dataset(dataset, accounts_writer, prospects_writer, activities_writer):
+    for account, groups in dataset.iter_groups():
+        accounts_writer.write(account)
+        write_prospect_groups(groups, prospects_writer, activities_writer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate one account (or prospect/activity) from a lazy dataset.")
+    parser.add_argument("record_id", nargs="?", help="ACC..., PROS... or ACT... ID to materialize")
+    parser.add_argument("--dump", action="store_true",
+                        help="write the whole dataset to accounts/prospects/activities files instead")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="ndjson",
+                        help="file format for --dump")
+    parser.add_argument("--seed", type=int, required=True, help="dataset seed")
+    parser.add_argument("--count", type=int, default=1000000, help="number of accounts in the dataset")
+    parser.add_argument("--unique-names", action="store_true", help="dataset was built with unique company names")
+    add_reference_date_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.dump and not args.record_id:
+        parser.error("give a record ID or --dump")
+
+    set_reference_date(args.reference_date)
+    dataset = LazyDataset(args.count, args.seed, unique_names=args.unique_names)
+    if args.dump:
+        outputs = [default_output_path(name, args.output_format) for name in ("accounts", "prospects", "activities")]
+        with open_writer(outputs[0], args.output_format) as accounts_writer, \
+                open_writer(outputs[1], args.output_format) as prospects_writer, \
+                open_writer(outputs[2], args.output_format) as activities_writer:
+            write_dataset(dataset, accounts_writer, prospects_writer, activities_writer)
+        print(f"Wrote {accounts_writer.count} accounts, {prospects_writer.count} prospects and "
+              f"{activities_writer.count} activities to {', '.join(outputs)} "
+              f"(seed {args.seed}, dates relative to {reference_date()})")
+        return
+    if args.record_id.startswith("ACC"):
+        record = dataset.get(args.record_id)
+    elif args.record_id.startswith("PROS"):
+        record = dataset.get_prospect(args.record_id)
+    else:
+        record = dataset.get_activity(args.record_id)
+    print(json.dumps(record, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+
+from account_data_generator import generate_accounts
+from generator_io import OUTPUT_FORMATS, default_output_path, write_records
+from generator_random import make_rng, random_seed
+from workload_profiles import DEFAULT_PROFILE, PROFILES, load_profile
+
+# Ground-truth-annotated account note corpus for entity extraction.
+#
+# The account generator knows exactly which value it put into every template
+# slot of a note. In corpus mode (generate_account(..., annotate=True)) each
+# note carries those slots as character spans, and this module flattens the
+# notes into one corpus record each:
+#
+#   {"note_id": "...", "account_id": "ACC0001", "date": "...", "author": "...",
+#    "content": "Met with Jane Smith to discuss pricing. ...",
+#    "entities": [{"slot": "contact_name", "type": "people", "start": 9, "end": 19, "text": "Jane Smith"},
+#                 {"slot": "topic", "type": null, "start": 32, "end": 39, "text": "pricing"}, ...]}
+#
+# Every filled slot is annotated; `type` names the NoteProcessorAgent
+# _extractEntities category the slot belongs to (people, dates, products, ...)
+# or is null for slots no extractor category covers. The notes are the ones
+# account_data_generator.py writes for the same --seed with one shard (the
+# annotation doesn't change any random draw), so a corpus can be regenerated
+# instead of stored. bench_note_extraction.py scores extractors against it.
+#
+#   python note_corpus.py --count 100000 --seed 7 --output notes_corpus.ndjson
+
+# Extraction categories, named as in NoteProcessorAgent's extractedInfo.entities
+ENTITY_TYPES = ("people", "dates", "monetaryValues", "products", "companies")
+
+# Note template slots that hold an entity of one of those categories
+SLOT_ENTITY_TYPES = {
+    "contact_name": "people",
+    "date": "dates",
+    "product": "products",
+}
+
+
+# Function to turn one annotated account note into a corpus record
+def corpus_record(account, note):
+    content = note["content"]
+    return {
+        "note_id": note["note_id"],
+        "account_id": account["account_id"],
+        "date": note["date"],
+        "author": note["author"],
+        "content": content,
+        "entities": [{"slot": slot, "type": SLOT_ENTITY_TYPES.get(slot), "start": start, "end": end,
+                      "text": content[start:end]}
+                     for slot, start, end in note["entities"]],
+    }
+
+
+# Function to flatten annotated accounts into corpus records, in account and note order
+def iter_note_corpus(accounts):
+    for account in accounts:
+        for note in account["notes"]:
+            yield corpus_record(account, note)
+
+
+# Function to lazily generate the annotated notes of accounts ACC0001..ACC{count}
+def generate_note_corpus(count, seed, profile=DEFAULT_PROFILE):
+    return iter_note_corpus(generate_accounts(count, 1, make_rng(seed, 0), profile=profile, annotate=True))
+
+
+# Function to get a corpus record's typed entities as a set of (type, start, end)
+def gold_entities(record):
+    return {(entity["type"], entity["start"], entity["end"])
+            for entity in record["entities"] if entity["type"] is not None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate account notes annotated with their filled template slots.")
+    parser.add_argument("--count", type=int, default=1000, help="number of accounts whose notes to generate")
+    parser.add_argument("--seed", type=int, help="random seed (default: random)")
+    parser.add_argument("--profile", default="uniform",
+                        help=f"workload distribution profile: {', '.join(PROFILES)} or a JSON file")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="ndjson")
+    parser.add_argument("--output", help="output file (default: notes_corpus.ndjson or notes_corpus.json)")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random_seed()
+    output = args.output or default_output_path("notes_corpus", args.output_format)
+    count = write_records(generate_note_corpus(args.count, seed, load_profile(args.profile)), output,
+                          args.output_format)
+    print(f"Wrote {count} annotated notes from {args.count} accounts to {output} (seed {seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+import argparse
+import json
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+from account_data_generator import industries
+from activity_columns import ActivityColumnReader
+from generator_io import iter_records
+from prospect_activity_generator import (activity_outcomes, activity_statuses, activity_types, prospect_sources,
+                                         prospect_statuses, sales_reps)
+from sap_odata_server import SALES_CYCLE_DAYS
+
+# Pipeline and forecast rollups over generated prospects and activities.
+#
+# Answers the questions behind SAPSalesCloudMCPServer's get_opportunity_pipeline
+# and get_sales_forecast tools from local data:
+#
+#   - weighted pipeline (estimated_value * probability / 100) grouped by any of
+#     status, assigned_to, source and the account's industry, per close month
+#     (created_date + SALES_CYCLE_DAYS, as in sap_odata_server)
+#   - sales forecast per close month: committed (Closed Won), weighted open
+#     pipeline and best case
+#   - activity counts by type, status and outcome over date windows
+#
+# Records are ingested in batches into NumPy columns, and each batch is folded
+# into dense rollup cubes (one axis per categorical plus a time axis) with a
+# single bincount per measure. A query takes the filtered slices of a cube and
+# sums away the other axes, so its cost depends on the cube size (tens of
+# thousands of cells), not on the number of prospects. New prospects and
+# activities can be added at any time; the cubes grow as new categorical
+# values or months appear.
+#
+#   python pipeline_rollups.py --accounts accounts.ndjson --prospects prospects.ndjson \
+#       --activities activities.actcol pipeline --group-by status industry
+#   python pipeline_rollups.py ... forecast --start 2026-10 --end 2027-03 --filter assigned_to="Casey Davis"
+#   python pipeline_rollups.py ... activities --group-by type outcome --start 2026-09-01 --window 7
+
+BATCH_ROWS = 65536
+CLOSED_WON = "Closed Won"
+CLOSED_STATUSES = {"Closed Won", "Closed Lost"}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class _Dimension:
+    """Dictionary encoding for one categorical column; code 0 is always None."""
+
+    def __init__(self, name, values=()):
+        self.name = name
+        self.values = [None]
+        self.codes = {None: 0}
+        for value in values:
+            self.code(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    # Function to get the code for a value, assigning a new one if it is unseen
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _Cube:
+    """Dense measure sums over categorical axes plus a trailing time axis.
+
+    data has shape (*dimension sizes, time steps, measures). The time axis
+    starts at `origin` and is extended in either direction as batches arrive.
+    """
+
+    def __init__(self, dimensions, time_name, measures):
+        self.dimensions = dimensions
+        self.time_name = time_name
+        self.measures = measures
+        self.origin = 0
+        self.data = np.zeros([len(dimension) for dimension in dimensions] + [0, len(measures)])
+
+    @property
+    def axis_names(self):
+        return [dimension.name for dimension in self.dimensions] + [self.time_name]
+
+    def _fit(self, low, high):
+        steps = self.data.shape[-2]
+        if steps == 0:
+            self.origin = low
+        before = max(self.origin - low, 0)
+        after = max(high - (self.origin - before) + 1 - (steps + before), 0)
+        pad = [(0, len(dimension) - size) for dimension, size in zip(self.dimensions, self.data.shape)]
+        if before or after or any(grow for _, grow in pad):
+            self.data = np.pad(self.data, pad + [(before, after), (0, 0)])
+            self.origin -= before
+
+    # Function to add a batch: one code array per dimension, a time array and one weight array per measure
+    # (None for a plain row count)
+    def add(self, codes, times, weights):
+        if not len(times):
+            return
+        self._fit(int(times.min()), int(times.max()))
+        shape = self.data.shape[:-1]
+        cells = np.ravel_multi_index((*codes, times - self.origin), shape)
+        size = int(np.prod(shape))
+        flat = self.data.reshape(size, len(self.measures))
+        for measure, weight in enumerate(weights):
+            if len(cells) < size:
+                # Small batches: scatter-add into the touched cells only
+                np.add.at(flat[:, measure], cells, 1 if weight is None else weight)
+            else:
+                flat[:, measure] += np.bincount(cells, weights=weight, minlength=size)
+
+    # Function to sum the cube down to group_by axes (dimension names or the time name).
+    # filters maps dimension names to a value or list of values; time_range is an inclusive
+    # (low, high) in time units with either end None; buckets of `bucket` time steps are summed
+    # together. Returns rows of ({axis: label}, measure values) for non-empty cells.
+    def select(self, group_by=(), filters=None, time_range=(None, None), bucket=1):
+        names = self.axis_names
+        for name in list(group_by) + list(filters or ()):
+            if name not in names:
+                raise KeyError(f"unknown dimension {name!r} (expected one of {', '.join(names)})")
+
+        data = self.data
+        labels = [list(dimension.values) for dimension in self.dimensions]
+        for axis, dimension in enumerate(self.dimensions):
+            if filters and dimension.name in filters:
+                wanted = filters[dimension.name]
+                wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+                codes = [dimension.codes[value] for value in wanted if value in dimension.codes]
+                data = data.take(codes, axis=axis)
+                labels[axis] = [dimension.values[code] for code in codes]
+
+        time_axis = len(self.dimensions)
+        low, high = time_range
+        start = 0 if low is None else min(max(low - self.origin, 0), data.shape[time_axis])
+        stop = data.shape[time_axis] if high is None else min(max(high - self.origin + 1, start), data.shape[time_axis])
+        data = data[(slice(None),) * time_axis + (slice(start, stop),)]
+        times = list(range(self.origin + start, self.origin + stop, bucket))
+        if bucket > 1 and data.shape[time_axis]:
+            data = np.add.reduceat(data, list(range(0, data.shape[time_axis], bucket)), axis=time_axis)
+        labels.append(times)
+
+        keep = [names.index(name) for name in group_by]
+        data = data.sum(axis=tuple(axis for axis in range(len(names)) if axis not in keep))
+        if not keep:
+            # No groups: one row with the grand totals
+            return [({}, data.tolist())]
+        # Summing preserves axis order, so put the kept axes in group_by order
+        order = sorted(range(len(keep)), key=lambda i: keep[i])
+        data = np.moveaxis(data, list(range(len(keep))), order)
+
+        rows = []
+        for cell in zip(*np.nonzero(data[..., 0])):
+            key = {name: labels[names.index(name)][i] for name, i in zip(group_by, cell)}
+            rows.append((key, data[cell].tolist()))
+        return rows
+
+
+class _Columns:
+    """Growable NumPy columns appended in batches."""
+
+    def __init__(self, dtypes):
+        self.count = 0
+        self.arrays = {name: np.zeros(0, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def append(self, **values):
+        rows = len(next(iter(values.values())))
+        needed = self.count + rows
+        for name, array in self.arrays.items():
+            if needed > len(array):
+                grown = np.zeros(max(needed, 2 * len(array)), dtype=array.dtype)
+                grown[:self.count] = array[:self.count]
+                self.arrays[name] = array = grown
+            array[self.count:needed] = values[name]
+        self.count = needed
+
+    def __getitem__(self, name):
+        return self.arrays[name][:self.count]
+
+    @property
+    def nbytes(self):
+        return sum(array[:self.count].nbytes for array in self.arrays.values())
+
+
+# Function to split an iterable into lists of up to `size` items
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Function to turn a close month index (months since 1970-01) into "YYYY-MM"
+def month_label(month):
+    return str(np.datetime64(month, "M"))
+
+
+# Function to parse "YYYY-MM" or "YYYY-MM-DD" (or a date) into a month index
+def month_index(value):
+    if isinstance(value, date):
+        value = value.isoformat()
+    return int(np.datetime64(value[:7], "M").astype(int))
+
+
+def _day_number(value):
+    return value.toordinal() if isinstance(value, date) else date.fromisoformat(value).toordinal()
+
+
+class PipelineRollups:
+    """Incrementally maintained pipeline, forecast and activity rollups.
+
+    Add accounts before their prospects, so prospects pick up the account's
+    industry; prospects of unknown accounts are grouped under industry None.
+    """
+
+    def __init__(self):
+        self.industry = _Dimension("industry", industries)
+        self.status = _Dimension("status", prospect_statuses)
+        self.assigned_to = _Dimension("assigned_to", sales_reps)
+        self.source = _Dimension("source", prospect_sources)
+        self.activity_type = _Dimension("type", activity_types)
+        self.activity_status = _Dimension("status", activity_statuses)
+        self.outcome = _Dimension("outcome", activity_outcomes)
+
+        self.pipeline_cube = _Cube([self.status, self.assigned_to, self.source, self.industry], "close_month",
+                                   ["count", "value", "weighted"])
+        self.activity_cube = _Cube([self.activity_type, self.activity_status, self.outcome], "date", ["count"])
+        self.account_industry = np.zeros(0, dtype=np.uint16)
+        self.prospects = _Columns({
+            "prospect": np.uint32, "account": np.uint32, "status": np.uint16, "assigned_to": np.uint16,
+            "source": np.uint16, "industry": np.uint16, "close_month": np.int32, "value": np.float64,
+            "probability": np.uint8,
+        })
+        self.activity_count = 0
+        self._day_numbers = {}
+
+    def _day(self, value):
+        day = self._day_numbers.get(value)
+        if day is None:
+            day = self._day_numbers[value] = date.fromisoformat(value).toordinal()
+        return day
+
+    def add_accounts(self, accounts):
+        for batch in _batches(accounts, BATCH_ROWS):
+            numbers = np.array([int(account["account_id"][3:]) for account in batch], dtype=np.int64)
+            codes = np.array([self.industry.code(account["industry"]) for account in batch], dtype=np.uint16)
+            if numbers.max() >= len(self.account_industry):
+                grown = np.zeros(max(int(numbers.max()) + 1, 2 * len(self.account_industry)), dtype=np.uint16)
+                grown[:len(self.account_industry)] = self.account_industry
+                self.account_industry = grown
+            self.account_industry[numbers] = codes
+
+    def add_prospects(self, prospects):
+        for batch in _batches(prospects, BATCH_ROWS):
+            self.add_prospect_codes(
+                prospect=[int(prospect["prospect_id"][4:]) for prospect in batch],
+                account=[int(prospect["account_id"][3:]) for prospect in batch],
+                status=[self.status.code(prospect["status"]) for prospect in batch],
+                assigned_to=[self.assigned_to.code(prospect["assigned_to"]) for prospect in batch],
+                source=[self.source.code(prospect["source"]) for prospect in batch],
+                created_day=[self._day(prospect["created_date"]) for prospect in batch],
+                value=[prospect["estimated_value"] for prospect in batch],
+                probability=[prospect["probability"] for prospect in batch],
+            )
+
+    # Function to add prospects already split into columns. Categoricals are codes from this
+    # object's dimensions (e.g. rollups.status.code("Proposal")), IDs are numeric parts and
+    # created_day is a date ordinal.
+    def add_prospect_codes(self, prospect, account, status, assigned_to, source, created_day, value, probability):
+        account = np.asarray(account, dtype=np.int64)
+        known = account < len(self.account_industry)
+        industry = np.zeros(len(account), dtype=np.uint16)
+        industry[known] = self.account_industry[account[known]]
+        close_day = np.asarray(created_day, dtype=np.int64) + SALES_CYCLE_DAYS - _EPOCH_ORDINAL
+        close_month = close_day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        status = np.asarray(status, dtype=np.int64)
+        assigned_to = np.asarray(assigned_to, dtype=np.int64)
+        source = np.asarray(source, dtype=np.int64)
+        value = np.asarray(value, dtype=np.float64)
+        probability = np.asarray(probability, dtype=np.uint8)
+
+        self.prospects.append(prospect=prospect, account=account, status=status, assigned_to=assigned_to,
+                              source=source, industry=industry, close_month=close_month, value=value,
+                              probability=probability)
+        self.pipeline_cube.add([status, assigned_to, source, industry], close_month,
+                               [None, value, value * probability / 100])
+
+    def add_activities(self, activities):
+        for batch in _batches(activities, BATCH_ROWS):
+            self.add_activity_codes(
+                activity_type=[self.activity_type.code(activity["type"]) for activity in batch],
+                status=[self.activity_status.code(activity["status"]) for activity in batch],
+                outcome=[self.outcome.code(activity["outcome"]) for activity in batch],
+                day=[self._day(activity["date"]) for activity in batch],
+            )
+
+    # Function to add activities from a .actcol file without materializing rows
+    def add_activity_columns(self, reader):
+        # Translate the file's dictionary codes into this object's codes with lookup tables
+        lookups = {}
+        for name, dimension in (("type", self.activity_type), ("status", self.activity_status),
+                                ("outcome", self.outcome)):
+            lookups[name] = np.array([dimension.code(value) for value in reader.dictionaries[name]], dtype=np.int64)
+        for start in range(0, reader.row_count, BATCH_ROWS):
+            rows = slice(start, start + BATCH_ROWS)
+            self.add_activity_codes(
+                activity_type=lookups["type"][reader.column("type")[rows]],
+                status=lookups["status"][reader.column("status")[rows]],
+                outcome=lookups["outcome"][reader.column("outcome")[rows]],
+                day=reader.column("date")[rows],
+            )
+
+    # Function to add activities already split into columns (codes from this object's dimensions)
+    def add_activity_codes(self, activity_type, status, outcome, day):
+        day = np.asarray(day, dtype=np.int64)
+        self.activity_cube.add([np.asarray(activity_type, dtype=np.int64), np.asarray(status, dtype=np.int64),
+                                np.asarray(outcome, dtype=np.int64)], day, [None])
+        self.activity_count += len(day)
+
+    # Function to get pipeline totals (count, value, weighted) grouped by any of status, assigned_to,
+    # source, industry and close_month. start/end bound the close month ("YYYY-MM"); open_only drops
+    # Closed Won/Lost; other keyword arguments filter dimensions, e.g. industry="Finance".
+    def pipeline(self, group_by=("status",), start=None, end=None, open_only=False, **filters):
+        if open_only:
+            wanted = filters.get("status", self.status.values[1:])
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            filters["status"] = [status for status in wanted if status not in CLOSED_STATUSES]
+        time_range = (None if start is None else month_index(start), None if end is None else month_index(end))
+        results = []
+        for key, (count, value, weighted) in self.pipeline_cube.select(group_by, filters, time_range):
+            if "close_month" in key:
+                key["close_month"] = month_label(key["close_month"])
+            results.append({**key, "count": int(count), "value": round(value, 2), "weighted": round(weighted, 2)})
+        return results
+
+    # Function to get the forecast per close month: committed (Closed Won value), weighted open
+    # pipeline, best case (committed plus all open value) and the number of open prospects
+    def forecast(self, start=None, end=None, group_by=(), **filters):
+        time_range = (None if start is None else month_index(start), None if end is None else month_index(end))
+        periods = {}
+        for key, (count, value, weighted) in self.pipeline_cube.select(
+                ("close_month",) + tuple(group_by) + ("status",), filters, time_range):
+            status = key.pop("status")
+            key["close_month"] = month_label(key["close_month"])
+            period = periods.setdefault(tuple(key.values()), {**key, "committed": 0.0, "weighted": 0.0,
+                                                              "best_case": 0.0, "open_count": 0})
+            if status == CLOSED_WON:
+                period["committed"] += value
+                period["best_case"] += value
+            elif status not in CLOSED_STATUSES:
+                period["weighted"] += weighted
+                period["best_case"] += value
+                period["open_count"] += int(count)
+        results = []
+        for period in periods.values():
+            for measure in ("committed", "weighted", "best_case"):
+                period[measure] = round(period[measure], 2)
+            results.append(period)
+        return results
+
+    # Function to count activities grouped by any of type, status and outcome; start/end bound the
+    # date (inclusive) and window_days adds a "date" group with one row per window (labelled by its
+    # first day). Other keyword arguments filter dimensions, e.g. type="Demo".
+    def activity_counts(self, group_by=("type", "outcome"), start=None, end=None, window_days=None, **filters):
+        time_range = (None if start is None else _day_number(start), None if end is None else _day_number(end))
+        group_by = tuple(group_by)
+        if window_days and "date" not in group_by:
+            group_by += ("date",)
+        results = []
+        for key, (count,) in self.activity_cube.select(group_by, filters, time_range, window_days or 1):
+            if "date" in key:
+                key["date"] = date.fromordinal(key["date"]).isoformat()
+            results.append({**key, "count": int(count)})
+        return results
+
+    # Function to get the n prospects with the largest weighted value, optionally filtered
+    # (open_only drops Closed Won/Lost)
+    def top_prospects(self, n=10, open_only=True, **filters):
+        columns = self.prospects
+        mask = np.ones(columns.count, dtype=bool)
+        dimensions = {"status": self.status, "assigned_to": self.assigned_to, "source": self.source,
+                      "industry": self.industry}
+        for name, wanted in filters.items():
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            mask &= np.isin(columns[name], [dimensions[name].codes.get(value, -1) for value in wanted])
+        if open_only:
+            mask &= ~np.isin(columns["status"], [self.status.code(status) for status in CLOSED_STATUSES])
+        rows = np.flatnonzero(mask)
+        weighted = columns["value"][rows] * columns["probability"][rows] / 100
+        if len(rows) > n:
+            best = np.argpartition(-weighted, n)[:n]
+            rows, weighted = rows[best], weighted[best]
+        order = np.argsort(-weighted, kind="stable")
+        return [{
+            "prospect_id": f"PROS{int(columns['prospect'][row]):04d}",
+            "account_id": f"ACC{int(columns['account'][row]):04d}",
+            "status": self.status.values[columns["status"][row]],
+            "assigned_to": self.assigned_to.values[columns["assigned_to"][row]],
+            "industry": self.industry.values[columns["industry"][row]],
+            "close_month": month_label(int(columns["close_month"][row])),
+            "estimated_value": float(columns["value"][row]),
+            "probability": int(columns["probability"][row]),
+            "weighted": round(float(weighted[i]), 2),
+        } for i, row in ((i, rows[i]) for i in order)]
+
+
+# Function to parse --filter name=value options into keyword filters (repeated names mean "any of")
+def _parse_filters(options):
+    filters = {}
+    for option in options or ():
+        name, _, value = option.partition("=")
+        filters.setdefault(name, []).append(value)
+    return filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline, forecast and activity rollups over generated data.")
+    parser.add_argument("--accounts", default="accounts.json", help="accounts file (for industry)")
+    parser.add_argument("--prospects", default="prospects.json", help="prospects file")
+    parser.add_argument("--activities", default="activities.json", help="activities file or .actcol")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pipeline = commands.add_parser("pipeline", help="weighted pipeline by group")
+    pipeline.add_argument("--group-by", nargs="*", default=["status"],
+                          help="any of status, assigned_to, source, industry, close_month")
+    pipeline.add_argument("--open-only", action="store_true", help="leave out Closed Won/Lost")
+    forecast = commands.add_parser("forecast", help="committed/weighted/best-case per close month")
+    forecast.add_argument("--group-by", nargs="*", default=[], help="extra groups, e.g. assigned_to")
+    activities = commands.add_parser("activities", help="activity counts by type/status/outcome")
+    activities.add_argument("--group-by", nargs="*", default=["type", "outcome"], help="any of type, status, outcome")
+    activities.add_argument("--window", type=int, help="also group into windows of this many days")
+    top = commands.add_parser("top", help="prospects with the largest weighted value")
+    top.add_argument("--count", type=int, default=10)
+    for command in (pipeline, forecast, activities, top):
+        command.add_argument("--filter", action="append", metavar="NAME=VALUE", help="e.g. industry=Finance")
+    for command in (pipeline, forecast, activities):
+        command.add_argument("--start", help="first close month (YYYY-MM) or activity date (YYYY-MM-DD)")
+        command.add_argument("--end", help="last close month or activity date")
+    args = parser.parse_args()
+
+    rollups = PipelineRollups()
+    started = time.perf_counter()
+    rollups.add_accounts(iter_records(args.accounts))
+    if args.command == "activities":
+        if args.activities.endswith(".actcol"):
+            with ActivityColumnReader(args.activities) as reader:
+                rollups.add_activity_columns(reader)
+        else:
+            rollups.add_activities(iter_records(args.activities))
+    else:
+        rollups.add_prospects(iter_records(args.prospects))
+    loaded = time.perf_counter() - started
+
+    filters = _parse_filters(args.filter)
+    started = time.perf_counter()
+    if args.command == "pipeline":
+        results = rollups.pipeline(args.group_by, args.start, args.end, args.open_only, **filters)
+    elif args.command == "forecast":
+        results = rollups.forecast(args.start, args.end, args.group_by, **filters)
+    elif args.command == "activities":
+        results = rollups.activity_counts(args.group_by, args.start, args.end, args.window, **filters)
+    else:
+        results = rollups.top_prospects(args.count, **filters)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        print(json.dumps(result))
+    print(f"{rollups.prospects.count:,} prospects, {rollups.activity_count:,} activities loaded in {loaded:.2f}s; "
+          f"query {elapsed * 1e3:.2f} ms, {len(results)} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
-import json
+import argparse
 import random
-from datetime import datetime, timedelta
-import uuid
+from itertools import count, islice
 
-# Load the accounts data
-with open('accounts.json', 'r') as f:
-    accounts = json.load(f)
+from activity_feed import TimeOrderedWriter, add_time_ordered_arguments
+from generator_io import OUTPUT_FORMATS, default_output_path, iter_records, open_writer
+from generator_metrics import add_metrics_arguments, metrics_from_args
+from generator_providers import (add_reference_date_arguments, day_label, phone_number, reference_date,
+                                 set_reference_date)
+from generator_random import make_rng, random_seed
+from generator_shards import iter_shard_results
+from generator_templates import compile_template_groups
+from workload_profiles import DEFAULT_PROFILE, UNIFORM, SkewSummary, add_profile_arguments, load_profile
 
 # Lists for generating random data
 prospect_statuses = ["Lead", "Qualified Lead", "Opportunity", "Proposal", "Negotiation", "Closed Won", "Closed Lost", "On Hold"]
@@ -17,27 +22,184 @@ activity_statuses = ["Completed", "Scheduled", "Cancelled", "Postponed", "In Pro
 activity_priorities = ["Low", "Medium", "High", "Urgent"]
 activity_outcomes = ["Positive", "Neutral", "Negative", "Inconclusive", "Requires Follow-up"]
 
+# Contact details used when an account has no contacts to pick from
+fallback_first_names = ["John", "Jane", "Robert", "Mary", "Michael", "Linda", "William", "Patricia", "David", "Jennifer"]
+fallback_last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
+fallback_titles = ["CEO", "CTO", "CFO", "COO", "President", "Vice President", "Director", "Manager", "Supervisor", "Team Lead"]
+
+# Estimated value and probability ranges (inclusive) for each prospect status
+estimated_value_ranges = {
+    "Lead": (1000, 50000),
+    "Qualified Lead": (5000, 100000),
+    "Opportunity": (5000, 100000),
+    "Proposal": (10000, 500000),
+    "Negotiation": (10000, 500000),
+    "Closed Won": (10000, 500000),
+    "Closed Lost": (1000, 50000),
+    "On Hold": (1000, 50000),
+}
+
+probability_ranges = {
+    "Lead": (1, 10),
+    "Qualified Lead": (10, 30),
+    "Opportunity": (30, 50),
+    "Proposal": (50, 70),
+    "Negotiation": (70, 95),
+    "Closed Won": (100, 100),
+    "Closed Lost": (0, 0),
+    "On Hold": (1, 10),
+}
+
+# Inclusive ranges for the number of prospects per account and activities per prospect
+prospects_per_account = (1, 3)
+activities_per_prospect = (3, 7)
+
+sales_reps = ["Alex Johnson", "Sam Williams", "Taylor Smith", "Jordan Brown", "Casey Davis"]
+prospect_next_steps = ["Follow-up call", "Send proposal", "Schedule demo", "Technical discussion", "Contract review", "Needs analysis", "Decision meeting"]
+
+# Activity description templates by type
+activity_description_templates = {
+    "Email": [
+        "Sent follow-up email to {first_name} regarding their interest in our products.",
+        "Email response from {first_name} with questions about pricing and features.",
+        "Sent product information email to {first_name} as requested.",
+        "Email introduction to {first_name} from marketing team.",
+        "Sent proposal via email to {first_name} for review."
+    ],
+    "Call": [
+        "Discovery call with {first_name} to understand their needs.",
+        "Follow-up call with {first_name} to discuss proposal.",
+        "Cold call to {first_name} to introduce our services.",
+        "Call with {first_name} to address concerns about implementation.",
+        "Scheduled call with {first_name} to discuss next steps."
+    ],
+    "Meeting": [
+        "Initial meeting with {first_name} and team to present our solutions.",
+        "Strategy meeting with {first_name} to discuss implementation plan.",
+        "Executive meeting with {first_name} and decision makers.",
+        "Project kickoff meeting with {first_name} and stakeholders.",
+        "Quarterly review meeting with {first_name} to discuss progress."
+    ],
+    "Demo": [
+        "Product demonstration for {first_name} and team.",
+        "Technical demo focusing on integration capabilities for {first_name}.",
+        "Custom demo addressing specific use cases for {first_name}.",
+        "Follow-up demo with {first_name} to show additional features.",
+        "Executive demo for {first_name} and C-level stakeholders."
+    ],
+    "Proposal": [
+        "Sent initial proposal to {first_name} for review.",
+        "Revised proposal based on feedback from {first_name}.",
+        "Proposal presentation meeting with {first_name} and team.",
+        "Final proposal adjustments as requested by {first_name}.",
+        "Proposal acceptance confirmation from {first_name}."
+    ],
+    "Contract": [
+        "Sent contract to {first_name} for signature.",
+        "Contract negotiation call with {first_name} and legal team.",
+        "Contract amendments as requested by {first_name}.",
+        "Contract signed by {first_name} and returned.",
+        "Contract renewal discussion with {first_name}."
+    ],
+    "Support": [
+        "Technical support call with {first_name} regarding implementation.",
+        "Resolved issue reported by {first_name} with our product.",
+        "Support ticket opened by {first_name} for feature request.",
+        "Follow-up on support case with {first_name}.",
+        "Proactive support check-in with {first_name}."
+    ],
+    "Training": [
+        "Initial training session with {first_name} and team.",
+        "Advanced features training for {first_name} and power users.",
+        "Administrator training for {first_name}'s IT team.",
+        "Custom workflow training as requested by {first_name}.",
+        "Refresher training session with {first_name}'s new team members."
+    ],
+    "Implementation": [
+        "Implementation planning meeting with {first_name} and IT team.",
+        "Data migration discussion with {first_name}.",
+        "Implementation progress review with {first_name}.",
+        "Implementation issue resolution for {first_name}.",
+        "Final implementation sign-off meeting with {first_name}."
+    ],
+    "Review": [
+        "Quarterly business review with {first_name} to discuss results.",
+        "Product feedback session with {first_name} and users.",
+        "Performance review meeting with {first_name}.",
+        "ROI analysis presentation for {first_name} and executives.",
+        "Annual contract review with {first_name}."
+    ]
+}
+
+# Activity note templates by outcome; {activity} is the lower-cased activity type
+activity_note_templates = {
+    "Positive": [
+        "{first_name} expressed strong interest in our solution. They particularly liked our {liked_aspect}.",
+        "Very productive {activity}. {first_name} is ready to move forward with next steps.",
+        "{first_name} agreed to our proposal and wants to proceed quickly.",
+        "Great response from {first_name}. They see clear value in our offering.",
+        "{first_name} confirmed budget approval and is eager to get started."
+    ],
+    "Neutral": [
+        "{first_name} needs more time to consider options. Will follow up next week.",
+        "{first_name} requested additional information about {info_topic}.",
+        "Standard {activity} with {first_name}. No major developments.",
+        "{first_name} is still evaluating competitors. Need to emphasize our differentiators.",
+        "{first_name} wants to involve more stakeholders before making a decision."
+    ],
+    "Negative": [
+        "{first_name} expressed concerns about our {concern}.",
+        "Difficult {activity} with {first_name}. They are leaning toward a competitor.",
+        "{first_name} has budget constraints that may delay the project.",
+        "{first_name} found our solution doesn't meet their requirements for {requirement}.",
+        "{first_name} is putting the project on hold due to internal reorganization."
+    ],
+    "Inconclusive": [
+        "Unable to cover all agenda items with {first_name}. Need to schedule follow-up.",
+        "{first_name} had limited time for our {activity}. Will need to reconnect.",
+        "Technical issues prevented full {activity} with {first_name}. Rescheduling.",
+        "{first_name} was unprepared for discussion. Need to resend materials and follow up.",
+        "Mixed signals from {first_name}. Need to clarify their priorities."
+    ],
+    "Requires Follow-up": [
+        "{first_name} requested follow-up with more detailed {follow_up_detail}.",
+        "Need to schedule technical team meeting with {first_name}'s IT department.",
+        "{first_name} wants to see a custom demo addressing their specific use case.",
+        "Action item: Send {first_name} the requested documentation by end of week.",
+        "{first_name} asked for references from similar companies in their industry."
+    ]
+}
+
+activity_note_vocabularies = {
+    "liked_aspect": ["pricing model", "feature set", "integration capabilities", "support options", "implementation timeline"],
+    "info_topic": ["pricing", "features", "technical specifications", "implementation process", "support options"],
+    "concern": ["pricing", "implementation timeline", "feature limitations", "support model", "contract terms"],
+    "requirement": ["scalability", "customization", "integration", "reporting", "security"],
+    "follow_up_detail": ["pricing", "technical specifications", "case studies", "implementation plan", "ROI analysis"],
+}
+
+activity_descriptions = compile_template_groups(activity_description_templates)
+activity_notes = compile_template_groups(activity_note_templates, activity_note_vocabularies)
+
 # Function to generate a random date within the past year
-def generate_date(days_ago_max=365):
-    days_ago = random.randint(0, days_ago_max)
-    return (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+def generate_date(days_ago_max=365, rng=random, recency=UNIFORM):
+    return day_label(-recency.sample(rng, 0, days_ago_max))
 
 # Function to generate a random future date within the next 30 days
-def generate_future_date(days_ahead_max=30):
-    days_ahead = random.randint(1, days_ahead_max)
-    return (datetime.now() + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+def generate_future_date(days_ahead_max=30, rng=random):
+    return day_label(rng.randint(1, days_ahead_max))
 
 # Function to generate a random time
-def generate_time():
-    hour = random.randint(8, 17)  # Business hours 8 AM to 5 PM
-    minute = random.choice([0, 15, 30, 45])
+def generate_time(rng=random):
+    hour = rng.randint(8, 17)  # Business hours 8 AM to 5 PM
+    minute = rng.choice([0, 15, 30, 45])
     return f"{hour:02d}:{minute:02d}"
 
 # Function to generate a random prospect
-def generate_prospect(account, prospect_id):
+def generate_prospect(account, prospect_id, rng=random, profile=DEFAULT_PROFILE):
     # Use one of the account's contacts as the primary prospect contact
     if account["contacts"]:
-        contact = random.choice(account["contacts"])
+        contact = rng.choice(account["contacts"])
         first_name = contact["first_name"]
         last_name = contact["last_name"]
         email = contact["email"]
@@ -45,38 +207,18 @@ def generate_prospect(account, prospect_id):
         title = contact["title"]
     else:
         # Generate random contact info if no contacts exist
-        first_name = random.choice(["John", "Jane", "Robert", "Mary", "Michael", "Linda", "William", "Patricia", "David", "Jennifer"])
-        last_name = random.choice(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"])
+        first_name = rng.choice(fallback_first_names)
+        last_name = rng.choice(fallback_last_names)
         email = f"{first_name.lower()}.{last_name.lower()}@{account['company_name'].lower().replace(' ', '').replace('-', '')}.com"
-        phone = f"+{random.randint(1, 9)}{random.randint(100, 999)}{random.randint(100, 999)}{random.randint(1000, 9999)}"
-        title = random.choice(["CEO", "CTO", "CFO", "COO", "President", "Vice President", "Director", "Manager", "Supervisor", "Team Lead"])
+        phone = phone_number(rng)
+        title = rng.choice(fallback_titles)
     
     # Generate prospect data
-    status = random.choice(prospect_statuses)
+    status = rng.choice(prospect_statuses)
     
-    # Set estimated value based on status
-    if status in ["Closed Won", "Negotiation", "Proposal"]:
-        estimated_value = random.randint(10000, 500000)
-    elif status in ["Opportunity", "Qualified Lead"]:
-        estimated_value = random.randint(5000, 100000)
-    else:
-        estimated_value = random.randint(1000, 50000)
-    
-    # Set probability based on status
-    if status == "Closed Won":
-        probability = 100
-    elif status == "Closed Lost":
-        probability = 0
-    elif status == "Negotiation":
-        probability = random.randint(70, 95)
-    elif status == "Proposal":
-        probability = random.randint(50, 70)
-    elif status == "Opportunity":
-        probability = random.randint(30, 50)
-    elif status == "Qualified Lead":
-        probability = random.randint(10, 30)
-    else:
-        probability = random.randint(1, 10)
+    # Set estimated value and probability based on status
+    estimated_value = rng.randint(*estimated_value_ranges[status])
+    probability = rng.randint(*probability_ranges[status])
     
     return {
         "prospect_id": prospect_id,
@@ -87,154 +229,44 @@ def generate_prospect(account, prospect_id):
         "phone": phone,
         "title": title,
         "status": status,
-        "source": random.choice(prospect_sources),
-        "created_date": generate_date(),
-        "last_contact_date": generate_date(days_ago_max=30),
+        "source": rng.choice(prospect_sources),
+        "created_date": generate_date(rng=rng),
+        "last_contact_date": generate_date(days_ago_max=30, rng=rng),
         "estimated_value": estimated_value,
         "probability": probability,
-        "interests": random.sample(prospect_interests, k=random.randint(1, 3)),
-        "assigned_to": random.choice(["Alex Johnson", "Sam Williams", "Taylor Smith", "Jordan Brown", "Casey Davis"]),
-        "next_step": random.choice(["Follow-up call", "Send proposal", "Schedule demo", "Technical discussion", "Contract review", "Needs analysis", "Decision meeting"])
+        "interests": rng.sample(prospect_interests, k=rng.randint(1, 3)),
+        "assigned_to": profile.choose("sales_rep", rng, sales_reps),
+        "next_step": rng.choice(prospect_next_steps)
     }
 
 # Function to generate a random activity
-def generate_activity(prospect, activity_id, index):
-    activity_type = random.choice(activity_types)
-    status = random.choice(activity_statuses)
+def generate_activity(prospect, activity_id, index, rng=random, profile=DEFAULT_PROFILE):
+    activity_type = rng.choice(activity_types)
+    status = rng.choice(activity_statuses)
     
     # Generate activity date based on index (older activities for higher indices)
+    recency = profile.shape("activity_recency")
     if index < 2:  # Most recent activities
-        activity_date = generate_date(days_ago_max=7)
+        activity_date = generate_date(days_ago_max=7, rng=rng, recency=recency)
     else:
-        activity_date = generate_date(days_ago_max=90)
+        activity_date = generate_date(days_ago_max=90, rng=rng, recency=recency)
     
     # For scheduled activities, use future dates
     if status == "Scheduled":
-        activity_date = generate_future_date()
+        activity_date = generate_future_date(rng=rng)
     
     # Generate activity description based on type
-    descriptions = {
-        "Email": [
-            f"Sent follow-up email to {prospect['first_name']} regarding their interest in our products.",
-            f"Email response from {prospect['first_name']} with questions about pricing and features.",
-            f"Sent product information email to {prospect['first_name']} as requested.",
-            f"Email introduction to {prospect['first_name']} from marketing team.",
-            f"Sent proposal via email to {prospect['first_name']} for review."
-        ],
-        "Call": [
-            f"Discovery call with {prospect['first_name']} to understand their needs.",
-            f"Follow-up call with {prospect['first_name']} to discuss proposal.",
-            f"Cold call to {prospect['first_name']} to introduce our services.",
-            f"Call with {prospect['first_name']} to address concerns about implementation.",
-            f"Scheduled call with {prospect['first_name']} to discuss next steps."
-        ],
-        "Meeting": [
-            f"Initial meeting with {prospect['first_name']} and team to present our solutions.",
-            f"Strategy meeting with {prospect['first_name']} to discuss implementation plan.",
-            f"Executive meeting with {prospect['first_name']} and decision makers.",
-            f"Project kickoff meeting with {prospect['first_name']} and stakeholders.",
-            f"Quarterly review meeting with {prospect['first_name']} to discuss progress."
-        ],
-        "Demo": [
-            f"Product demonstration for {prospect['first_name']} and team.",
-            f"Technical demo focusing on integration capabilities for {prospect['first_name']}.",
-            f"Custom demo addressing specific use cases for {prospect['first_name']}.",
-            f"Follow-up demo with {prospect['first_name']} to show additional features.",
-            f"Executive demo for {prospect['first_name']} and C-level stakeholders."
-        ],
-        "Proposal": [
-            f"Sent initial proposal to {prospect['first_name']} for review.",
-            f"Revised proposal based on feedback from {prospect['first_name']}.",
-            f"Proposal presentation meeting with {prospect['first_name']} and team.",
-            f"Final proposal adjustments as requested by {prospect['first_name']}.",
-            f"Proposal acceptance confirmation from {prospect['first_name']}."
-        ],
-        "Contract": [
-            f"Sent contract to {prospect['first_name']} for signature.",
-            f"Contract negotiation call with {prospect['first_name']} and legal team.",
-            f"Contract amendments as requested by {prospect['first_name']}.",
-            f"Contract signed by {prospect['first_name']} and returned.",
-            f"Contract renewal discussion with {prospect['first_name']}."
-        ],
-        "Support": [
-            f"Technical support call with {prospect['first_name']} regarding implementation.",
-            f"Resolved issue reported by {prospect['first_name']} with our product.",
-            f"Support ticket opened by {prospect['first_name']} for feature request.",
-            f"Follow-up on support case with {prospect['first_name']}.",
-            f"Proactive support check-in with {prospect['first_name']}."
-        ],
-        "Training": [
-            f"Initial training session with {prospect['first_name']} and team.",
-            f"Advanced features training for {prospect['first_name']} and power users.",
-            f"Administrator training for {prospect['first_name']}'s IT team.",
-            f"Custom workflow training as requested by {prospect['first_name']}.",
-            f"Refresher training session with {prospect['first_name']}'s new team members."
-        ],
-        "Implementation": [
-            f"Implementation planning meeting with {prospect['first_name']} and IT team.",
-            f"Data migration discussion with {prospect['first_name']}.",
-            f"Implementation progress review with {prospect['first_name']}.",
-            f"Implementation issue resolution for {prospect['first_name']}.",
-            f"Final implementation sign-off meeting with {prospect['first_name']}."
-        ],
-        "Review": [
-            f"Quarterly business review with {prospect['first_name']} to discuss results.",
-            f"Product feedback session with {prospect['first_name']} and users.",
-            f"Performance review meeting with {prospect['first_name']}.",
-            f"ROI analysis presentation for {prospect['first_name']} and executives.",
-            f"Annual contract review with {prospect['first_name']}."
-        ]
-    }
-    
-    description = random.choice(descriptions[activity_type])
+    description = activity_descriptions[activity_type].render(rng, first_name=prospect["first_name"])
     
     # Generate notes based on outcome
-    outcome = random.choice(activity_outcomes) if status == "Completed" else None
-    
-    notes_templates = {
-        "Positive": [
-            f"{prospect['first_name']} expressed strong interest in our solution. They particularly liked our {random.choice(['pricing model', 'feature set', 'integration capabilities', 'support options', 'implementation timeline'])}.",
-            f"Very productive {activity_type.lower()}. {prospect['first_name']} is ready to move forward with next steps.",
-            f"{prospect['first_name']} agreed to our proposal and wants to proceed quickly.",
-            f"Great response from {prospect['first_name']}. They see clear value in our offering.",
-            f"{prospect['first_name']} confirmed budget approval and is eager to get started."
-        ],
-        "Neutral": [
-            f"{prospect['first_name']} needs more time to consider options. Will follow up next week.",
-            f"{prospect['first_name']} requested additional information about {random.choice(['pricing', 'features', 'technical specifications', 'implementation process', 'support options'])}.",
-            f"Standard {activity_type.lower()} with {prospect['first_name']}. No major developments.",
-            f"{prospect['first_name']} is still evaluating competitors. Need to emphasize our differentiators.",
-            f"{prospect['first_name']} wants to involve more stakeholders before making a decision."
-        ],
-        "Negative": [
-            f"{prospect['first_name']} expressed concerns about our {random.choice(['pricing', 'implementation timeline', 'feature limitations', 'support model', 'contract terms'])}.",
-            f"Difficult {activity_type.lower()} with {prospect['first_name']}. They are leaning toward a competitor.",
-            f"{prospect['first_name']} has budget constraints that may delay the project.",
-            f"{prospect['first_name']} found our solution doesn't meet their requirements for {random.choice(['scalability', 'customization', 'integration', 'reporting', 'security'])}.",
-            f"{prospect['first_name']} is putting the project on hold due to internal reorganization."
-        ],
-        "Inconclusive": [
-            f"Unable to cover all agenda items with {prospect['first_name']}. Need to schedule follow-up.",
-            f"{prospect['first_name']} had limited time for our {activity_type.lower()}. Will need to reconnect.",
-            f"Technical issues prevented full {activity_type.lower()} with {prospect['first_name']}. Rescheduling.",
-            f"{prospect['first_name']} was unprepared for discussion. Need to resend materials and follow up.",
-            f"Mixed signals from {prospect['first_name']}. Need to clarify their priorities."
-        ],
-        "Requires Follow-up": [
-            f"{prospect['first_name']} requested follow-up with more detailed {random.choice(['pricing', 'technical specifications', 'case studies', 'implementation plan', 'ROI analysis'])}.",
-            f"Need to schedule technical team meeting with {prospect['first_name']}'s IT department.",
-            f"{prospect['first_name']} wants to see a custom demo addressing their specific use case.",
-            f"Action item: Send {prospect['first_name']} the requested documentation by end of week.",
-            f"{prospect['first_name']} asked for references from similar companies in their industry."
-        ]
-    }
+    outcome = rng.choice(activity_outcomes) if status == "Completed" else None
     
-    notes = notes_templates[outcome] if outcome else None
-    if notes:
-        notes = random.choice(notes)
+    notes = None
+    if outcome:
+        notes = activity_notes[outcome].render(rng, first_name=prospect["first_name"], activity=activity_type.lower())
     
     # For scheduled activities, generate a time
-    scheduled_time = generate_time() if status == "Scheduled" else None
+    scheduled_time = generate_time(rng) if status == "Scheduled" else None
     
     return {
         "activity_id": activity_id,
@@ -245,49 +277,159 @@ def generate_activity(prospect, activity_id, index):
         "date": activity_date,
         "time": scheduled_time,
         "status": status,
-        "priority": random.choice(activity_priorities),
+        "priority": rng.choice(activity_priorities),
         "assigned_to": prospect["assigned_to"],
         "outcome": outcome,
         "notes": notes,
-        "duration_minutes": random.choice([15, 30, 45, 60, 90, 120]) if activity_type in ["Meeting", "Demo", "Training"] else None
+        "duration_minutes": rng.choice([15, 30, 45, 60, 90, 120]) if activity_type in ["Meeting", "Demo", "Training"] else None
     }
 
-# Generate prospects and activities for each account
-all_prospects = []
-all_activities = []
+# Function to generate the prospects and activities for a run of accounts.
+# Yields (prospect, activities) groups in order, numbering PROS/ACT IDs sequentially
+# from the given starting numbers.
+def generate_prospect_groups(accounts, rng=random, first_prospect=1, first_activity=1, profile=DEFAULT_PROFILE):
+    prospect_id_counter = first_prospect
+    activity_id_counter = first_activity
 
-prospect_id_counter = 1
-activity_id_counter = 1
+    for account in accounts:
+        # Generate 1-3 prospects per account (or as many as the profile draws)
+        num_prospects = profile.count("prospects_per_account", rng, prospects_per_account)
 
-for account in accounts:
-    # Generate 1-3 prospects per account
-    num_prospects = random.randint(1, 3)
-    
-    account_prospects = []
-    for i in range(num_prospects):
-        prospect_id = f"PROS{prospect_id_counter:04d}"
-        prospect_id_counter += 1
-        
-        prospect = generate_prospect(account, prospect_id)
-        account_prospects.append(prospect)
-        all_prospects.append(prospect)
-        
-        # Generate 3-7 activities per prospect
-        num_activities = random.randint(3, 7)
-        
-        for j in range(num_activities):
-            activity_id = f"ACT{activity_id_counter:04d}"
-            activity_id_counter += 1
-            
-            activity = generate_activity(prospect, activity_id, j)
-            all_activities.append(activity)
-
-# Save to JSON files
-with open('prospects.json', 'w') as f:
-    json.dump(all_prospects, f, indent=2)
-
-with open('activities.json', 'w') as f:
-    json.dump(all_activities, f, indent=2)
-
-print(f"Generated {len(all_prospects)} prospects and {len(all_activities)} activities")
-print(f"Saved to prospects.json and activities.json")
+        for i in range(num_prospects):
+            prospect_id = f"PROS{prospect_id_counter:04d}"
+            prospect_id_counter += 1
+
+            prospect = generate_prospect(account, prospect_id, rng, profile)
+
+            # Generate 3-7 activities per prospect (or as many as the profile draws)
+            num_activities = profile.count("activities_per_prospect", rng, activities_per_prospect)
+            activities = []
+
+            for j in range(num_activities):
+                activity_id = f"ACT{activity_id_counter:04d}"
+                activity_id_counter += 1
+
+                activities.append(generate_activity(prospect, activity_id, j, rng, profile))
+
+            yield prospect, activities
+
+
+DEFAULT_SHARD_SIZE = 1000
+
+
+# Function to create the RNG for one block of accounts
+def _shard_rng(seed, shard):
+    return make_rng(seed, f"prospects/{shard}")
+
+
+# Function to generate one shard's prospect groups (runs in a worker process).
+# IDs are numbered from 1 within the shard and shifted into place by the caller,
+# since a shard can't know how many prospects the shards before it produced.
+def _generate_prospect_shard(args):
+    seed, shard, accounts, profile = args
+    return list(generate_prospect_groups(accounts, _shard_rng(seed, shard), profile=profile))
+
+
+# Function to shift a shard's locally numbered prospect/activity IDs by the given offsets
+def _offset_group_ids(prospect, activities, prospect_offset, activity_offset):
+    prospect["prospect_id"] = f"PROS{int(prospect['prospect_id'][4:]) + prospect_offset:04d}"
+    for activity in activities:
+        activity["activity_id"] = f"ACT{int(activity['activity_id'][3:]) + activity_offset:04d}"
+        activity["prospect_id"] = prospect["prospect_id"]
+
+
+# Function to split an account stream into (seed, shard, accounts, profile) blocks of `shard_size`
+def _iter_shards(accounts, seed, shard_size, profile=DEFAULT_PROFILE):
+    accounts = iter(accounts)
+    for shard in count():
+        block = list(islice(accounts, shard_size))
+        if not block:
+            return
+        yield seed, shard, block, profile
+
+
+# Function to generate prospect groups for a stream of accounts, yielded in order.
+# Accounts are taken in shards of `shard_size`, each drawing from its own RNG, so the
+# output only depends on the seed and shard size and the input never has to be fully
+# loaded. With more than one worker, shards run on a process pool and each shard's
+# groups are renumbered after the shards before it, keeping PROS/ACT IDs sequential.
+def generate_sharded_prospect_groups(accounts, seed, shard_size=DEFAULT_SHARD_SIZE, workers=1, profile=DEFAULT_PROFILE):
+    if workers <= 1:
+        prospect_id = 1
+        activity_id = 1
+        for seed, shard, block, profile in _iter_shards(accounts, seed, shard_size, profile):
+            for prospect, activities in generate_prospect_groups(block, _shard_rng(seed, shard), prospect_id, activity_id,
+                                                                 profile):
+                prospect_id += 1
+                activity_id += len(activities)
+                yield prospect, activities
+        return
+
+    prospect_offset = 0
+    activity_offset = 0
+    shard_args = _iter_shards(accounts, seed, shard_size, profile)
+    for groups in iter_shard_results(_generate_prospect_shard, shard_args, workers):
+        for prospect, activities in groups:
+            _offset_group_ids(prospect, activities, prospect_offset, activity_offset)
+            yield prospect, activities
+        prospect_offset += len(groups)
+        activity_offset += sum(len(activities) for _, activities in groups)
+
+
+# Function to write prospect groups to a prospects sink and an activities sink
+def write_prospect_groups(groups, prospects_writer, activities_writer):
+    for prospect, activities in groups:
+        prospects_writer.write(prospect)
+        for activity in activities:
+            activities_writer.write(activity)
+
+
+# Function to add the --seed/--shard-size/--workers options for prospect generation
+def add_prospect_shard_arguments(parser):
+    parser.add_argument("--seed", type=int, help="seed for reproducible output (default: random)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="accounts per shard; output is identical for a given seed and shard size")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate random prospects and activities for existing accounts.")
+    parser.add_argument("--accounts", default="accounts.json",
+                        help="accounts file produced by account_data_generator.py (JSON array or NDJSON)")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="json",
+                        help="json writes pretty-printed arrays, ndjson writes one compact record per line")
+    add_prospect_shard_arguments(parser)
+    add_time_ordered_arguments(parser)
+    add_profile_arguments(parser)
+    add_reference_date_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    set_reference_date(args.reference_date)
+    seed = args.seed if args.seed is not None else random_seed()
+    profile = load_profile(args.profile)
+    skew = SkewSummary()
+
+    # Stream accounts from the file and prospects/activities straight into their output files
+    prospects_output = default_output_path("prospects", args.output_format)
+    activities_output = default_output_path("activities", args.output_format)
+    with metrics_from_args(args) as metrics:
+        activities_sink = metrics.timed_writer(open_writer(activities_output, args.output_format), "activities")
+        if args.time_ordered:
+            activities_sink = TimeOrderedWriter(activities_sink, args.run_records)
+        prospects_sink = metrics.timed_writer(open_writer(prospects_output, args.output_format), "prospects")
+        with prospects_sink as prospects_writer, activities_sink as activities_writer:
+            accounts = skew.observe_accounts(iter_records(args.accounts))
+            groups = generate_sharded_prospect_groups(accounts, seed, args.shard_size, args.workers, profile)
+            write_prospect_groups(skew.observe_groups(groups), prospects_writer, activities_writer)
+
+    print(f"Generated {prospects_writer.count} prospects and {activities_writer.count} activities "
+          f"(seed {seed}, dates relative to {reference_date()})")
+    print(f"Saved to {prospects_output} and {activities_output}")
+    skew.report(profile, args.skew_report)
+    metrics.write_report(args.metrics, {"prospects": prospects_writer.count, "activities": activities_writer.count},
+                         [prospects_output, activities_output], command="prospect_activity_generator", seed=seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+import argparse
+import sys
+import uuid
+from array import array
+from datetime import date
+
+from account_data_generator import account_owners, account_statuses, company_types, contact_titles, countries, industries
+from generator_io import iter_records
+from prospect_activity_generator import (activity_outcomes, activity_priorities, activity_statuses, activity_types,
+                                         prospect_interests, prospect_next_steps, prospect_sources, prospect_statuses,
+                                         sales_reps)
+
+# Compact in-memory record model for generated accounts, prospects and activities.
+#
+# A record parsed from JSON is a dict whose keys and values are separate string
+# objects: an activity costs well over a kilobyte. This module holds the same
+# data in two compact shapes that convert back to the exact dict shape
+# (same keys, same order, same values) on demand:
+#
+#   - Record subclasses (Account, Contact, Note, Address, Prospect, Activity):
+#     __slots__ objects holding encoded field values. record["status"] decodes
+#     one field; to_dict() rebuilds the whole dict.
+#   - RecordTable: one typed array per field for flat records (prospects and
+#     activities), about a hundred bytes per activity. table[i] rebuilds row i.
+#
+# Encodings (shared by both shapes):
+#   - IDs ("ACT0042") are stored as their number, note/contact UUIDs as 128-bit ints
+#   - dates are day numbers (date.toordinal()), 0 for None
+#   - low-cardinality strings are codes into a Categorical seeded from the
+#     generators' vocabularies; unseen values get new codes, code 0 is None
+#   - free text stays text (UTF-8 blobs in tables)
+#
+# activity_feed.TimeOrderedWriter holds the activities of its in-memory sort
+# runs as Activity records; the other readers stream records and never hold them.
+#
+#   python record_model.py --activities activities.ndjson   # bytes per record for each shape
+
+
+class Categorical:
+    """An open enumeration: each distinct value gets a small integer code, 0 is None."""
+
+    def __init__(self, name, values=()):
+        self.name = name
+        self.values = [None]
+        self.codes = {None: 0}
+        for value in values:
+            self.code(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    # Function to get the code for a value, assigning a new one if it is unseen
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+INDUSTRY = Categorical("industry", industries)
+COMPANY_TYPE = Categorical("company_type", company_types)
+ACCOUNT_STATUS = Categorical("account_status", account_statuses)
+COUNTRY = Categorical("country", countries)
+SALES_REP = Categorical("sales_rep", account_owners + sales_reps)  # account_owner, note author and assigned_to
+FIRST_NAME = Categorical("first_name")
+LAST_NAME = Categorical("last_name")
+TITLE = Categorical("title", contact_titles)
+PROSPECT_STATUS = Categorical("prospect_status", prospect_statuses)
+PROSPECT_SOURCE = Categorical("prospect_source", prospect_sources)
+INTEREST = Categorical("interest", prospect_interests)
+NEXT_STEP = Categorical("next_step", prospect_next_steps)
+ACTIVITY_TYPE = Categorical("activity_type", activity_types)
+ACTIVITY_STATUS = Categorical("activity_status", activity_statuses)
+PRIORITY = Categorical("priority", activity_priorities)
+OUTCOME = Categorical("outcome", activity_outcomes)
+TIME_OF_DAY = Categorical("time")
+
+
+# Field codecs: encode() turns a dict value into its stored form, decode() turns it back.
+# typecode is the array typecode a RecordTable column uses (None: not storable in a table).
+
+class _Plain:
+    typecode = None
+
+    def encode(self, value):
+        return value
+
+    def decode(self, value):
+        return value
+
+
+class _Id:
+    typecode = "I"
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def encode(self, value):
+        if not value.startswith(self.prefix) or not value[len(self.prefix):].isdigit():
+            raise ValueError(f"{value!r} is not a {self.prefix} ID")
+        return int(value[len(self.prefix):])
+
+    def decode(self, value):
+        return f"{self.prefix}{value:04d}"
+
+
+class _Uuid:
+    typecode = None
+
+    def encode(self, value):
+        return uuid.UUID(value).int
+
+    def decode(self, value):
+        return str(uuid.UUID(int=value))
+
+
+class _Day:
+    typecode = "i"
+
+    def encode(self, value):
+        return date.fromisoformat(value).toordinal() if value is not None else 0
+
+    def decode(self, value):
+        return date.fromordinal(value).isoformat() if value else None
+
+
+class _Category:
+    typecode = "B"
+
+    def __init__(self, categorical):
+        self.categorical = categorical
+
+    def encode(self, value):
+        return self.categorical.code(value)
+
+    def decode(self, value):
+        return self.categorical.values[value]
+
+
+class _CategoryList:
+    typecode = None
+
+    def __init__(self, categorical):
+        self.categorical = categorical
+
+    def encode(self, values):
+        return bytes(self.categorical.code(value) for value in values)
+
+    def decode(self, codes):
+        return [self.categorical.values[code] for code in codes]
+
+
+class _Int(_Plain):
+    """An integer column; None is stored as `missing` in tables."""
+
+    def __init__(self, typecode, missing=None):
+        self.typecode = typecode
+        self.missing = missing
+
+
+class _Text(_Plain):
+    typecode = "text"
+
+
+class _Nested:
+    typecode = None
+
+    def __init__(self, record_class, many=False):
+        self.record_class = record_class
+        self.many = many
+
+    def encode(self, value):
+        if self.many:
+            return tuple(self.record_class.from_dict(item) for item in value)
+        return self.record_class.from_dict(value)
+
+    def decode(self, value):
+        if self.many:
+            return [item.to_dict() for item in value]
+        return value.to_dict()
+
+
+class Record:
+    """Base class for slotted records: slots hold encoded values, named after the dict keys."""
+
+    __slots__ = ()
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._codecs = dict(cls.fields)
+
+    @classmethod
+    def from_dict(cls, values):
+        record = cls.__new__(cls)
+        for name, codec in cls.fields:
+            setattr(record, name, codec.encode(values[name]))
+        return record
+
+    # Function to decode a single field, e.g. activity["status"]
+    def __getitem__(self, name):
+        return self._codecs[name].decode(getattr(self, name))
+
+    def get(self, name, default=None):
+        return self[name] if name in self._codecs else default
+
+    # Function to rebuild the record's dict in the generators' shape and key order
+    def to_dict(self):
+        return {name: codec.decode(getattr(self, name)) for name, codec in self.fields}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name)
+                                                 for name, _ in self.fields)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+ADDRESS_FIELDS = (
+    ("street", _Plain()), ("city", _Plain()), ("state", _Plain()), ("zip", _Plain()),
+    ("country", _Category(COUNTRY)),
+)
+
+
+class Address(Record):
+    __slots__ = tuple(name for name, _ in ADDRESS_FIELDS)
+    fields = ADDRESS_FIELDS
+
+
+CONTACT_FIELDS = (
+    ("contact_id", _Uuid()), ("first_name", _Category(FIRST_NAME)), ("last_name", _Category(LAST_NAME)),
+    ("title", _Category(TITLE)), ("email", _Plain()), ("phone", _Plain()), ("primary", _Plain()),
+)
+
+
+class Contact(Record):
+    __slots__ = tuple(name for name, _ in CONTACT_FIELDS)
+    fields = CONTACT_FIELDS
+
+
+NOTE_FIELDS = (
+    ("note_id", _Uuid()), ("date", _Day()), ("author", _Category(SALES_REP)), ("content", _Plain()),
+    ("related_contact", _Uuid()),
+)
+
+
+class Note(Record):
+    __slots__ = tuple(name for name, _ in NOTE_FIELDS)
+    fields = NOTE_FIELDS
+
+
+ACCOUNT_FIELDS = (
+    ("account_id", _Id("ACC")), ("company_name", _Plain()), ("industry", _Category(INDUSTRY)),
+    ("company_type", _Category(COMPANY_TYPE)), ("annual_revenue", _Plain()), ("employee_count", _Plain()),
+    ("website", _Plain()), ("address", _Nested(Address)), ("phone", _Plain()), ("email", _Plain()),
+    ("status", _Category(ACCOUNT_STATUS)), ("created_date", _Day()), ("last_contact_date", _Day()),
+    ("account_owner", _Category(SALES_REP)), ("contacts", _Nested(Contact, many=True)),
+    ("notes", _Nested(Note, many=True)),
+)
+
+
+class Account(Record):
+    __slots__ = tuple(name for name, _ in ACCOUNT_FIELDS)
+    fields = ACCOUNT_FIELDS
+
+
+PROSPECT_FIELDS = (
+    ("prospect_id", _Id("PROS")), ("account_id", _Id("ACC")), ("first_name", _Category(FIRST_NAME)),
+    ("last_name", _Category(LAST_NAME)), ("email", _Text()), ("phone", _Text()), ("title", _Category(TITLE)),
+    ("status", _Category(PROSPECT_STATUS)), ("source", _Category(PROSPECT_SOURCE)), ("created_date", _Day()),
+    ("last_contact_date", _Day()), ("estimated_value", _Int("I")), ("probability", _Int("B")),
+    ("interests", _CategoryList(INTEREST)), ("assigned_to", _Category(SALES_REP)),
+    ("next_step", _Category(NEXT_STEP)),
+)
+
+
+class Prospect(Record):
+    __slots__ = tuple(name for name, _ in PROSPECT_FIELDS)
+    fields = PROSPECT_FIELDS
+
+
+ACTIVITY_FIELDS = (
+    ("activity_id", _Id("ACT")), ("prospect_id", _Id("PROS")), ("account_id", _Id("ACC")),
+    ("type", _Category(ACTIVITY_TYPE)), ("description", _Text()), ("date", _Day()),
+    ("time", _Category(TIME_OF_DAY)), ("status", _Category(ACTIVITY_STATUS)), ("priority", _Category(PRIORITY)),
+    ("assigned_to", _Category(SALES_REP)), ("outcome", _Category(OUTCOME)), ("notes", _Text()),
+    ("duration_minutes", _Int("h", missing=-1)),
+)
+
+
+class Activity(Record):
+    __slots__ = tuple(name for name, _ in ACTIVITY_FIELDS)
+    fields = ACTIVITY_FIELDS
+
+
+RECORD_CLASSES = {"accounts": Account, "prospects": Prospect, "activities": Activity}
+
+
+class _TextColumn:
+    """Nullable strings as one UTF-8 blob plus end offsets; None is an empty span flagged in `present`."""
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.ends = array("Q")
+        self.present = bytearray()
+
+    def append(self, value):
+        if value is not None:
+            self.blob += value.encode("utf-8")
+        self.ends.append(len(self.blob))
+        self.present.append(value is not None)
+
+    # Function to drop rows `count` and up
+    def truncate(self, count):
+        del self.blob[self.ends[count - 1] if count else 0:]
+        del self.ends[count:]
+        del self.present[count:]
+
+    def __getitem__(self, i):
+        if not self.present[i]:
+            return None
+        start = self.ends[i - 1] if i else 0
+        return self.blob[start:self.ends[i]].decode("utf-8")
+
+    @property
+    def nbytes(self):
+        return len(self.blob) + len(self.ends) * self.ends.itemsize + len(self.present)
+
+
+class _ListColumn(_TextColumn):
+    """Lists of categorical codes as one byte blob plus end offsets."""
+
+    def append(self, codes):
+        self.blob += codes
+        self.ends.append(len(self.blob))
+        self.present.append(True)
+
+    def __getitem__(self, i):
+        start = self.ends[i - 1] if i else 0
+        return bytes(self.blob[start:self.ends[i]])
+
+
+class RecordTable:
+    """Array-backed table of flat records (Prospect or Activity fields), one typed column per field.
+
+    Appending takes dicts; table[i], get(i, name) and iteration decode back to dicts lazily.
+    """
+
+    def __init__(self, record_class):
+        self.record_class = record_class
+        self.fields = record_class.fields
+        self.columns = []
+        for name, codec in self.fields:
+            if isinstance(codec, _CategoryList):
+                self.columns.append(_ListColumn())
+            elif codec.typecode == "text":
+                self.columns.append(_TextColumn())
+            elif codec.typecode is None:
+                raise ValueError(f"{record_class.__name__}.{name} can't be stored in a table")
+            else:
+                self.columns.append(array(codec.typecode))
+        self._index = {name: i for i, (name, _) in enumerate(self.fields)}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # Function to add a row; a value that fails to encode or store leaves every column as it was
+    def append(self, values):
+        encoded = []
+        for name, codec in self.fields:
+            value = values[name]
+            if isinstance(codec, _Int) and value is None:
+                value = codec.missing
+            encoded.append(codec.encode(value))
+        for i, value in enumerate(encoded):
+            column = self.columns[i]
+            try:
+                try:
+                    column.append(value)
+                except OverflowError:
+                    # A categorical outgrew one-byte codes (or a number its type): widen the column
+                    self.columns[i] = column = array("H" if column.typecode == "B" else "q", column)
+                    column.append(value)
+            except Exception:
+                for stored in self.columns[:i]:
+                    if isinstance(stored, array):
+                        del stored[self.count:]
+                    else:
+                        stored.truncate(self.count)
+                raise
+        self.count += 1
+
+    def extend(self, records):
+        for values in records:
+            self.append(values)
+
+    def _decode(self, field, i):
+        name, codec = self.fields[field]
+        value = self.columns[field][i]
+        if isinstance(codec, _Int) and value == codec.missing:
+            return None
+        return codec.decode(value)
+
+    # Function to decode one field of row i without building the whole dict
+    def get(self, i, name):
+        return self._decode(self._index[name], i)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return {name: self._decode(field, i) for field, (name, _) in enumerate(self.fields)}
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    # Function to get the raw stored column for a field (an array of codes/numbers, or a text column)
+    def column(self, name):
+        return self.columns[self._index[name]]
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes if hasattr(column, "nbytes") else len(column) * column.itemsize
+                   for column in self.columns)
+
+
+# Function to load a file (any format iter_records reads) into slotted records
+def load_records(path, record_class):
+    return [record_class.from_dict(values) for values in iter_records(path)]
+
+
+# Function to load prospects or activities into a RecordTable
+def load_table(path, record_class):
+    table = RecordTable(record_class)
+    table.extend(iter_records(path))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generated records into the compact model and check round trips.")
+    parser.add_argument("--accounts", help="accounts file")
+    parser.add_argument("--prospects", help="prospects file")
+    parser.add_argument("--activities", help="activities file")
+    args = parser.parse_args()
+
+    mismatches = 0
+    for kind, path in (("accounts", args.accounts), ("prospects", args.prospects), ("activities", args.activities)):
+        if not path:
+            continue
+        record_class = RECORD_CLASSES[kind]
+        table = RecordTable(record_class) if kind != "accounts" else None
+        count = 0
+        for values in iter_records(path):
+            count += 1
+            if record_class.from_dict(values).to_dict() != values:
+                mismatches += 1
+            if table is not None:
+                table.append(values)
+                if table[table.count - 1] != values:
+                    mismatches += 1
+        line = f"{kind:<11} {count:>10,} records round-tripped"
+        if table is not None:
+            line += f", table {table.nbytes / max(count, 1):.0f} bytes/record"
+        print(line)
+    if mismatches:
+        print(f"{mismatches} records did not round-trip", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from itertools import islice
+from urllib.parse import urlsplit
+
+from generator_io import iter_records
+
+# Open-loop load replay of generated notes against the note-processing API.
+#
+# Notes are streamed from the generator output (account notes[].content and
+# activity notes) and each one becomes a processing run:
+#
+#   1. GET  /api/stream/<threadId>   subscribe to the AG-UI SSE channel first,
+#                                    so no event can be missed
+#   2. POST /api/notes/process       {"noteId", "threadId", "note": {...}}
+#   3. read events until LIFECYCLE_END, ERROR or CANCELLATION (or --timeout)
+#
+# Arrivals follow a schedule (Poisson or fixed interval at --rate per second)
+# that doesn't wait for responses, and latencies are measured from each note's
+# scheduled time, so a slow server shows up as queueing in the percentiles
+# instead of silently lowering the offered load. --concurrency caps the runs in
+# flight; --rate 0 replays closed-loop at that concurrency instead.
+#
+# Time-to-first-event (first event after the subscription heartbeat) and
+# time-to-completion go into log-linear histograms (HDR-style, ~1.5% value
+# precision); every --interval seconds a line with throughput and percentiles
+# is printed, and the run ends with the full percentile distribution. Input is
+# read lazily and at most --concurrency runs exist at once, so memory doesn't
+# grow with the corpus.
+#
+# processNote looks notes up by noteId, so the server needs the corpus loaded
+# under the same IDs for runs to complete normally; noteId is a deterministic
+# 24-hex ObjectId-shaped digest of the note's source record and position, and
+# the note itself is sent along in the request body. --export-notes writes the
+# same notes as Note documents (MongoDB extended JSON, _id = noteId) for
+# mongoimport instead of replaying them. Unknown notes still make a full round
+# trip, but the stream reports an ERROR event: those runs are counted as errors
+# and kept out of the completion histogram, and the summary warns when they
+# outnumber normal completions.
+#
+#   python replay_notes.py --accounts accounts.ndjson --activities activities.ndjson --export-notes notes.ndjson
+#   mongoimport --db <database> --collection notes --file notes.ndjson
+#   python replay_notes.py --accounts accounts.ndjson --activities activities.ndjson \
+#       --url http://localhost:5000 --rate 200 --arrival poisson --concurrency 256 --duration 300
+
+TERMINAL_EVENTS = {"LIFECYCLE_END", "ERROR", "CANCELLATION"}
+SUBSCRIBE_EVENT = "HEARTBEAT"
+
+
+# Function to derive a stable ObjectId-shaped note ID from where the note came from
+def note_id(record_id, position):
+    return hashlib.blake2b(f"{record_id}/{position}".encode(), digest_size=12).hexdigest()
+
+
+# Function to derive a stable ObjectId-shaped ID for a note's account or author
+def reference_id(kind, value):
+    return hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=12).hexdigest()
+
+
+# Function to turn a replay payload into a Note document (MongoDB extended JSON) under its noteId
+def note_document(note):
+    created = {"$date": f"{note['date']}T00:00:00Z"}
+    return {
+        "_id": {"$oid": note["noteId"]},
+        "accountId": {"$oid": reference_id("account", note["accountId"])},
+        "userId": {"$oid": reference_id("user", note["author"])},
+        "originalContent": note["content"],
+        "tags": [],
+        "isVoiceNote": False,
+        "actionItems": [],
+        "aiProcessed": False,
+        "createdAt": created,
+        "updatedAt": created,
+    }
+
+
+# Function to write notes as mongoimport-ready NDJSON; returns the number written
+def export_notes(notes, path):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for note in notes:
+            f.write(json.dumps(note_document(note), separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+# Function to stream account notes as replayable note payloads
+def iter_account_notes(path):
+    for account in iter_records(path):
+        for position, note in enumerate(account.get("notes") or ()):
+            yield {
+                "noteId": note_id(account["account_id"], position),
+                "accountId": account["account_id"],
+                "author": note.get("author"),
+                "date": note.get("date"),
+                "content": note["content"],
+            }
+
+
+# Function to stream activity notes (activities without notes are skipped)
+def iter_activity_notes(path):
+    for activity in iter_records(path):
+        if activity.get("notes"):
+            yield {
+                "noteId": note_id(activity["activity_id"], 0),
+                "accountId": activity["account_id"],
+                "prospectId": activity["prospect_id"],
+                "author": activity["assigned_to"],
+                "date": activity["date"],
+                "content": activity["notes"],
+            }
+
+
+# Function to interleave note streams round-robin until all are exhausted
+def interleave(*streams):
+    streams = [iter(stream) for stream in streams]
+    while streams:
+        for stream in list(streams):
+            try:
+                yield next(stream)
+            except StopIteration:
+                streams.remove(stream)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of microsecond values with ~1.5% relative precision.
+
+    Values below 128us get exact buckets; above that each power of two is split
+    into 64 sub-buckets, as HdrHistogram does with 2 significant digits.
+    """
+
+    SUB_BUCKET_BITS = 7
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    HALF = SUB_BUCKETS // 2
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        return self.SUB_BUCKETS + (shift - 1) * self.HALF + (value >> shift) - self.HALF
+
+    def _value(self, index):
+        if index < self.SUB_BUCKETS:
+            return index
+        shift, sub = divmod(index - self.SUB_BUCKETS, self.HALF)
+        shift += 1
+        # Report the bucket's highest value, so percentiles never understate latency
+        return ((sub + self.HALF + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1e6))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    # Function to get the value at a percentile (0-100) in seconds
+    def percentile(self, percent):
+        if not self.total:
+            return 0.0
+        target = max(1, round(self.total * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value(index), self.max) / 1e6
+        return self.max / 1e6
+
+    def summary(self, percents=(50, 90, 99, 99.9, 99.99)):
+        result = {f"p{percent:g}": round(self.percentile(percent), 6) for percent in percents}
+        result["max"] = self.max / 1e6
+        result["count"] = self.total
+        return result
+
+
+class ReplayStats:
+    """Counters and histograms for one reporting interval (and, merged, the whole run)."""
+
+    def __init__(self):
+        self.sent = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.first_event = LatencyHistogram()
+        self.completion = LatencyHistogram()
+
+    def merge(self, other):
+        self.sent += other.sent
+        self.completed += other.completed
+        self.failed += other.failed
+        self.timeouts += other.timeouts
+        self.errors += other.errors
+        self.first_event.merge(other.first_event)
+        self.completion.merge(other.completion)
+
+    def to_dict(self, seconds):
+        return {
+            "sent": self.sent,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "throughput": round(self.completed / seconds, 2) if seconds else 0.0,
+            "time_to_first_event": self.first_event.summary(),
+            "time_to_completion": self.completion.summary(),
+        }
+
+
+# Minimal HTTP/1.1 client ------------------------------------------------------
+
+async def _open_request(host, port, method, path, body=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    data = json.dumps(body, separators=(",", ":")).encode("utf-8") if body is not None else b""
+    head = [f"{method} {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: close"]
+    if body is not None:
+        head += ["Content-Type: application/json", f"Content-Length: {len(data)}"]
+    else:
+        head += ["Accept: text/event-stream", "Cache-Control: no-cache"]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError(f"{method} {path}: connection closed without a response")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, reader, writer
+
+
+# Function to yield a response body's chunks, handling chunked and fixed-length bodies
+async def _iter_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                return
+            yield await reader.readexactly(size)
+            await reader.readline()
+    elif "content-length" in headers:
+        yield await reader.readexactly(int(headers["content-length"]))
+    else:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                return
+            yield chunk
+
+
+# Function to yield decoded JSON events from an SSE body
+async def _iter_sse_events(reader, headers):
+    buffer = b""
+    async for chunk in _iter_body(reader, headers):
+        buffer += chunk.replace(b"\r\n", b"\n")
+        while b"\n\n" in buffer:
+            block, buffer = buffer.split(b"\n\n", 1)
+            data = b"\n".join(line[5:].lstrip() for line in block.split(b"\n") if line.startswith(b"data:"))
+            if data:
+                yield json.loads(data)
+
+
+class NoteReplay:
+    """Drives processing runs for a stream of notes and records their latencies."""
+
+    def __init__(self, url, concurrency=64, timeout=60.0, run_id=None):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.run_id = run_id or f"{int(time.time()):x}"
+        self.slots = asyncio.Semaphore(concurrency)
+        self.interval = ReplayStats()
+        self.total = ReplayStats()
+        self.reported_until = 0.0
+
+    # Function to run one note through subscribe -> process -> terminal event
+    async def run_note(self, number, note, scheduled):
+        self.interval.sent += 1
+        connection = []
+        try:
+            await asyncio.wait_for(self._run(number, note, scheduled, connection), self.timeout)
+        except asyncio.TimeoutError:
+            self.interval.timeouts += 1
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            self.interval.failed += 1
+        finally:
+            for writer in connection:
+                writer.close()
+            self.slots.release()
+
+    async def _run(self, number, note, scheduled, connection):
+        thread_id = f"replay_{self.run_id}_{number}"
+        status, headers, reader, writer = await _open_request(
+            self.host, self.port, "GET", f"{self.base_path}/api/stream/{thread_id}")
+        connection.append(writer)
+        if status != 200:
+            raise ConnectionError(f"stream subscription returned {status}")
+        events = _iter_sse_events(reader, headers)
+        async for event in events:
+            if event.get("type") == SUBSCRIBE_EVENT:
+                break
+
+        await self._submit(note, thread_id)
+
+        first_event = False
+        async for event in events:
+            if event.get("type") == SUBSCRIBE_EVENT:
+                continue
+            now = time.perf_counter()
+            if not first_event:
+                first_event = True
+                self.interval.first_event.record(now - scheduled)
+            if event.get("type") in TERMINAL_EVENTS:
+                # Only normal completions are timed: an ERROR (e.g. note not found) ends on a much shorter path
+                if event["type"] == "LIFECYCLE_END":
+                    self.interval.completion.record(now - scheduled)
+                    self.interval.completed += 1
+                else:
+                    self.interval.errors += 1
+                return
+        raise ConnectionError("stream closed before a terminal event")
+
+    async def _submit(self, note, thread_id):
+        body = {"noteId": note["noteId"], "threadId": thread_id, "note": note}
+        status, headers, reader, writer = await _open_request(
+            self.host, self.port, "POST", f"{self.base_path}/api/notes/process", body)
+        try:
+            async for _ in _iter_body(reader, headers):
+                pass
+        finally:
+            writer.close()
+        if status != 200:
+            raise ConnectionError(f"notes/process returned {status}")
+
+    # Function to swap in a fresh interval and fold the finished one into the run totals
+    def take_interval(self):
+        finished, self.interval = self.interval, ReplayStats()
+        self.total.merge(finished)
+        return finished
+
+    async def replay(self, notes, rate=0.0, arrival="poisson", duration=None, rng=random, report_interval=5.0,
+                     on_interval=None):
+        loop_started = time.perf_counter()
+        deadline = loop_started + duration if duration else None
+        reporter = asyncio.create_task(self._report_loop(loop_started, report_interval, on_interval))
+        tasks = set()
+        scheduled = loop_started
+        try:
+            for number, note in enumerate(notes):
+                if rate > 0:
+                    scheduled += rng.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+                    if deadline and scheduled > deadline:
+                        break
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif deadline and time.perf_counter() > deadline:
+                    break
+                # Waiting here for a free slot delays the send but not the schedule; the wait counts as latency
+                await self.slots.acquire()
+                start = scheduled if rate > 0 else time.perf_counter()
+                task = asyncio.create_task(self.run_note(number, note, start))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            reporter.cancel()
+        elapsed = time.perf_counter() - loop_started
+        last = self.take_interval()
+        if on_interval:
+            on_interval(elapsed, last, max(elapsed - self.reported_until, 1e-6))
+        return self.total, elapsed
+
+    async def _report_loop(self, started, interval, on_interval):
+        next_report = started + interval
+        while True:
+            await asyncio.sleep(max(0.0, next_report - time.perf_counter()))
+            finished = self.take_interval()
+            self.reported_until = next_report - started
+            if on_interval:
+                on_interval(self.reported_until, finished, interval)
+            next_report += interval
+
+
+def _format_interval(elapsed, stats, seconds):
+    return (f"{elapsed:8.1f}s  sent {stats.sent:6d}  done {stats.completed:6d}  err {stats.errors:4d}  "
+            f"fail {stats.failed:4d}  t/o {stats.timeouts:4d}  {stats.completed / seconds:8.1f}/s  "
+            f"first p50 {stats.first_event.percentile(50) * 1e3:8.1f}ms p99 {stats.first_event.percentile(99) * 1e3:8.1f}ms  "
+            f"done p50 {stats.completion.percentile(50) * 1e3:8.1f}ms p99 {stats.completion.percentile(99) * 1e3:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay generated notes against /api/notes/process with SSE tracking.")
+    parser.add_argument("--accounts", help="accounts file; replays notes[].content")
+    parser.add_argument("--activities", help="activities file; replays activity notes")
+    parser.add_argument("--url", default="http://localhost:5000", help="note-processing server base URL")
+    parser.add_argument("--rate", type=float, default=50.0, help="arrivals per second (0 = closed loop)")
+    parser.add_argument("--arrival", choices=["poisson", "fixed"], default="poisson", help="inter-arrival distribution")
+    parser.add_argument("--concurrency", type=int, default=64, help="maximum runs in flight")
+    parser.add_argument("--limit", type=int, help="stop after this many notes")
+    parser.add_argument("--duration", type=float, help="stop scheduling arrivals after this many seconds")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-run timeout in seconds")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between progress lines")
+    parser.add_argument("--seed", type=int, help="seed for Poisson arrivals")
+    parser.add_argument("--report", help="write intervals and the final summary as JSON to this path")
+    parser.add_argument("--export-notes", help="write the notes as Note documents for mongoimport to this path "
+                                               "instead of replaying them")
+    args = parser.parse_args()
+
+    sources = []
+    if args.accounts:
+        sources.append(iter_account_notes(args.accounts))
+    if args.activities:
+        sources.append(iter_activity_notes(args.activities))
+    if not sources:
+        parser.error("give --accounts and/or --activities")
+    notes = interleave(*sources)
+    if args.limit:
+        notes = islice(notes, args.limit)
+    if args.export_notes:
+        count = export_notes(notes, args.export_notes)
+        print(f"Wrote {count} notes to {args.export_notes} "
+              f"(mongoimport --collection notes --file {args.export_notes})")
+        return
+
+    intervals = []
+
+    def on_interval(elapsed, stats, seconds):
+        intervals.append(dict(stats.to_dict(seconds), elapsed=round(elapsed, 3)))
+        print(_format_interval(elapsed, stats, seconds), flush=True)
+
+    replay = NoteReplay(args.url, args.concurrency, args.timeout)
+    total, elapsed = asyncio.run(replay.replay(notes, args.rate, args.arrival, args.duration,
+                                               random.Random(args.seed), args.interval, on_interval))
+
+    summary = dict(total.to_dict(elapsed), elapsed=round(elapsed, 3))
+    print(f"\n{total.sent} notes in {elapsed:.1f}s: {total.completed} completed, {total.errors} error events, "
+          f"{total.failed} failed, {total.timeouts} timed out ({summary['throughput']:.1f} completions/sec)")
+    for label, histogram in (("time to first event", total.first_event), ("time to completion", total.completion)):
+        percentiles = [(name, value) for name, value in histogram.summary().items() if name != "count"]
+        print(f"  {label:<20}" + "  ".join(f"{name} {value * 1e3:9.1f}ms" for name, value in percentiles))
+    if total.errors > total.completed:
+        print(f"warning: {total.errors} of {total.sent} runs ended in an ERROR event; if the server doesn't have "
+              f"the corpus loaded, import it first (--export-notes)", file=sys.stderr)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"settings": vars(args), "intervals": intervals, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,737 @@
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import re
+import time
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from urllib.parse import parse_qs, quote, urlencode, urlsplit
+
+from generator_io import iter_records
+
+# Local stand-in for the SAP Sales Cloud V2 OData API, served from generator output.
+#
+# SAPSalesCloudMCPServer (src/mcp) talks to https://<tenant>/api/v2/accounts and
+# /opportunities with $filter/$select/$top/$skip/$orderby. This server answers
+# those requests from accounts and prospects files (any format iter_records
+# reads), so the MCP layer can be load-tested without a real tenant:
+#
+#   python sap_odata_server.py --accounts accounts.ndjson --prospects prospects.ndjson --profile flaky
+#   curl "http://127.0.0.1:8765/api/v2/accounts?\$filter=contains(AccountName,'Tech')&\$top=5"
+#
+# Accounts map to /accounts and prospects to /opportunities (see
+# account_entity/opportunity_entity). Each entity set keeps in-memory indexes:
+# key -> row, "eq" postings for Industry (and AccountID and Country on
+# opportunities), and trigram postings for contains(AccountName, '...'). A
+# $filter is parsed into a small AST; top-level "and" terms that hit an index
+# pick the candidate rows and the full predicate is then checked on those rows
+# only.
+#
+# Fault injection (FaultProfile) sits in front of every data request: a token
+# bucket rate limit (429 + Retry-After), added latency with jitter and a share
+# of very slow responses, and a share of 5xx errors. _makeRequest retries 5xx
+# and timeouts with exponential backoff but gives up on 4xx at once, so the
+# profiles exercise both paths. The profile can be swapped while the server
+# runs (PUT /_profile) and GET /_stats reports request counts by status.
+#
+# Only GET is served; writes (create/update_opportunity) get 405.
+
+MAX_PAGE_SIZE = 1000
+API_PREFIX = "/api/v2"
+# The generator has no close date, so a 90-day sales cycle from creation stands in
+SALES_CYCLE_DAYS = 90
+
+
+# Function to map a generated account to an SAP account entity
+def account_entity(account):
+    address = account["address"]
+    return {
+        "AccountID": account["account_id"],
+        "AccountName": account["company_name"],
+        "Industry": account["industry"],
+        "AccountType": account["company_type"],
+        "LifeCycleStatus": account["status"],
+        "Country": address["country"],
+        "City": address["city"],
+        "Region": address["state"],
+        "PostalCode": address["zip"],
+        "Street": address["street"],
+        "Phone": account["phone"],
+        "Email": account["email"],
+        "WebSite": account["website"],
+        "AnnualRevenueAmount": account["annual_revenue"],
+        "EmployeeCount": account["employee_count"],
+        "OwnerID": account["account_owner"],
+        "CreatedOn": account["created_date"],
+    }
+
+
+# Function to map a generated prospect (and its account entity) to an SAP opportunity entity;
+# account name, industry and country are copied over so opportunities filter on them like accounts do
+def opportunity_entity(prospect, account):
+    interests = prospect["interests"]
+    closing = date.fromisoformat(prospect["created_date"]) + timedelta(days=SALES_CYCLE_DAYS)
+    return {
+        "OpportunityID": prospect["prospect_id"],
+        "AccountID": prospect["account_id"],
+        "AccountName": account["AccountName"] if account else None,
+        "Industry": account["Industry"] if account else None,
+        "Country": account["Country"] if account else None,
+        "Description": f"{account['AccountName'] if account else prospect['account_id']} - "
+                       f"{interests[0] if interests else 'General'}",
+        "ContactName": f"{prospect['first_name']} {prospect['last_name']}",
+        "ContactEmail": prospect["email"],
+        "ContactTitle": prospect["title"],
+        "SalesOrganization": prospect["source"],
+        "ProcessingType": "01",
+        "LifeCycleStatus": prospect["status"],
+        "ExpectedRevenueAmount": prospect["estimated_value"],
+        "ProbabilityPercent": prospect["probability"],
+        "ExpectedClosingDate": closing.isoformat(),
+        "LastContactDate": prospect["last_contact_date"],
+        "OwnerID": prospect["assigned_to"],
+        "NextStep": prospect["next_step"],
+        "CreatedOn": prospect["created_date"],
+    }
+
+
+class ODataError(ValueError):
+    """A request error, rendered as an OData error body with the given HTTP status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# $filter parsing -------------------------------------------------------------
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+      (?P<string>'(?:[^']|'')*')
+    | (?P<date>\d{4}-\d{2}-\d{2}(?:T[0-9:.]+Z?)?)
+    | (?P<number>-?\d+(?:\.\d+)?)
+    | (?P<punct>[(),])
+    | (?P<word>[A-Za-z_][A-Za-z0-9_/]*)
+    )""", re.VERBOSE)
+
+COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "ne": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "ge": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "le": lambda a, b: a is not None and a <= b,
+}
+STRING_FUNCTIONS = {
+    "contains": lambda a, b: a is not None and b in a,
+    "startswith": lambda a, b: a is not None and a.startswith(b),
+    "endswith": lambda a, b: a is not None and a.endswith(b),
+}
+VALUE_FUNCTIONS = {
+    "tolower": lambda a: a.lower() if a is not None else None,
+    "toupper": lambda a: a.upper() if a is not None else None,
+    "trim": lambda a: a.strip() if a is not None else None,
+}
+LITERAL_WORDS = {"true": True, "false": False, "null": None}
+
+
+# Function to split a $filter expression into (kind, value) tokens
+def tokenize_filter(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_PATTERN.match(text, pos)
+        if not match or match.end() == pos:
+            raise ODataError(f"invalid $filter syntax near {text[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            value = value[1:-1].replace("''", "'")
+        elif kind == "number":
+            value = float(value) if "." in value else int(value)
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _FilterParser:
+    """Recursive-descent parser for the $filter subset the MCP server emits.
+
+    Grammar: or-expression of and-expressions of [not] terms; a term is a
+    parenthesized expression, a string function call (contains/startswith/
+    endswith) or a comparison between fields, literals and value functions
+    (tolower/toupper/trim). Nodes are tuples: ("and", a, b), ("or", a, b),
+    ("not", a), ("cmp", op, left, right), ("call", name, args),
+    ("field", name), ("lit", value).
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize_filter(text)
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value is not None and token[1] != value):
+            raise ODataError(f"invalid $filter: expected {value or kind}, got {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def _peek_word(self, *words):
+        kind, value = self._peek()
+        return kind == "word" and value in words
+
+    def parse(self):
+        node = self._or()
+        if self.pos != len(self.tokens):
+            raise ODataError(f"invalid $filter: unexpected {self._peek()[1]!r}")
+        return node
+
+    def _or(self):
+        node = self._and()
+        while self._peek_word("or"):
+            self.pos += 1
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._peek_word("and"):
+            self.pos += 1
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self):
+        if self._peek_word("not"):
+            self.pos += 1
+            return ("not", self._not())
+        return self._term()
+
+    def _term(self):
+        if self._peek() == ("punct", "("):
+            self.pos += 1
+            node = self._or()
+            self._take("punct", ")")
+            return node
+        if self._peek()[0] == "word" and self._peek()[1] in STRING_FUNCTIONS:
+            return self._call()
+        left = self._operand()
+        _, op = self._take("word")
+        if op not in COMPARISONS:
+            raise ODataError(f"invalid $filter: unknown operator {op!r}")
+        return ("cmp", op, left, self._operand())
+
+    def _call(self):
+        _, name = self._take("word")
+        self._take("punct", "(")
+        args = [self._operand()]
+        while self._peek() == ("punct", ","):
+            self.pos += 1
+            args.append(self._operand())
+        self._take("punct", ")")
+        expected = 2 if name in STRING_FUNCTIONS else 1
+        if len(args) != expected:
+            raise ODataError(f"invalid $filter: {name}() takes {expected} arguments")
+        return ("call", name, args)
+
+    def _operand(self):
+        kind, value = self._peek()
+        if kind in ("string", "number", "date"):
+            self.pos += 1
+            return ("lit", value)
+        if kind == "word" and value in LITERAL_WORDS:
+            self.pos += 1
+            return ("lit", LITERAL_WORDS[value])
+        if kind == "word" and value in VALUE_FUNCTIONS:
+            return self._call()
+        if kind == "word":
+            self.pos += 1
+            return ("field", value)
+        raise ODataError(f"invalid $filter: expected a field or literal, got {value!r}")
+
+
+# Function to parse a $filter expression into an AST (None for an empty filter)
+def parse_filter(text):
+    if not text or not text.strip():
+        return None
+    return _FilterParser(text).parse()
+
+
+# Function to compile a filter AST into a predicate over entity dicts
+def compile_filter(node, fields):
+    kind = node[0]
+    if kind == "and":
+        left, right = compile_filter(node[1], fields), compile_filter(node[2], fields)
+        return lambda entity: left(entity) and right(entity)
+    if kind == "or":
+        left, right = compile_filter(node[1], fields), compile_filter(node[2], fields)
+        return lambda entity: left(entity) or right(entity)
+    if kind == "not":
+        inner = compile_filter(node[1], fields)
+        return lambda entity: not inner(entity)
+    if kind == "cmp":
+        compare = COMPARISONS[node[1]]
+        left, right = _compile_value(node[2], fields), _compile_value(node[3], fields)
+        return lambda entity: compare(left(entity), right(entity))
+    if kind == "call" and node[1] in STRING_FUNCTIONS:
+        function = STRING_FUNCTIONS[node[1]]
+        left, right = (_compile_value(arg, fields) for arg in node[2])
+        return lambda entity: function(left(entity), right(entity))
+    raise ODataError("invalid $filter: expected a boolean expression")
+
+
+def _compile_value(node, fields):
+    kind = node[0]
+    if kind == "lit":
+        value = node[1]
+        return lambda entity: value
+    if kind == "field":
+        name = node[1]
+        if name not in fields:
+            raise ODataError(f"unknown property {name!r}")
+        return lambda entity: entity[name]
+    if kind == "call" and node[1] in VALUE_FUNCTIONS:
+        function = VALUE_FUNCTIONS[node[1]]
+        (inner,) = (_compile_value(arg, fields) for arg in node[2])
+        return lambda entity: function(inner(entity))
+    raise ODataError("invalid $filter: expected a value")
+
+
+# Function to split a filter AST into its top-level "and" terms
+def conjuncts(node):
+    if node is None:
+        return []
+    if node[0] == "and":
+        return conjuncts(node[1]) + conjuncts(node[2])
+    return [node]
+
+
+# Entity sets -----------------------------------------------------------------
+
+# Function to get the distinct trigrams of a string
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class EntitySet:
+    """An OData entity set held in memory, with key, equality and substring indexes.
+
+    Rows are entity dicts in load order. eq_fields get value -> row postings;
+    contains_fields get trigram -> row postings (array('I'), ascending), which
+    narrow contains() to the rows sharing the needle's rarest trigram.
+    """
+
+    def __init__(self, name, key, eq_fields=(), contains_fields=()):
+        self.name = name
+        self.key = key
+        self.fields = None
+        self.entities = []
+        self.by_key = {}
+        self.eq_indexes = {field: {} for field in eq_fields}
+        self.contains_indexes = {field: {} for field in contains_fields}
+
+    def add(self, entity):
+        row = len(self.entities)
+        if self.fields is None:
+            self.fields = set(entity)
+        self.entities.append(entity)
+        self.by_key[entity[self.key]] = row
+        for field, index in self.eq_indexes.items():
+            postings = index.get(entity[field])
+            if postings is None:
+                postings = index[entity[field]] = array("I")
+            postings.append(row)
+        for field, index in self.contains_indexes.items():
+            for trigram in trigrams(entity[field] or ""):
+                postings = index.get(trigram)
+                if postings is None:
+                    postings = index[trigram] = array("I")
+                postings.append(row)
+
+    def __len__(self):
+        return len(self.entities)
+
+    def get(self, key):
+        row = self.by_key.get(key)
+        if row is None:
+            raise ODataError(f"{self.name}('{key}') not found", 404)
+        return self.entities[row]
+
+    # Function to get index-backed candidate rows for one filter term (None if no index applies)
+    def _candidates(self, term):
+        if term[0] == "cmp" and term[1] == "eq" and term[2][0] == "field" and term[3][0] == "lit":
+            field, value = term[2][1], term[3][1]
+            if field == self.key:
+                row = self.by_key.get(value)
+                return [] if row is None else [row]
+            if field in self.eq_indexes:
+                return self.eq_indexes[field].get(value, ())
+        if term[0] == "call" and term[1] == "contains" and term[2][0][0] == "field" and term[2][1][0] == "lit":
+            field, needle = term[2][0][1], term[2][1][1]
+            if field in self.contains_indexes and isinstance(needle, str) and len(needle) >= 3:
+                index = self.contains_indexes[field]
+                return min((index.get(trigram, ()) for trigram in trigrams(needle)), key=len)
+        return None
+
+    # Function to get the rows matching a filter AST, in row order
+    def select_rows(self, node):
+        if node is None:
+            return range(len(self.entities))
+        predicate = compile_filter(node, self.fields or ())
+        candidates = None
+        for term in conjuncts(node):
+            rows = self._candidates(term)
+            if rows is not None and (candidates is None or len(rows) < len(candidates)):
+                candidates = rows
+        if candidates is None:
+            candidates = range(len(self.entities))
+        entities = self.entities
+        try:
+            return [row for row in candidates if predicate(entities[row])]
+        except TypeError as e:
+            raise ODataError(f"invalid $filter: incompatible operand types ({e})")
+
+    def _check_fields(self, names, option):
+        unknown = [name for name in names if name not in (self.fields or ())]
+        if unknown:
+            raise ODataError(f"unknown property {unknown[0]!r} in {option}")
+
+    # Function to order rows by a parsed $orderby list, keeping only the first `limit` if given
+    def _order(self, rows, orderby, limit):
+        entities = self.entities
+        if len(orderby) == 1 and limit is not None and limit < len(rows) // 4:
+            field, descending = orderby[0]
+            key = lambda row: (entities[row][field] is not None, entities[row][field])
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            return pick(limit, rows, key=key)
+        rows = list(rows)
+        # Stable sorts from the last key to the first give a multi-key sort with per-key direction
+        for field, descending in reversed(orderby):
+            rows.sort(key=lambda row: (entities[row][field] is not None, entities[row][field]), reverse=descending)
+        return rows
+
+    # Function to answer a collection query given the parsed query options
+    def query(self, options, base_url):
+        rows = self.select_rows(parse_filter(options.get("$filter")))
+        total = len(rows)
+
+        top = _int_option(options, "$top", MAX_PAGE_SIZE)
+        skip = _int_option(options, "$skip", 0)
+        page_size = min(top, MAX_PAGE_SIZE)
+
+        orderby = _parse_orderby(options.get("$orderby"))
+        self._check_fields([field for field, _ in orderby], "$orderby")
+        if orderby:
+            rows = self._order(rows, orderby, skip + page_size)
+
+        page = rows[skip:skip + page_size]
+        select = _parse_select(options.get("$select"))
+        self._check_fields(select or (), "$select")
+        response = {"@odata.context": f"$metadata#{self.name}"}
+        if options.get("$count", "").lower() == "true":
+            response["@odata.count"] = total
+        response["value"] = [_project(self.entities[row], select) for row in page]
+
+        # Server-driven paging when $top asks for more than one page
+        remaining = min(top, total - skip) - len(page)
+        if remaining > 0:
+            next_options = dict(options, **{"$skip": str(skip + len(page)), "$top": str(top - len(page))})
+            query = urlencode(next_options, safe="$',()", quote_via=quote)
+            response["@odata.nextLink"] = f"{base_url}?{query}"
+        return response
+
+
+def _int_option(options, name, default):
+    value = options.get(name)
+    if value is None or value == "":
+        return default
+    if not value.isdigit():
+        raise ODataError(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+# Function to parse "$orderby=Field desc, Other" into [(field, descending), ...]
+def _parse_orderby(text):
+    orderby = []
+    for part in (text or "").split(","):
+        words = part.split()
+        if not words:
+            continue
+        if len(words) > 2 or (len(words) == 2 and words[1] not in ("asc", "desc")):
+            raise ODataError(f"invalid $orderby term {part.strip()!r}")
+        orderby.append((words[0], len(words) == 2 and words[1] == "desc"))
+    return orderby
+
+
+def _parse_select(text):
+    if not text or text.strip() == "*":
+        return None
+    return [name.strip() for name in text.split(",") if name.strip()]
+
+
+def _project(entity, select):
+    if select is None:
+        return entity
+    return {name: entity[name] for name in select}
+
+
+# Function to load the accounts and opportunities entity sets from generator output
+def load_entity_sets(accounts_path, prospects_path=None):
+    accounts = EntitySet("accounts", "AccountID", eq_fields=["Industry"], contains_fields=["AccountName"])
+    for account in iter_records(accounts_path):
+        accounts.add(account_entity(account))
+    opportunities = EntitySet("opportunities", "OpportunityID", eq_fields=["AccountID", "Industry", "Country"],
+                              contains_fields=["AccountName"])
+    if prospects_path:
+        for prospect in iter_records(prospects_path):
+            row = accounts.by_key.get(prospect["account_id"])
+            account = accounts.entities[row] if row is not None else None
+            opportunities.add(opportunity_entity(prospect, account))
+    return {"accounts": accounts, "opportunities": opportunities}
+
+
+# Fault injection -------------------------------------------------------------
+
+class FaultProfile:
+    """Latency, error-rate and rate-limit settings applied to every data request.
+
+    latency_ms + uniform(0, jitter_ms) is added to each response; slow_rate of
+    requests instead take slow_ms (to trip client timeouts). error_rate of
+    requests fail with error_status. rate_limit (requests/sec, 0 = off) with a
+    bucket of `burst` tokens answers 429 with Retry-After once exhausted.
+    """
+
+    SETTINGS = {
+        "latency_ms": float, "jitter_ms": float, "slow_rate": float, "slow_ms": float,
+        "error_rate": float, "error_status": int, "rate_limit": float, "burst": int,
+    }
+
+    def __init__(self, latency_ms=0, jitter_ms=0, slow_rate=0.0, slow_ms=0, error_rate=0.0, error_status=503,
+                 rate_limit=0, burst=10):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.burst = burst
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.SETTINGS}
+
+    # Function to update settings from a dict (e.g. a PUT /_profile body), validating names and types
+    def update(self, settings):
+        for name, value in settings.items():
+            if name not in self.SETTINGS:
+                raise ODataError(f"unknown profile setting {name!r}")
+            try:
+                setattr(self, name, self.SETTINGS[name](value))
+            except (TypeError, ValueError):
+                raise ODataError(f"invalid value for {name}: {value!r}")
+        return self
+
+
+PROFILES = {
+    "none": {},
+    "realistic": {"latency_ms": 40, "jitter_ms": 60},
+    "flaky": {"latency_ms": 40, "jitter_ms": 60, "error_rate": 0.05, "error_status": 503},
+    "slow": {"latency_ms": 250, "jitter_ms": 500, "slow_rate": 0.02, "slow_ms": 35000},
+    "throttled": {"latency_ms": 20, "jitter_ms": 20, "rate_limit": 50, "burst": 20},
+    "outage": {"error_rate": 1.0, "error_status": 502},
+}
+
+
+class TokenBucket:
+    """Allows `rate` requests/sec on average with bursts of up to `burst`."""
+
+    def __init__(self):
+        self.tokens = None
+        self.updated = time.monotonic()
+
+    # Function to take one token; returns 0 if allowed, else seconds until a token is available
+    def take(self, rate, burst):
+        now = time.monotonic()
+        if self.tokens is None:
+            self.tokens = float(burst)
+        self.tokens = min(float(burst), self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / rate
+
+
+# HTTP server -----------------------------------------------------------------
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 429: "Too Many Requests",
+               500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
+               504: "Gateway Timeout"}
+_KEY_PATTERN = re.compile(r"^/(\w+)\('([^']*)'\)$")
+
+
+def _error_body(status, message):
+    return {"error": {"code": str(status), "message": {"lang": "en", "value": message}}}
+
+
+class ODataServer:
+    """Asyncio HTTP/1.1 server for the entity sets, with keep-alive and fault injection."""
+
+    def __init__(self, entity_sets, profile=None, seed=None):
+        self.entity_sets = entity_sets
+        self.profile = profile or FaultProfile()
+        self.rng = random.Random(seed)
+        self.bucket = TokenBucket()
+        self.stats = Counter()
+        self.started = time.monotonic()
+
+    # Function to handle one request; returns (status, body, extra headers)
+    async def handle(self, method, target, body=b""):
+        url = urlsplit(target)
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        if path.startswith("/_"):
+            return self._admin(method, path, body)
+
+        self.stats["requests"] += 1
+        profile = self.profile
+        if profile.rate_limit > 0:
+            wait = self.bucket.take(profile.rate_limit, profile.burst)
+            if wait:
+                self.stats["429"] += 1
+                return 429, _error_body(429, "rate limit exceeded"), {"Retry-After": str(max(1, round(wait)))}
+
+        delay_ms = profile.slow_ms if self.rng.random() < profile.slow_rate else \
+            profile.latency_ms + self.rng.uniform(0, profile.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self.rng.random() < profile.error_rate:
+            self.stats[str(profile.error_status)] += 1
+            return profile.error_status, _error_body(profile.error_status, "injected failure"), {}
+
+        try:
+            if method != "GET":
+                raise ODataError(f"{method} is not supported by the stand-in server", 405)
+            status, payload = 200, self._route(path, parse_qs(url.query), url.path)
+        except ODataError as e:
+            status, payload = e.status, _error_body(e.status, str(e))
+        self.stats[str(status)] += 1
+        return status, payload, {}
+
+    def _route(self, path, query, full_path):
+        options = {name: values[-1] for name, values in query.items()}
+        match = _KEY_PATTERN.match(path)
+        if match:
+            entity_set = self._entity_set(match.group(1))
+            return _project(entity_set.get(match.group(2)), _parse_select(options.get("$select")))
+        entity_set = self._entity_set(path.strip("/"))
+        return entity_set.query(options, full_path)
+
+    def _entity_set(self, name):
+        if name not in self.entity_sets:
+            raise ODataError(f"unknown entity set {name!r}", 404)
+        return self.entity_sets[name]
+
+    # Function to serve /_stats and /_profile (never delayed, limited or failed)
+    def _admin(self, method, path, body):
+        if path == "/_stats" and method == "GET":
+            uptime = time.monotonic() - self.started
+            stats = dict(self.stats, uptime_seconds=round(uptime, 3),
+                         requests_per_second=round(self.stats["requests"] / uptime, 1) if uptime else 0)
+            return 200, stats, {}
+        if path == "/_profile" and method == "GET":
+            return 200, self.profile.to_dict(), {}
+        if path == "/_profile" and method in ("PUT", "POST"):
+            try:
+                settings = json.loads(body or b"{}")
+                if isinstance(settings, str):
+                    settings = PROFILES[settings]
+                self.profile = FaultProfile().update(settings) if method == "PUT" else self.profile.update(settings)
+            except (ValueError, KeyError) as e:
+                return 400, _error_body(400, str(e)), {}
+            return 200, self.profile.to_dict(), {}
+        return 404, _error_body(404, f"no admin endpoint {method} {path}"), {}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, _error_body(400, "malformed request line"), {}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload, extra_headers = await self.handle(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, extra_headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, extra_headers, keep_alive):
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Error')}",
+                "Content-Type: application/json; odata.metadata=minimal",
+                "OData-Version: 4.0",
+                f"Content-Length: {len(data)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in extra_headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self._handle_connection, host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve generated accounts/prospects as a SAP Sales Cloud OData API.")
+    parser.add_argument("--accounts", default="accounts.json", help="accounts file (JSON array or NDJSON)")
+    parser.add_argument("--prospects", help="prospects file, served as /opportunities")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="none", help="fault injection preset")
+    parser.add_argument("--seed", type=int, help="seed for injected latency/errors (default: random)")
+    for name, kind in FaultProfile.SETTINGS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=kind, help="override the preset's value")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    entity_sets = load_entity_sets(args.accounts, args.prospects)
+    print(f"Loaded {len(entity_sets['accounts'])} accounts and {len(entity_sets['opportunities'])} opportunities "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    profile = FaultProfile().update(PROFILES[args.profile])
+    profile.update({name: getattr(args, name) for name in FaultProfile.SETTINGS if getattr(args, name) is not None})
+    print(f"Serving http://{args.host}:{args.port}{API_PREFIX}/accounts and /opportunities "
+          f"(profile {args.profile}: {profile.to_dict()})")
+    try:
+        asyncio.run(ODataServer(entity_sets, profile, args.seed).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import sqlite3
+
+from generator_io import iter_records
+
+# SQLite output backend for the generated dataset.
+#
+# Accounts (with their contacts and notes), prospects and activities are
+# bulk-loaded into normalized tables in batched transactions. Tables are created
+# without secondary indexes so inserts stay append-only; the indexes that serve
+# the controller query patterns (by account, by industry, by recency) are built
+# once loading finishes.
+
+DEFAULT_BATCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account_id TEXT NOT NULL,
+    company_name TEXT,
+    industry TEXT,
+    company_type TEXT,
+    annual_revenue INTEGER,
+    employee_count INTEGER,
+    website TEXT,
+    street TEXT,
+    city TEXT,
+    state TEXT,
+    zip TEXT,
+    country TEXT,
+    phone TEXT,
+    email TEXT,
+    status TEXT,
+    created_date TEXT,
+    last_contact_date TEXT,
+    account_owner TEXT
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    contact_id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    title TEXT,
+    email TEXT,
+    phone TEXT,
+    is_primary INTEGER
+);
+CREATE TABLE IF NOT EXISTS notes (
+    note_id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    date TEXT,
+    author TEXT,
+    content TEXT,
+    related_contact TEXT
+);
+CREATE TABLE IF NOT EXISTS prospects (
+    prospect_id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    email TEXT,
+    phone TEXT,
+    title TEXT,
+    status TEXT,
+    source TEXT,
+    created_date TEXT,
+    last_contact_date TEXT,
+    estimated_value INTEGER,
+    probability INTEGER,
+    interests TEXT,
+    assigned_to TEXT,
+    next_step TEXT
+);
+CREATE TABLE IF NOT EXISTS activities (
+    activity_id TEXT NOT NULL,
+    prospect_id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    type TEXT,
+    description TEXT,
+    date TEXT,
+    time TEXT,
+    status TEXT,
+    priority TEXT,
+    assigned_to TEXT,
+    outcome TEXT,
+    notes TEXT,
+    duration_minutes INTEGER
+);
+"""
+
+# Built after loading; each one backs a query in crm_queries.py
+INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_id ON accounts (account_id);
+CREATE INDEX IF NOT EXISTS idx_accounts_name ON accounts (company_name);
+CREATE INDEX IF NOT EXISTS idx_accounts_industry_name ON accounts (industry, company_name);
+CREATE INDEX IF NOT EXISTS idx_accounts_last_contact ON accounts (last_contact_date DESC);
+CREATE INDEX IF NOT EXISTS idx_contacts_account ON contacts (account_id);
+CREATE INDEX IF NOT EXISTS idx_notes_account_date ON notes (account_id, date DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_prospects_id ON prospects (prospect_id);
+CREATE INDEX IF NOT EXISTS idx_prospects_account_name ON prospects (account_id, last_name, first_name);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_activities_id ON activities (activity_id);
+CREATE INDEX IF NOT EXISTS idx_activities_account_date ON activities (account_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_activities_prospect ON activities (prospect_id);
+"""
+
+
+# Function to flatten an account record into its accounts/contacts/notes rows
+def account_rows(account):
+    address = account["address"]
+    account_row = (
+        account["account_id"], account["company_name"], account["industry"], account["company_type"],
+        account["annual_revenue"], account["employee_count"], account["website"],
+        address["street"], address["city"], address["state"], address["zip"], address["country"],
+        account["phone"], account["email"], account["status"], account["created_date"],
+        account["last_contact_date"], account["account_owner"],
+    )
+    contact_rows = [
+        (contact["contact_id"], account["account_id"], contact["first_name"], contact["last_name"],
+         contact["title"], contact["email"], contact["phone"], int(contact["primary"]))
+        for contact in account["contacts"]
+    ]
+    note_rows = [
+        (note["note_id"], account["account_id"], note["date"], note["author"], note["content"],
+         note["related_contact"])
+        for note in account["notes"]
+    ]
+    return account_row, contact_rows, note_rows
+
+
+# Function to flatten a prospect record into a prospects row
+def prospect_row(prospect):
+    return (
+        prospect["prospect_id"], prospect["account_id"], prospect["first_name"], prospect["last_name"],
+        prospect["email"], prospect["phone"], prospect["title"], prospect["status"], prospect["source"],
+        prospect["created_date"], prospect["last_contact_date"], prospect["estimated_value"],
+        prospect["probability"], json.dumps(prospect["interests"]), prospect["assigned_to"], prospect["next_step"],
+    )
+
+
+# Function to flatten an activity record into an activities row
+def activity_row(activity):
+    return (
+        activity["activity_id"], activity["prospect_id"], activity["account_id"], activity["type"],
+        activity["description"], activity["date"], activity["time"], activity["status"], activity["priority"],
+        activity["assigned_to"], activity["outcome"], activity["notes"], activity["duration_minutes"],
+    )
+
+
+class _TableWriter:
+    """Record sink for one record type; rows are buffered and flushed by the owning SQLiteSink."""
+
+    def __init__(self, sink, to_rows):
+        self.sink = sink
+        self.count = 0
+        self._to_rows = to_rows
+
+    def write(self, record):
+        self._to_rows(record)
+        self.count += 1
+        self.sink._maybe_flush()
+
+    # Closing is handled by the sink so indexes are only built once
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SQLiteSink:
+    """Bulk loader for a generated dataset.
+
+    Exposes accounts/prospects/activities record writers with the same
+    write()/count interface as the generator_io sinks, so it can be dropped into
+    generate_dataset(). Rows are inserted in transactions of `batch_size`
+    records; indexes are built and statistics gathered on close().
+
+    An existing database at `path` is replaced, not appended to.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        if path != ":memory:":
+            for stale in (path, path + "-journal", path + "-wal", path + "-shm"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+        self.conn = sqlite3.connect(path)
+        # Every load starts from an empty file, so trade durability for load speed
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA cache_size = -65536")
+        self.conn.executescript(SCHEMA)
+
+        self._rows = {"accounts": [], "contacts": [], "notes": [], "prospects": [], "activities": []}
+        self._pending = 0
+        self.accounts = _TableWriter(self, self._add_account)
+        self.prospects = _TableWriter(self, lambda record: self._rows["prospects"].append(prospect_row(record)))
+        self.activities = _TableWriter(self, lambda record: self._rows["activities"].append(activity_row(record)))
+
+    def _add_account(self, account):
+        account_row, contact_rows, note_rows = account_rows(account)
+        self._rows["accounts"].append(account_row)
+        self._rows["contacts"].extend(contact_rows)
+        self._rows["notes"].extend(note_rows)
+
+    def _maybe_flush(self):
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    # Function to insert all buffered rows in a single transaction
+    def flush(self):
+        with self.conn:
+            for table, rows in self._rows.items():
+                if rows:
+                    placeholders = ", ".join("?" * len(rows[0]))
+                    self.conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+                    rows.clear()
+        self._pending = 0
+
+    # Function to build the query indexes and refresh the planner statistics
+    def build_indexes(self):
+        self.conn.executescript(INDEXES)
+        self.conn.execute("ANALYZE")
+
+    def close(self):
+        self.flush()
+        self.build_indexes()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.conn.close()
+
+
+# Function to load existing generator output files into a SQLite database
+def load_files(path, accounts_path, prospects_path=None, activities_path=None, batch_size=DEFAULT_BATCH_SIZE):
+    with SQLiteSink(path, batch_size) as sink:
+        for account in iter_records(accounts_path):
+            sink.accounts.write(account)
+        if prospects_path:
+            for prospect in iter_records(prospects_path):
+                sink.prospects.write(prospect)
+        if activities_path:
+            for activity in iter_records(activities_path):
+                sink.activities.write(activity)
+    return sink
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generated accounts, prospects and activities into SQLite.")
+    parser.add_argument("--accounts", default="accounts.json", help="accounts file (JSON array or NDJSON)")
+    parser.add_argument("--prospects", default="prospects.json", help="prospects file (JSON array or NDJSON)")
+    parser.add_argument("--activities", default="activities.json", help="activities file (JSON array or NDJSON)")
+    parser.add_argument("--output", default="crm.db", help="SQLite database to create")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="records per transaction")
+    args = parser.parse_args()
+
+    sink = load_files(args.output, args.accounts, args.prospects, args.activities, args.batch_size)
+    print(f"Loaded {sink.accounts.count} accounts, {sink.prospects.count} prospects and "
+          f"{sink.activities.count} activities into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
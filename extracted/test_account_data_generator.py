@@ -0,0 +1,39 @@
+import json
+import os
+import subprocess
+import sys
+
+from generator_io import JSONArrayWriter, NDJSONWriter, iter_records
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _generate(directory, output_format, *args):
+    subprocess.run([sys.executable, os.path.join(HERE, "account_data_generator.py"), "--count", "30", "--seed", "5",
+                    "--reference-date", "2026-01-01", "--format", output_format, *args],
+                   cwd=str(directory), check=True, capture_output=True)
+
+
+def test_ndjson_and_json_output_hold_the_same_records(tmp_path):
+    _generate(tmp_path, "json")
+    _generate(tmp_path, "ndjson")
+    with open(tmp_path / "accounts.json") as f:
+        accounts = json.load(f)
+    assert len(accounts) == 30
+    assert list(iter_records(str(tmp_path / "accounts.ndjson"))) == accounts
+    assert list(iter_records(str(tmp_path / "accounts.json"))) == accounts
+
+
+def test_writers_match_json_dump(tmp_path, small_dataset):
+    accounts = list(iter_records(small_dataset["accounts"]))
+    with JSONArrayWriter(str(tmp_path / "streamed.json")) as writer:
+        for account in accounts:
+            writer.write(account)
+    with open(tmp_path / "streamed.json") as f:
+        assert f.read() == json.dumps(accounts, indent=2)
+
+    with NDJSONWriter(str(tmp_path / "streamed.ndjson")) as writer:
+        for account in accounts:
+            writer.write(account)
+    with open(tmp_path / "streamed.ndjson") as f:
+        assert [json.loads(line) for line in f] == accounts
@@ -0,0 +1,36 @@
+import pytest
+
+from activity_columns import ActivityColumnReader, ActivityColumnWriter
+from generator_io import iter_records
+
+
+@pytest.fixture
+def actcol(tmp_path, small_dataset):
+    path = str(tmp_path / "activities.actcol")
+    with ActivityColumnWriter(path) as writer:
+        for activity in iter_records(small_dataset["activities"]):
+            writer.write(activity)
+    return path
+
+
+def test_round_trip(actcol, small_dataset):
+    activities = list(iter_records(small_dataset["activities"]))
+    with ActivityColumnReader(actcol) as reader:
+        assert len(reader) == len(activities)
+        assert list(reader.rows()) == activities
+
+
+def test_where_matches_a_scan(actcol, small_dataset):
+    activities = list(iter_records(small_dataset["activities"]))
+    with ActivityColumnReader(actcol) as reader:
+        mask = reader.where(status="Completed", priority=["High", "Medium"])
+        expected = [a for a in activities if a["status"] == "Completed" and a["priority"] in ("High", "Medium")]
+        assert list(reader.rows(mask)) == expected
+        assert not reader.where(status="No such status").any()
+
+
+def test_close_while_a_column_view_is_held(actcol):
+    with ActivityColumnReader(actcol) as reader:
+        days = reader.column("date")
+        first = int(days[0])
+    assert int(days[0]) == first
@@ -0,0 +1,28 @@
+import pytest
+
+from activity_feed import TimeOrderedWriter, activity_sort_key
+from generator_io import iter_records
+
+
+class _ListWriter:
+    def __init__(self):
+        self.records = []
+        self.count = 0
+
+    def write(self, record):
+        self.records.append(record)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("run_records", [10, 100000])
+def test_feed_is_globally_time_ordered(tmp_path, small_dataset, run_records):
+    activities = list(iter_records(small_dataset["activities"]))
+    sink = _ListWriter()
+    with TimeOrderedWriter(sink, run_records, directory=str(tmp_path)) as feed:
+        for activity in activities:
+            feed.write(activity)
+    assert feed.count == len(activities)
+    assert sink.records == sorted(activities, key=activity_sort_key)
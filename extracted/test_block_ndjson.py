@@ -0,0 +1,37 @@
+import pytest
+
+from block_ndjson import BlockNDJSONReader, BlockNDJSONWriter
+from generator_io import iter_records
+
+
+@pytest.fixture(params=["gzip", "lzma"])
+def packed(request, tmp_path, small_dataset):
+    activities = list(iter_records(small_dataset["activities"]))
+    path = str(tmp_path / ("activities.ndjson.gz" if request.param == "gzip" else "activities.ndjson.xz"))
+    with BlockNDJSONWriter(path, codec=request.param, block_size=4096) as writer:
+        for activity in activities:
+            writer.write(activity)
+    return path, activities
+
+
+def test_round_trip(packed):
+    path, activities = packed
+    assert list(iter_records(path)) == activities
+    with BlockNDJSONReader(path) as reader:
+        assert len(reader) == len(activities)
+        assert len(reader.blocks) > 1
+        assert list(reader) == activities
+
+
+def test_random_access_reads_only_covering_blocks(packed):
+    path, activities = packed
+    with BlockNDJSONReader(path) as reader:
+        middle = activities[len(activities) // 2]
+        assert reader.get(middle["activity_id"]) == middle
+        assert reader.blocks_read <= 2
+        account_id = activities[-1]["account_id"]
+        assert reader.find(account_id) == [a for a in activities if a["account_id"] == account_id]
+        first, last = activities[10]["activity_id"], activities[40]["activity_id"]
+        assert list(reader.range(first, last)) == activities[10:41]
+        with pytest.raises(KeyError):
+            reader.get("ACT999999")
@@ -0,0 +1,49 @@
+import pickle
+
+import pytest
+
+from account_data_generator import company_domain
+from company_names import CAPACITY, TIER_SIZES, TIERS, CompanyNamer, KeyedPermutation, slot_words
+
+# Namer sizes just below, at and above the end of each of the first two tiers
+_BOUNDARIES = [TIER_SIZES[0], TIER_SIZES[0] + TIER_SIZES[1]]
+SIZES = [1, 2, 100] + [boundary + delta for boundary in _BOUNDARIES for delta in (-1, 0, 1)]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("seed", [0, 7, 12345])
+def test_names_and_domains_are_distinct(seed, size):
+    namer = CompanyNamer(seed, size)
+    names = [namer.name(index) for index in range(size)]
+    assert len(set(names)) == size
+    assert len({company_domain(name) for name in names}) == size
+
+
+def test_same_seed_gives_the_same_names():
+    size = TIER_SIZES[0] + 10
+    first, second, other = CompanyNamer(7, size), CompanyNamer(7, size), CompanyNamer(8, size)
+    names = [first.name(index) for index in range(size)]
+    assert [second.name(index) for index in range(size)] == names
+    assert [pickle.loads(pickle.dumps(first)).name(index) for index in range(size)] == names
+    assert [other.name(index) for index in range(size)] != names
+
+
+def test_slot_words_switches_tier_at_each_boundary():
+    end = 0
+    for tier, size in zip(TIERS, TIER_SIZES):
+        assert len(slot_words(end)) == len(tier)
+        end += size
+        assert len(slot_words(end - 1)) == len(tier)
+    assert end == CAPACITY
+    with pytest.raises(IndexError):
+        slot_words(CAPACITY)
+    with pytest.raises(ValueError):
+        CompanyNamer(1, CAPACITY + 1)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 15, 16, 17, 255, 256, 257, 1000])
+def test_keyed_permutation_is_a_bijection(size):
+    permutation = KeyedPermutation(size, "test")
+    assert sorted(permutation(index) for index in range(size)) == list(range(size))
+    with pytest.raises(IndexError):
+        permutation(size)
@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+from datetime import date
+
+import pytest
+
+import dataset_clock
+from dataset_clock import CHANGE_LOG, DatasetClock, init_checkpoint
+from generator_io import iter_records
+
+
+def _log(directory):
+    with open(os.path.join(directory, CHANGE_LOG)) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def checkpoint(tmp_path, small_dataset):
+    directory = str(tmp_path / "sim")
+    init_checkpoint(directory, small_dataset["prospects"], small_dataset["activities"], seed=3, start="2026-01-01")
+    return directory
+
+
+def test_advance_in_steps_matches_one_advance(tmp_path, checkpoint):
+    copy = str(tmp_path / "copy")
+    shutil.copytree(checkpoint, copy)
+    DatasetClock(checkpoint).advance(14)
+    for _ in range(2):
+        DatasetClock(copy).advance(7)
+    assert _log(copy) == _log(checkpoint)
+
+
+def test_interrupted_advance_resumes_from_last_completed_day(tmp_path, checkpoint, monkeypatch):
+    reference = str(tmp_path / "reference")
+    shutil.copytree(checkpoint, reference)
+    DatasetClock(reference).advance(14)
+
+    clock = DatasetClock(checkpoint)
+    start = clock.today
+    run_activities = DatasetClock._run_activities
+
+    def interrupt_on_day_4(self, day, emit, counts):
+        run_activities(self, day, emit, counts)
+        if day == start + 4:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(DatasetClock, "_run_activities", interrupt_on_day_4)
+    with pytest.raises(KeyboardInterrupt):
+        clock.advance(14)
+    monkeypatch.undo()
+
+    resumed = DatasetClock(checkpoint)
+    assert resumed.today == start + 3
+    resumed.advance(11)
+
+    log = _log(checkpoint)
+    assert log and log == _log(reference)
+    ids = [entry["id"] for entry in log if entry["op"] == "create"]
+    assert len(ids) == len(set(ids))
+    assert [entry["seq"] for entry in log] == list(range(1, len(log) + 1))
+
+
+def test_init_defaults_to_the_dataset_date(tmp_path, small_dataset):
+    activities = list(iter_records(small_dataset["activities"]))
+    latest = max([activity["date"] for activity in activities if activity["status"] != "Scheduled"]
+                 + [prospect["last_contact_date"] for prospect in iter_records(small_dataset["prospects"])])
+    directory = str(tmp_path / "sim")
+    init_checkpoint(directory, small_dataset["prospects"], small_dataset["activities"], seed=3)
+    clock = DatasetClock(directory)
+    assert clock.today == date.fromisoformat(latest).toordinal()
+
+    # Scheduled activities come due on their own dates rather than all on the first simulated day
+    scheduled = {activity["activity_id"]: activity["date"] for activity in activities
+                 if activity["status"] == "Scheduled"}
+    clock.advance(31)
+    due = {entry["id"]: entry["date"] for entry in _log(directory) if entry["id"] in scheduled}
+    assert due == scheduled
+
+
+def test_trim_log_drops_uncommitted_and_torn_lines(tmp_path):
+    path = str(tmp_path / "log.ndjson")
+    with open(path, "w") as f:
+        for seq in range(1, 6):
+            f.write(json.dumps({"seq": seq}) + "\n")
+        f.write('{"seq": 6, "da')
+    dataset_clock._trim_log(path, 3)
+    with open(path) as f:
+        assert [json.loads(line)["seq"] for line in f] == [1, 2, 3]
@@ -0,0 +1,75 @@
+import os
+import random
+import re
+import subprocess
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+from generator_providers import DAYS_AHEAD, DAYS_BACK, DateTable, day_label, phone_number, zip_code
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEED = 7
+REFERENCE_DATE = "2026-01-01"
+PHONE = re.compile(r"\+[1-9][1-9]\d\d[1-9]\d\d[1-9]\d{3}")
+ZIP = re.compile(r"[1-9]\d{4}")
+
+
+def _generate(directory, *args):
+    os.makedirs(directory, exist_ok=True)
+    subprocess.run([sys.executable, os.path.join(HERE, "generate_dataset.py"), "--count", "60", "--seed", str(SEED),
+                    "--reference-date", REFERENCE_DATE, "--shards", "3", "--shard-size", "10", *args],
+                   cwd=directory, check=True, capture_output=True)
+    files = {}
+    for name in ("accounts", "prospects", "activities"):
+        with open(os.path.join(directory, f"{name}.ndjson"), "rb") as f:
+            files[name] = f.read()
+    return files
+
+
+def test_generate_dataset_is_byte_identical_across_runs_and_workers(tmp_path):
+    first = _generate(str(tmp_path / "first"), "--workers", "1")
+    assert all(first.values())
+    assert _generate(str(tmp_path / "again"), "--workers", "1") == first
+    assert _generate(str(tmp_path / "workers"), "--workers", "2") == first
+
+
+# A stand-in RNG whose draws are fixed, to reach the ends of each digit group
+class _FixedDraw:
+    def __init__(self, value):
+        self.value = value
+
+    def randrange(self, stop):
+        return min(self.value, stop - 1)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42])
+def test_phone_numbers_and_zip_codes_keep_their_formats(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        assert PHONE.fullmatch(phone_number(rng))
+        assert ZIP.fullmatch(zip_code(rng))
+    # Zip codes are the same draw as randint(10000, 99999)
+    rng, reference = random.Random(seed), random.Random(seed)
+    assert [zip_code(rng) for _ in range(100)] == [str(reference.randint(10000, 99999)) for _ in range(100)]
+
+
+def test_phone_number_and_zip_code_extremes():
+    assert phone_number(_FixedDraw(0)) == "+11001001000"
+    assert phone_number(_FixedDraw(sys.maxsize)) == "+99999999999"
+    assert zip_code(_FixedDraw(0)) == "10000"
+    assert zip_code(_FixedDraw(sys.maxsize)) == "99999"
+
+
+def test_date_table_falls_back_outside_its_window():
+    reference = date(2026, 1, 1)
+    table = DateTable(reference)
+    for offset in (-DAYS_BACK - 400, -DAYS_BACK - 1, -DAYS_BACK, -1, 0, 1, DAYS_AHEAD, DAYS_AHEAD + 1, 10000):
+        assert table.label(offset) == (reference + timedelta(days=offset)).isoformat()
+
+
+def test_day_label_follows_the_pinned_reference_date(pinned_reference_date):
+    assert day_label(0) == pinned_reference_date
+    assert day_label(-DAYS_BACK - 1) == (date.fromisoformat(pinned_reference_date)
+                                         - timedelta(days=DAYS_BACK + 1)).isoformat()
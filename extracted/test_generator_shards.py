@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEED = 7
+REFERENCE_DATE = "2026-01-01"
+
+
+def _run(script, directory, *args):
+    os.makedirs(directory, exist_ok=True)
+    subprocess.run([sys.executable, os.path.join(HERE, script), "--seed", str(SEED), "--format", "ndjson",
+                    "--reference-date", REFERENCE_DATE, *args], cwd=directory, check=True, capture_output=True)
+
+
+def _read(directory, name):
+    with open(os.path.join(directory, name), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_output_is_identical_across_worker_counts(tmp_path, workers):
+    single, multi = str(tmp_path / "single"), str(tmp_path / "multi")
+    _run("account_data_generator.py", single, "--count", "60", "--shards", "4", "--workers", "1")
+    _run("account_data_generator.py", multi, "--count", "60", "--shards", "4", "--workers", str(workers))
+    assert _read(single, "accounts.ndjson") == _read(multi, "accounts.ndjson")
+
+    accounts = os.path.join(single, "accounts.ndjson")
+    _run("prospect_activity_generator.py", single, "--accounts", accounts, "--shard-size", "10", "--workers", "1")
+    _run("prospect_activity_generator.py", multi, "--accounts", accounts, "--shard-size", "10",
+         "--workers", str(workers))
+    for name in ("prospects.ndjson", "activities.ndjson"):
+        assert _read(single, name) == _read(multi, name)
@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from generator_io import NDJSONWriter, iter_records
+from lazy_dataset import LazyDataset, write_dataset
+
+
+@pytest.fixture
+def dumped(tmp_path, pinned_reference_date):
+    dataset = LazyDataset(25, seed=11)
+    paths = [str(tmp_path / f"{name}.ndjson") for name in ("accounts", "prospects", "activities")]
+    with NDJSONWriter(paths[0]) as accounts, NDJSONWriter(paths[1]) as prospects, \
+            NDJSONWriter(paths[2]) as activities:
+        write_dataset(dataset, accounts, prospects, activities)
+    return dataset, [list(iter_records(path)) for path in paths]
+
+
+def test_dump_matches_random_access(dumped):
+    dataset, (accounts, prospects, activities) = dumped
+    assert len(accounts) == 25
+    for account_id in random.Random(1).sample([account["account_id"] for account in accounts], 8):
+        record = dataset.get(account_id)
+        assert record["account"] in accounts
+        assert record["prospects"] == [p for p in prospects if p["account_id"] == account_id]
+        assert record["activities"] == [a for a in activities if a["account_id"] == account_id]
+
+
+def test_single_records_match_the_dump(dumped):
+    dataset, (_, prospects, activities) = dumped
+    assert dataset.get_prospect(prospects[-1]["prospect_id"]) == prospects[-1]
+    assert dataset.get_activity(activities[len(activities) // 2]["activity_id"]) == activities[len(activities) // 2]
+    assert dataset[3:5][1] == dataset.account(4)
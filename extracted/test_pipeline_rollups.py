@@ -0,0 +1,146 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from generator_io import iter_records
+from pipeline_rollups import CLOSED_STATUSES, CLOSED_WON, PipelineRollups
+from sap_odata_server import SALES_CYCLE_DAYS
+
+
+@pytest.fixture(scope="module")
+def loaded(small_dataset):
+    rollups = PipelineRollups()
+    rollups.add_accounts(iter_records(small_dataset["accounts"]))
+    rollups.add_prospects(iter_records(small_dataset["prospects"]))
+    rollups.add_activities(iter_records(small_dataset["activities"]))
+
+    industry = {account["account_id"]: account["industry"] for account in iter_records(small_dataset["accounts"])}
+    prospects = []
+    for prospect in iter_records(small_dataset["prospects"]):
+        closing = date.fromisoformat(prospect["created_date"]) + timedelta(days=SALES_CYCLE_DAYS)
+        prospects.append({**prospect, "industry": industry.get(prospect["account_id"]),
+                          "close_month": closing.isoformat()[:7]})
+    activities = list(iter_records(small_dataset["activities"]))
+    return rollups, prospects, activities
+
+
+# Function to sum count/value/weighted over prospects in plain Python, keyed by the group_by values
+def _pipeline_scan(prospects, group_by, start=None, end=None, **filters):
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    for prospect in prospects:
+        if start and prospect["close_month"] < start or end and prospect["close_month"] > end:
+            continue
+        if any(prospect[name] != value for name, value in filters.items()):
+            continue
+        total = totals[tuple(prospect[name] for name in group_by)]
+        total[0] += 1
+        total[1] += prospect["estimated_value"]
+        total[2] += prospect["estimated_value"] * prospect["probability"] / 100
+    return dict(totals)
+
+
+def _check_pipeline(results, expected, group_by):
+    assert len(results) == len(expected)
+    for row in results:
+        assert list(row)[:len(group_by)] == list(group_by)
+        count, value, weighted = expected[tuple(row[name] for name in group_by)]
+        assert row["count"] == count
+        assert row["value"] == pytest.approx(value, abs=0.01)
+        assert row["weighted"] == pytest.approx(weighted, abs=0.01)
+
+
+def test_pipeline_totals_without_groups(loaded):
+    rollups, prospects, _ = loaded
+    results = rollups.pipeline(())
+    assert len(results) == 1 and set(results[0]) == {"count", "value", "weighted"}
+    _check_pipeline(results, _pipeline_scan(prospects, ()), ())
+
+
+@pytest.mark.parametrize("group_by", [("status",), ("industry", "status"), ("status", "industry"),
+                                      ("close_month", "assigned_to", "source")])
+def test_pipeline_matches_a_scan(loaded, group_by):
+    rollups, prospects, _ = loaded
+    _check_pipeline(rollups.pipeline(group_by), _pipeline_scan(prospects, group_by), group_by)
+
+
+def test_pipeline_with_filter_and_close_month_range(loaded):
+    rollups, prospects, _ = loaded
+    months = sorted({prospect["close_month"] for prospect in prospects})
+    start, end = months[1], months[-2]
+    industry = prospects[0]["industry"]
+    results = rollups.pipeline(("assigned_to", "close_month"), start, end, industry=industry)
+    expected = _pipeline_scan(prospects, ("assigned_to", "close_month"), start, end, industry=industry)
+    _check_pipeline(results, expected, ("assigned_to", "close_month"))
+    assert all(start <= row["close_month"] <= end for row in results)
+
+
+def test_pipeline_open_only_leaves_out_closed(loaded):
+    rollups, prospects, _ = loaded
+    open_prospects = [prospect for prospect in prospects if prospect["status"] not in CLOSED_STATUSES]
+    _check_pipeline(rollups.pipeline(("status",), open_only=True), _pipeline_scan(open_prospects, ("status",)),
+                    ("status",))
+
+
+def test_forecast_matches_a_scan(loaded):
+    rollups, prospects, _ = loaded
+    expected = defaultdict(lambda: {"committed": 0.0, "weighted": 0.0, "best_case": 0.0, "open_count": 0})
+    for prospect in prospects:
+        period = expected[(prospect["close_month"], prospect["assigned_to"])]
+        if prospect["status"] == CLOSED_WON:
+            period["committed"] += prospect["estimated_value"]
+            period["best_case"] += prospect["estimated_value"]
+        elif prospect["status"] not in CLOSED_STATUSES:
+            period["weighted"] += prospect["estimated_value"] * prospect["probability"] / 100
+            period["best_case"] += prospect["estimated_value"]
+            period["open_count"] += 1
+
+    results = rollups.forecast(group_by=("assigned_to",))
+    assert len(results) == len(expected)
+    for row in results:
+        assert list(row)[:2] == ["close_month", "assigned_to"]
+        period = expected[(row["close_month"], row["assigned_to"])]
+        assert row["open_count"] == period["open_count"]
+        for measure in ("committed", "weighted", "best_case"):
+            assert row[measure] == pytest.approx(period[measure], abs=0.01)
+
+
+# Function to count activities in plain Python, keyed by the group_by values
+def _activity_scan(activities, group_by, start=None, end=None, **filters):
+    counts = defaultdict(int)
+    for activity in activities:
+        if start and activity["date"] < start or end and activity["date"] > end:
+            continue
+        if any(activity[name] != value for name, value in filters.items()):
+            continue
+        counts[tuple(activity[name] for name in group_by)] += 1
+    return dict(counts)
+
+
+@pytest.mark.parametrize("group_by", [(), ("type",), ("outcome", "type"), ("type", "status", "outcome")])
+def test_activity_counts_match_a_scan(loaded, group_by):
+    rollups, _, activities = loaded
+    results = rollups.activity_counts(group_by)
+    assert {tuple(row[name] for name in group_by): row["count"] for row in results} == \
+        _activity_scan(activities, group_by)
+    assert all(list(row)[:len(group_by)] == list(group_by) for row in results)
+
+
+def test_activity_counts_with_filter_date_range_and_windows(loaded):
+    rollups, _, activities = loaded
+    days = sorted({activity["date"] for activity in activities})
+    start, end = days[len(days) // 4], days[3 * len(days) // 4]
+    activity_type = activities[0]["type"]
+    results = rollups.activity_counts(("outcome",), start, end, type=activity_type)
+    assert {row["outcome"]: row["count"] for row in results} == \
+        {key[0]: count for key, count in _activity_scan(activities, ("outcome",), start, end,
+                                                        type=activity_type).items()}
+
+    windows = rollups.activity_counts(("status",), start, end, window_days=7)
+    first = date.fromisoformat(start)
+    expected = defaultdict(int)
+    for activity in activities:
+        if start <= activity["date"] <= end:
+            offset = (date.fromisoformat(activity["date"]) - first).days // 7 * 7
+            expected[(activity["status"], (first + timedelta(days=offset)).isoformat())] += 1
+    assert {(row["status"], row["date"]): row["count"] for row in windows} == dict(expected)
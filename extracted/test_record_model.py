@@ -0,0 +1,34 @@
+import pytest
+
+from generator_io import iter_records
+from record_model import Account, Activity, Prospect, RecordTable
+
+
+@pytest.mark.parametrize("kind, record_class", [("accounts", Account), ("prospects", Prospect),
+                                                ("activities", Activity)])
+def test_records_round_trip(small_dataset, kind, record_class):
+    for values in iter_records(small_dataset[kind]):
+        assert record_class.from_dict(values).to_dict() == values
+
+
+@pytest.mark.parametrize("kind, record_class", [("prospects", Prospect), ("activities", Activity)])
+def test_table_round_trip(small_dataset, kind, record_class):
+    records = list(iter_records(small_dataset[kind]))
+    table = RecordTable(record_class)
+    table.extend(records)
+    assert len(table) == len(records)
+    assert list(table) == records
+    assert table.get(len(records) - 1, "status") == records[-1]["status"]
+
+
+def test_failed_append_leaves_table_unchanged(small_dataset):
+    activities = list(iter_records(small_dataset["activities"]))[:3]
+    table = RecordTable(Activity)
+    table.append(activities[0])
+    with pytest.raises(ValueError):
+        table.append(dict(activities[1], account_id="not an id"))
+    with pytest.raises(TypeError):
+        table.append(dict(activities[1], duration_minutes="thirty"))
+    table.append(activities[1])
+    table.append(activities[2])
+    assert list(table) == activities
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import re
+
+from replay_notes import NoteReplay, export_notes, interleave, iter_account_notes, iter_activity_notes, note_id
+
+
+def test_export_uses_replayed_note_ids(tmp_path, small_dataset):
+    notes = list(interleave(iter_account_notes(small_dataset["accounts"]),
+                            iter_activity_notes(small_dataset["activities"])))
+    path = str(tmp_path / "notes.ndjson")
+    assert export_notes(iter(notes), path) == len(notes)
+    with open(path) as f:
+        documents = [json.loads(line) for line in f]
+    assert [document["_id"]["$oid"] for document in documents] == [note["noteId"] for note in notes]
+    assert len({note["noteId"] for note in notes}) == len(notes)
+    for document in documents:
+        assert all(re.fullmatch(r"[0-9a-f]{24}", document[key]["$oid"]) for key in ("_id", "accountId", "userId"))
+        assert document["originalContent"]
+
+
+async def _fake_server(known):
+    """A stand-in for the note API: LIFECYCLE_END for notes in `known`, ERROR for the rest."""
+    streams = {}
+
+    async def handle(reader, writer):
+        request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        method, path = request.split()[:2]
+        if method == "GET":
+            thread_id = path.rsplit("/", 1)[1]
+            queue = streams[thread_id] = asyncio.Queue()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n\r\n")
+            writer.write(b'data: {"type": "HEARTBEAT"}\n\n')
+            while True:
+                event = await queue.get()
+                writer.write(f"data: {json.dumps(event)}\n\n".encode())
+                if event["type"] != "RUN_STARTED":
+                    break
+        else:
+            length = int(re.search(r"content-length: (\d+)", request, re.I).group(1))
+            body = json.loads(await reader.readexactly(length))
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+            queue = streams[body["threadId"]]
+            queue.put_nowait({"type": "RUN_STARTED"})
+            queue.put_nowait({"type": "LIFECYCLE_END" if body["noteId"] in known else "ERROR"})
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_error_runs_are_counted_apart_from_completions():
+    notes = [{"noteId": note_id(f"ACC{number:04d}", 0), "content": "note"} for number in range(1, 11)]
+    known = {note["noteId"] for note in notes[:3]}
+
+    async def run():
+        server = await _fake_server(known)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            replay = NoteReplay(f"http://127.0.0.1:{port}", concurrency=4, timeout=5)
+            return await replay.replay(iter(notes), report_interval=60)
+
+    total, _ = asyncio.run(run())
+    assert (total.sent, total.completed, total.errors, total.failed, total.timeouts) == (10, 3, 7, 0, 0)
+    assert total.completion.total == 3
+    assert total.first_event.total == 10
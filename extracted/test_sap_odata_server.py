@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+
+import sap_odata_server
+from generator_io import iter_records
+from sap_odata_server import API_PREFIX, FaultProfile, ODataError, ODataServer, load_entity_sets
+
+BASE_URL = "http://127.0.0.1:8765/api/v2/opportunities"
+
+
+@pytest.fixture(scope="module")
+def entity_sets(small_dataset):
+    return load_entity_sets(small_dataset["accounts"], small_dataset["prospects"])
+
+
+def test_opportunities_filter_by_account_country(entity_sets, small_dataset):
+    countries = {account["account_id"]: account["address"]["country"]
+                 for account in iter_records(small_dataset["accounts"])}
+    prospects = list(iter_records(small_dataset["prospects"]))
+    country = countries[prospects[0]["account_id"]]
+    response = entity_sets["opportunities"].query(
+        {"$filter": f"Country eq '{country}' and LifeCycleStatus ne 'Closed Lost'", "$top": "1000"}, BASE_URL)
+    expected = [p["prospect_id"] for p in prospects
+                if countries[p["account_id"]] == country and p["status"] != "Closed Lost"]
+    assert [entity["OpportunityID"] for entity in response["value"]] == expected
+
+
+def test_unknown_property_is_rejected(entity_sets):
+    with pytest.raises(ODataError) as error:
+        entity_sets["opportunities"].query({"$filter": "Region eq 'x'"}, BASE_URL)
+    assert error.value.status == 400
+
+
+def _entities(entity_sets, name):
+    return entity_sets[name].entities
+
+
+@pytest.mark.parametrize("orderby, top, skip", [
+    ("ExpectedRevenueAmount desc", 5, 0),
+    ("ExpectedRevenueAmount desc", 7, 5),
+    ("LifeCycleStatus, ExpectedRevenueAmount desc", 10, 3),
+    ("OwnerID desc, CreatedOn, OpportunityID", 1000, 12),
+])
+def test_orderby_top_skip_and_select_match_a_sort(entity_sets, orderby, top, skip):
+    response = entity_sets["opportunities"].query(
+        {"$orderby": orderby, "$top": str(top), "$skip": str(skip), "$select": "OpportunityID,ExpectedRevenueAmount",
+         "$count": "true"}, BASE_URL)
+    expected = list(_entities(entity_sets, "opportunities"))
+    for term in reversed(orderby.split(",")):
+        field, *direction = term.split()
+        expected.sort(key=lambda entity: entity[field], reverse=direction == ["desc"])
+    assert response["@odata.count"] == len(expected)
+    assert response["value"] == [{"OpportunityID": entity["OpportunityID"],
+                                  "ExpectedRevenueAmount": entity["ExpectedRevenueAmount"]}
+                                 for entity in expected[skip:skip + top]]
+
+
+def test_next_links_walk_every_page(entity_sets, monkeypatch):
+    monkeypatch.setattr(sap_odata_server, "MAX_PAGE_SIZE", 6)
+    server = ODataServer(entity_sets)
+    target = f"{API_PREFIX}/opportunities?$orderby=ProbabilityPercent desc&$top=1000&$select=OpportunityID"
+    pages = []
+    while target:
+        status, payload, _ = asyncio.run(server.handle("GET", target))
+        assert status == 200
+        pages.append([entity["OpportunityID"] for entity in payload["value"]])
+        target = payload.get("@odata.nextLink")
+    expected = sorted(_entities(entity_sets, "opportunities"), key=lambda entity: entity["ProbabilityPercent"],
+                      reverse=True)
+    assert all(len(page) == 6 for page in pages[:-1])
+    assert sum(pages, []) == [entity["OpportunityID"] for entity in expected]
+
+
+def test_contains_and_industry_eq_match_a_scan(entity_sets):
+    accounts = _entities(entity_sets, "accounts")
+    names = [entity["AccountName"] for entity in accounts if "'" not in entity["AccountName"]]
+    needles = {names[0][:2], names[0][1:6], names[1].split()[0], names[2][-4:], "zzz"}
+    for needle in needles:
+        for name in ("accounts", "opportunities"):
+            response = entity_sets[name].query({"$filter": f"contains(AccountName,'{needle}')"}, BASE_URL)
+            expected = [entity for entity in _entities(entity_sets, name)
+                        if entity["AccountName"] is not None and needle in entity["AccountName"]]
+            assert response["value"] == expected, needle
+
+    for industry in {entity["Industry"] for entity in accounts}:
+        for name in ("accounts", "opportunities"):
+            response = entity_sets[name].query(
+                {"$filter": f"Industry eq '{industry}' and contains(AccountName,'{names[0][:3]}')"}, BASE_URL)
+            expected = [entity for entity in _entities(entity_sets, name)
+                        if entity["Industry"] == industry and names[0][:3] in (entity["AccountName"] or "")]
+            assert response["value"] == expected, industry
+            response = entity_sets[name].query({"$filter": f"Industry eq '{industry}'"}, BASE_URL)
+            assert response["value"] == [entity for entity in _entities(entity_sets, name)
+                                         if entity["Industry"] == industry]
+
+
+def test_error_rate_one_returns_the_configured_status(entity_sets):
+    server = ODataServer(entity_sets, FaultProfile(error_rate=1.0, error_status=502), seed=1)
+    for _ in range(5):
+        status, payload, _ = asyncio.run(server.handle("GET", f"{API_PREFIX}/accounts?$top=1"))
+        assert status == 502
+        assert payload["error"]["code"] == "502"
+    assert server.stats["502"] == 5
+
+
+def test_rate_limit_answers_429_once_the_burst_is_spent(entity_sets):
+    server = ODataServer(entity_sets, FaultProfile(rate_limit=0.01, burst=3), seed=1)
+
+    async def run():
+        return await asyncio.gather(*(server.handle("GET", f"{API_PREFIX}/accounts?$top=1") for _ in range(5)))
+
+    responses = asyncio.run(run())
+    assert [status for status, _, _ in responses] == [200, 200, 200, 429, 429]
+    assert all(int(headers["Retry-After"]) >= 1 for _, _, headers in responses[3:])
+
+
+def test_concurrent_requests_with_latency(entity_sets):
+    server = ODataServer(entity_sets, FaultProfile(latency_ms=100), seed=1)
+    targets = [f"{API_PREFIX}/opportunities?$top=3&$skip={skip}&$orderby=OpportunityID" for skip in range(20)]
+
+    async def run():
+        return await asyncio.gather(*(server.handle("GET", target) for target in targets))
+
+    started = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    # Each response waits the latency, but the requests wait at the same time
+    assert 0.1 <= elapsed < 1.0
+    opportunities = sorted(_entities(entity_sets, "opportunities"), key=lambda entity: entity["OpportunityID"])
+    for skip, (status, payload, _) in enumerate(responses):
+        assert status == 200
+        assert payload["value"] == opportunities[skip:skip + 3]
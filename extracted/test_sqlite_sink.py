@@ -0,0 +1,31 @@
+import sqlite3
+
+import pytest
+
+from sqlite_sink import SQLiteSink, load_files
+
+
+def _counts(path):
+    with sqlite3.connect(path) as conn:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("accounts", "contacts", "notes", "prospects", "activities")}
+
+
+def test_loading_twice_replaces_the_database(tmp_path, small_dataset):
+    path = str(tmp_path / "crm.db")
+    first = load_files(path, small_dataset["accounts"], small_dataset["prospects"], small_dataset["activities"])
+    counts = _counts(path)
+    assert counts["accounts"] == first.accounts.count == 40
+    assert counts["activities"] == first.activities.count
+
+    load_files(path, small_dataset["accounts"], small_dataset["prospects"], small_dataset["activities"])
+    assert _counts(path) == counts
+
+
+def test_failed_load_skips_index_build(tmp_path):
+    path = str(tmp_path / "crm.db")
+    with pytest.raises(RuntimeError):
+        with SQLiteSink(path):
+            raise RuntimeError("generation failed")
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'").fetchone()[0] == 0
@@ -0,0 +1,77 @@
+from collections import Counter
+
+import pytest
+
+from generator_io import iter_records
+from text_index import TextIndex, tokenize
+
+
+def _documents(small_dataset):
+    documents = []
+    for account in iter_records(small_dataset["accounts"]):
+        for note in account["notes"]:
+            documents.append((note["note_id"], note["author"], [note["content"]]))
+    for activity in iter_records(small_dataset["activities"]):
+        texts = [activity["description"], activity["notes"]]
+        documents.append((activity["activity_id"], activity["assigned_to"], texts))
+    return documents
+
+
+# Function to answer a query by scanning every document: all words, phrases within one field
+def _scan(documents, phrases, author=None):
+    def has(fields, phrase):
+        for text in fields:
+            tokens = tokenize(text)
+            if any(tokens[i:i + len(phrase)] == phrase for i in range(len(tokens))):
+                return True
+        return False
+
+    return sorted(doc_id for doc_id, doc_author, fields in documents
+                  if (author is None or doc_author == author) and all(has(fields, phrase) for phrase in phrases))
+
+
+def _search(index, query, **filters):
+    hits, total = index.search(query, limit=100000, **filters)
+    assert total == len(hits)
+    return sorted(hit["id"] for hit in hits)
+
+
+@pytest.fixture
+def queries(small_dataset):
+    documents = _documents(small_dataset)
+    words = Counter(token for _, _, fields in documents for text in fields for token in tokenize(text))
+    common = [word for word, _ in words.most_common(40)][::8]
+    first_note = tokenize(documents[0][2][0])
+    author = documents[0][1]
+    cases = [(word, [[word]], None) for word in common]
+    cases.append((f"{common[0]} {common[-1]}", [[common[0]], [common[-1]]], None))
+    cases.append((f'"{" ".join(first_note[:3])}"', [first_note[:3]], None))
+    cases.append((common[1], [[common[1]]], author))
+    return documents, cases
+
+
+def _check(index, documents, cases):
+    for query, phrases, author in cases:
+        filters = {"author": author} if author else {}
+        assert _search(index, query, **filters) == _scan(documents, phrases, author), query
+
+
+def test_search_matches_a_scan_across_segments_and_after_compact(tmp_path, small_dataset, queries):
+    documents, cases = queries
+    directory = str(tmp_path / "index")
+    with TextIndex(directory) as index:
+        index.add_accounts(iter_records(small_dataset["accounts"]))
+        index.commit()
+        index.add_activities(iter_records(small_dataset["activities"]))
+        index.commit()
+        assert len(index.segments) == 2
+        assert index.doc_count == len(documents)
+        _check(index, documents, cases)
+
+        index.compact()
+        assert len(index.segments) == 1
+        assert index.doc_count == len(documents)
+        _check(index, documents, cases)
+
+    with TextIndex(directory) as reopened:
+        _check(reopened, documents, cases)
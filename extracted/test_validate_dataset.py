@@ -0,0 +1,51 @@
+import copy
+
+from generator_io import NDJSONWriter, iter_records
+from validate_dataset import validate_files
+
+
+def _write(path, records):
+    with NDJSONWriter(str(path)) as writer:
+        for record in records:
+            writer.write(record)
+    return str(path)
+
+
+def test_generated_dataset_is_clean(small_dataset):
+    validator = validate_files(small_dataset["accounts"], small_dataset["prospects"], small_dataset["activities"])
+    assert not validator.violations
+    assert validator.records["accounts"] == 40
+
+
+def test_injected_violations_are_reported(tmp_path, small_dataset):
+    accounts = list(iter_records(small_dataset["accounts"]))
+    prospects = list(iter_records(small_dataset["prospects"]))
+    activities = list(iter_records(small_dataset["activities"]))
+
+    # One violation of each kind
+    accounts.append(copy.deepcopy(accounts[0]))
+    noted = next(account for account in accounts if account["notes"])
+    noted["notes"][0]["related_contact"] = "00000000-0000-0000-0000-000000000000"
+    accounts.append(dict(accounts[1], account_id="ACCOUNT-X"))
+    prospects[0] = dict(prospects[0], account_id="ACC9999")
+    prospects.append(dict(prospects[1]))
+    activities[0] = dict(activities[0], prospect_id="PROS9999")
+    other = next(a for a in activities if a["account_id"] != activities[-1]["account_id"])
+    activities[-1] = dict(activities[-1], account_id=other["account_id"])
+    activities.append(dict(activities[2]))
+
+    validator = validate_files(_write(tmp_path / "accounts.ndjson", accounts),
+                               _write(tmp_path / "prospects.ndjson", prospects),
+                               _write(tmp_path / "activities.ndjson", activities))
+    assert dict(validator.violations.counts) == {
+        "duplicate_account_id": 1,
+        "note_contact_not_on_account": 1,
+        "malformed_account_id": 1,
+        "prospect_account_missing": 1,
+        "duplicate_prospect_id": 1,
+        "activity_prospect_missing": 1,
+        "activity_account_mismatch": 1,
+        "duplicate_activity_id": 1,
+    }
+    assert validator.violations.samples["activity_prospect_missing"] == [
+        f"{activities[0]['activity_id']}: prospect PROS9999"]
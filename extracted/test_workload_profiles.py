@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from account_data_generator import generate_accounts
+from workload_profiles import SkewSummary, WorkloadProfile, load_profile
+
+
+def test_zero_contact_range_is_rejected():
+    with pytest.raises(ValueError, match="contacts_per_account"):
+        WorkloadProfile("custom", {"contacts_per_account": {"range": [0, 3]}})
+
+
+def test_zero_note_range_is_allowed():
+    profile = WorkloadProfile("custom", {"contacts_per_account": {"range": [1, 1]},
+                                         "notes_per_account": {"range": [0, 0]}})
+    accounts = list(generate_accounts(20, rng=random.Random(1), profile=profile))
+    assert all(len(account["contacts"]) == 1 and not account["notes"] for account in accounts)
+
+
+@pytest.mark.parametrize("name", ["uniform", "zipf", "lognormal", "powerlaw"])
+def test_presets_generate(name):
+    skew = SkewSummary()
+    accounts = list(skew.observe_accounts(generate_accounts(50, rng=random.Random(2), profile=load_profile(name))))
+    assert all(account["contacts"] for account in accounts)
+    assert skew.to_dict()["accounts"] == 50
+
+
+def test_empty_summary_reports_no_accounts():
+    assert SkewSummary().to_dict()["accounts"] == 0
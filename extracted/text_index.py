@@ -0,0 +1,588 @@
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import numpy as np
+
+from generator_io import iter_records
+
+# Incremental full-text index over account notes and activity text.
+#
+# Every note (content) and activity (description + notes) is a document,
+# tokenized into lowercase words with their positions. Documents carry the
+# fields queries filter on: account, prospect, author (note author / activity
+# assigned_to) and date, plus the note_id / activity_id a hit points back to.
+#
+# The index is a directory of immutable segment files plus manifest.json.
+# Adding records builds a new segment in memory and commit() writes it out and
+# swaps the manifest, so appends never rewrite existing data; compact() merges
+# all segments into one when there are many. A segment file is:
+#
+#   magic | header length (uint32 LE) | JSON header | 8-byte aligned arrays
+#
+# with per-document columns (kind, account/prospect/activity numbers, note
+# UUID bytes, author code, day number), a sorted term table (UTF-8 blob +
+# offsets, binary searched in place) and one posting list per term. Posting
+# lists are varint-coded: documents as gaps, then each document's term count
+# and position gaps, in blocks of BLOCK_DOCS documents behind a small skip
+# table, so an AND query decodes the rarest term and then only the blocks of
+# the other terms that can contain its documents. Segments are opened with
+# mmap and read in place, so a query process starts without loading anything.
+#
+#   python text_index.py build --index notes.idx --accounts accounts.ndjson --activities activities.ndjson
+#   python text_index.py search --index notes.idx '"quarterly review" expansion' --author "Sam Williams"
+#   python text_index.py search --index notes.idx pricing --account ACC0042 --start 2026-01-01
+
+MAGIC = b"TXTSEG1\0"
+MANIFEST = "manifest.json"
+INDEX_FORMAT = "text-index/1"
+BLOCK_DOCS = 128
+SEGMENT_DOCS = 200000  # documents buffered before add_* commits a segment on its own
+FIELD_GAP = 16  # position gap between fields, so phrases never span two fields
+KINDS = ["note", "activity"]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_COLUMN_DTYPES = {
+    "kind": "u1", "account": "<u4", "prospect": "<u4", "activity": "<u4", "note": "V16", "author": "<u2",
+    "day": "<i4", "term_offsets": "<u8", "terms": "u1", "postings_offsets": "<u8", "df": "<u4", "postings": "u1",
+}
+
+
+# Function to split text into lowercase word tokens
+def tokenize(text):
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+# Function to parse a query into phrases (lists of tokens): quoted text is one phrase, other words are one each
+def parse_query(query):
+    phrases = []
+    for quoted, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        if quoted:
+            tokens = tokenize(quoted)
+            if tokens:
+                phrases.append(tokens)
+        else:
+            phrases.extend([token] for token in tokenize(word))
+    return phrases
+
+
+def _encode_varints(values, out):
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def _decode_varints(data):
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def _read_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+# Function to encode one term's postings: skip table (block count, then last-doc gap and byte length
+# per block) followed by the blocks
+def _encode_postings(docs, positions):
+    blocks = []
+    block_last = []
+    previous = -1
+    for start in range(0, len(docs), BLOCK_DOCS):
+        values = []
+        for doc, doc_positions in zip(docs[start:start + BLOCK_DOCS], positions[start:start + BLOCK_DOCS]):
+            values.append(doc - previous)
+            previous = doc
+            values.append(len(doc_positions))
+            last = -1
+            for position in doc_positions:
+                values.append(position - last)
+                last = position
+        block = bytearray()
+        _encode_varints(values, block)
+        blocks.append(block)
+        block_last.append(previous)
+    header = bytearray()
+    _encode_varints([len(blocks)], header)
+    last_doc = -1
+    for last, block in zip(block_last, blocks):
+        _encode_varints([last - last_doc, len(block)], header)
+        last_doc = last
+    return bytes(header) + b"".join(blocks)
+
+
+class _PostingList:
+    """One term's postings inside a mapped segment; blocks are decoded on demand."""
+
+    def __init__(self, data, start):
+        count, position = _read_varint(data, start)
+        self.data = data
+        self.block_last = []
+        self.block_spans = []
+        last_doc = -1
+        spans = []
+        for _ in range(count):
+            gap, position = _read_varint(data, position)
+            length, position = _read_varint(data, position)
+            last_doc += gap
+            self.block_last.append(last_doc)
+            spans.append(length)
+        for length in spans:
+            self.block_spans.append((position, position + length))
+            position += length
+
+    # Function to decode block i into (doc, positions) pairs
+    def block(self, i):
+        values = _decode_varints(self.data[slice(*self.block_spans[i])])
+        doc = self.block_last[i - 1] if i else -1
+        pairs = []
+        j = 0
+        while j < len(values):
+            doc += values[j]
+            count = values[j + 1]
+            positions = []
+            position = -1
+            for gap in values[j + 2:j + 2 + count]:
+                position += gap
+                positions.append(position)
+            pairs.append((doc, positions))
+            j += 2 + count
+        return pairs
+
+    # Function to get {doc: positions} for every document, or only for `candidates` (a sorted list),
+    # decoding just the blocks whose doc range contains a candidate
+    def lookup(self, candidates=None):
+        found = {}
+        for i, last in enumerate(self.block_last):
+            if candidates is not None:
+                first = self.block_last[i - 1] + 1 if i else 0
+                if bisect_left(candidates, first) == bisect_right(candidates, last):
+                    continue
+            found.update(self.block(i))
+        if candidates is not None:
+            wanted = set(candidates)
+            found = {doc: positions for doc, positions in found.items() if doc in wanted}
+        return found
+
+
+class _Segment:
+    """A memory-mapped segment file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a text index segment")
+        (header_length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mm[header_start:header_start + header_length])
+        data_start = (header_start + header_length + 7) & ~7
+        self.doc_count = header["docs"]
+        self.term_count = header["terms"]
+        self.authors = header["authors"]
+        self._author_codes = {author: code for code, author in enumerate(self.authors)}
+        self.columns = {}
+        for entry in header["columns"]:
+            dtype = np.dtype(_COLUMN_DTYPES[entry["name"]])
+            self.columns[entry["name"]] = np.frombuffer(self._mm, dtype=dtype, count=entry["size"] // dtype.itemsize,
+                                                        offset=data_start + entry["offset"])
+        self._postings_start = data_start + next(entry["offset"] for entry in header["columns"]
+                                                 if entry["name"] == "postings")
+
+    def close(self):
+        self.columns.clear()
+        self._mm.close()
+        self._file.close()
+
+    def _term(self, i):
+        offsets = self.columns["term_offsets"]
+        return self.columns["terms"][offsets[i]:offsets[i + 1]].tobytes()
+
+    # Function to find a term's index in the sorted term table (None if absent)
+    def term_index(self, term):
+        key = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.term_count and self._term(low) == key else None
+
+    def postings(self, i):
+        return _PostingList(self._mm, self._postings_start + int(self.columns["postings_offsets"][i]))
+
+    # Function to iterate (term, postings) over every term in the segment
+    def iter_terms(self):
+        for i in range(self.term_count):
+            yield self._term(i).decode("utf-8"), self.postings(i)
+
+    # Function to build a document mask from filters (None when there are none)
+    def filter_mask(self, author=None, start=None, end=None, account_id=None, prospect_id=None, kind=None):
+        columns = self.columns
+        mask = None
+
+        def narrow(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if author is not None:
+            authors = [author] if isinstance(author, str) else author
+            narrow(np.isin(columns["author"], [self._author_codes.get(name, -1) for name in authors]))
+        if start is not None:
+            narrow(columns["day"] >= date.fromisoformat(start).toordinal())
+        if end is not None:
+            narrow(columns["day"] <= date.fromisoformat(end).toordinal())
+        if account_id is not None:
+            accounts = [account_id] if isinstance(account_id, str) else account_id
+            narrow(np.isin(columns["account"], [int(account[3:]) for account in accounts]))
+        if prospect_id is not None:
+            prospects = [prospect_id] if isinstance(prospect_id, str) else prospect_id
+            narrow(np.isin(columns["prospect"], [int(prospect[4:]) for prospect in prospects]))
+        if kind is not None:
+            narrow(columns["kind"] == KINDS.index(kind))
+        return mask
+
+    # Function to get the local doc numbers matching every phrase and the filter mask
+    def search(self, phrases, mask):
+        tokens = sorted({token for phrase in phrases for token in phrase})
+        lists = []
+        for token in tokens:
+            i = self.term_index(token)
+            if i is None:
+                return []
+            lists.append((int(self.columns["df"][i]), token, i))
+        lists.sort()
+
+        candidates = None
+        if mask is not None:
+            allowed = np.flatnonzero(mask)
+            if not lists or len(allowed) < lists[0][0]:
+                candidates = allowed.tolist()
+        if not lists:
+            return candidates if candidates is not None else list(range(self.doc_count))
+
+        positions = {}
+        for _, token, i in lists:
+            found = self.postings(i).lookup(candidates)
+            positions[token] = found
+            candidates = sorted(found if candidates is None else set(candidates).intersection(found))
+            if not candidates:
+                return []
+        if mask is not None:
+            candidates = [doc for doc in candidates if mask[doc]]
+        return [doc for doc in candidates if all(_has_phrase(phrase, positions, doc) for phrase in phrases)]
+
+    # Function to describe one document as a search hit
+    def hit(self, doc):
+        columns = self.columns
+        kind = KINDS[columns["kind"][doc]]
+        prospect = int(columns["prospect"][doc])
+        return {
+            "type": kind,
+            "id": (str(uuid.UUID(bytes=columns["note"][doc].tobytes())) if kind == "note"
+                   else f"ACT{int(columns['activity'][doc]):04d}"),
+            "account_id": f"ACC{int(columns['account'][doc]):04d}",
+            "prospect_id": f"PROS{prospect:04d}" if prospect else None,
+            "author": self.authors[columns["author"][doc]],
+            "date": date.fromordinal(int(columns["day"][doc])).isoformat(),
+        }
+
+
+# Function to check whether a document contains a phrase (consecutive token positions)
+def _has_phrase(phrase, positions, doc):
+    if len(phrase) == 1:
+        return True
+    following = [set(positions[token][doc]) for token in phrase[1:]]
+    return any(all(start + k + 1 in found for k, found in enumerate(following))
+               for start in positions[phrase[0]][doc])
+
+
+class _SegmentBuilder:
+    """Documents and postings buffered in memory until they are written as a segment."""
+
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in
+                        (("kind", "B"), ("account", "I"), ("prospect", "I"), ("activity", "I"),
+                         ("author", "H"), ("day", "i"))}
+        self.notes = bytearray()
+        self.authors = []
+        self._author_codes = {}
+        self.postings = {}
+        self.doc_count = 0
+
+    def _author(self, author):
+        code = self._author_codes.get(author)
+        if code is None:
+            code = self._author_codes[author] = len(self.authors)
+            self.authors.append(author)
+        return code
+
+    # Function to add one document: its columns and the texts of its fields
+    def add(self, kind, account, prospect, activity, note, author, day, texts):
+        doc = self.doc_count
+        self.doc_count += 1
+        columns = self.columns
+        columns["kind"].append(kind)
+        columns["account"].append(account)
+        columns["prospect"].append(prospect)
+        columns["activity"].append(activity)
+        columns["author"].append(self._author(author))
+        columns["day"].append(day)
+        self.notes += note
+
+        term_positions = {}
+        position = 0
+        for text in texts:
+            for token in tokenize(text):
+                term_positions.setdefault(token, []).append(position)
+                position += 1
+            position += FIELD_GAP
+        for token, positions in term_positions.items():
+            entry = self.postings.get(token)
+            if entry is None:
+                entry = self.postings[token] = ([], [])
+            entry[0].append(doc)
+            entry[1].append(positions)
+
+    # Function to copy every document of a mapped segment into this builder (used by compact())
+    def add_segment(self, segment):
+        base = self.doc_count
+        author_codes = np.array([self._author(author) for author in segment.authors] or [0], dtype=np.uint16)
+        for name in ("kind", "account", "prospect", "activity", "day"):
+            self.columns[name].extend(segment.columns[name].tolist())
+        self.columns["author"].extend(author_codes[segment.columns["author"]].tolist())
+        self.notes += segment.columns["note"].tobytes()
+        self.doc_count += segment.doc_count
+        for term, postings in segment.iter_terms():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = ([], [])
+            for doc, positions in sorted(postings.lookup().items()):
+                entry[0].append(base + doc)
+                entry[1].append(positions)
+
+    def write(self, path):
+        terms = sorted(self.postings)
+        encoded_terms = [term.encode("utf-8") for term in terms]
+        term_offsets = np.zeros(len(terms) + 1, dtype="<u8")
+        term_offsets[1:] = np.cumsum([len(term) for term in encoded_terms])
+        postings = []
+        postings_offsets = np.zeros(len(terms) + 1, dtype="<u8")
+        for i, term in enumerate(terms):
+            postings.append(_encode_postings(*self.postings[term]))
+            postings_offsets[i + 1] = postings_offsets[i] + len(postings[-1])
+
+        data = [(name, np.asarray(self.columns[name], dtype=_COLUMN_DTYPES[name]).tobytes())
+                for name in ("kind", "account", "prospect", "activity", "author", "day")]
+        data += [
+            ("note", bytes(self.notes)),
+            ("term_offsets", term_offsets.tobytes()),
+            ("terms", b"".join(encoded_terms)),
+            ("postings_offsets", postings_offsets.tobytes()),
+            ("df", np.array([len(self.postings[term][0]) for term in terms], dtype="<u4").tobytes()),
+            ("postings", b"".join(postings)),
+        ]
+        layout = []
+        offset = 0
+        for name, blob in data:
+            offset = (offset + 7) & ~7
+            layout.append({"name": name, "offset": offset, "size": len(blob)})
+            offset += len(blob)
+        header = json.dumps({"docs": self.doc_count, "terms": len(terms), "authors": self.authors,
+                             "columns": layout}).encode("utf-8")
+        data_start = (len(MAGIC) + 4 + len(header) + 7) & ~7
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for entry, (_, blob) in zip(layout, data):
+                f.write(b"\0" * (data_start + entry["offset"] - f.tell()))
+                f.write(blob)
+
+
+class TextIndex:
+    """A directory of mapped segments plus a builder for documents not yet committed.
+
+    Searches see committed segments only; call commit() after adding records.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("format") != INDEX_FORMAT:
+                raise ValueError(f"{directory} is not a text index")
+        else:
+            manifest = {"format": INDEX_FORMAT, "segments": [], "next_segment": 1}
+        self.manifest = manifest
+        self.segments = [_Segment(os.path.join(directory, entry["file"])) for entry in manifest["segments"]]
+        self._builder = _SegmentBuilder()
+
+    @property
+    def doc_count(self):
+        return sum(segment.doc_count for segment in self.segments)
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _added(self):
+        if self._builder.doc_count >= SEGMENT_DOCS:
+            self.commit()
+
+    def add_accounts(self, accounts):
+        for account in accounts:
+            account_number = int(account["account_id"][3:])
+            for note in account.get("notes") or ():
+                self._builder.add(0, account_number, 0, 0, uuid.UUID(note["note_id"]).bytes, note["author"],
+                                  date.fromisoformat(note["date"]).toordinal(), [note["content"]])
+                self._added()
+
+    def add_activities(self, activities):
+        for activity in activities:
+            self._builder.add(1, int(activity["account_id"][3:]), int(activity["prospect_id"][4:]),
+                              int(activity["activity_id"][3:]), bytes(16), activity["assigned_to"],
+                              date.fromisoformat(activity["date"]).toordinal(),
+                              [activity["description"], activity["notes"]])
+            self._added()
+
+    def _write_manifest(self, segments):
+        self.manifest["segments"] = segments
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _write_segment(self, builder):
+        name = f"seg-{self.manifest['next_segment']:06d}.tseg"
+        self.manifest["next_segment"] += 1
+        builder.write(os.path.join(self.directory, name))
+        return {"file": name, "docs": builder.doc_count}
+
+    # Function to write buffered documents as a new segment and publish it in the manifest
+    def commit(self):
+        if not self._builder.doc_count:
+            return
+        entry = self._write_segment(self._builder)
+        self._builder = _SegmentBuilder()
+        self._write_manifest(self.manifest["segments"] + [entry])
+        self.segments.append(_Segment(os.path.join(self.directory, entry["file"])))
+
+    # Function to merge all committed segments into one
+    def compact(self):
+        if len(self.segments) < 2:
+            return
+        builder = _SegmentBuilder()
+        for segment in self.segments:
+            builder.add_segment(segment)
+        entry = self._write_segment(builder)
+        old = [entry["file"] for entry in self.manifest["segments"]]
+        self._write_manifest([entry])
+        self.close()
+        for name in old:
+            os.remove(os.path.join(self.directory, name))
+        self.segments = [_Segment(os.path.join(self.directory, entry["file"]))]
+
+    # Function to search: `query` is words (all must match) and "quoted phrases"; filters are
+    # author, start/end (ISO dates, inclusive), account_id, prospect_id (a value or list) and kind
+    # ("note"/"activity"). Returns hits newest first.
+    def search(self, query, limit=20, **filters):
+        phrases = parse_query(query)
+        hits = []
+        for segment in self.segments:
+            mask = segment.filter_mask(**filters)
+            if not phrases and mask is None:
+                raise ValueError("a search needs query words or at least one filter")
+            for doc in segment.search(phrases, mask):
+                hits.append((int(segment.columns["day"][doc]), segment, doc))
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        return [segment.hit(doc) for _, segment, doc in hits[:limit]], len(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or search a full-text index over notes and activities.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="add records to the index (creates it if needed)")
+    build.add_argument("--index", required=True, help="index directory")
+    build.add_argument("--accounts", help="accounts file whose notes to add")
+    build.add_argument("--activities", help="activities file to add")
+    compact = commands.add_parser("compact", help="merge all segments into one")
+    compact.add_argument("--index", required=True, help="index directory")
+    search = commands.add_parser("search", help="run a query")
+    search.add_argument("--index", required=True, help="index directory")
+    search.add_argument("query", nargs="?", default="", help='words and "quoted phrases"')
+    search.add_argument("--author", action="append", help="note author / activity assignee (repeatable)")
+    search.add_argument("--account", action="append", help="account_id (repeatable)")
+    search.add_argument("--prospect", action="append", help="prospect_id (repeatable)")
+    search.add_argument("--type", choices=KINDS, help="only notes or only activities")
+    search.add_argument("--start", help="first date (YYYY-MM-DD)")
+    search.add_argument("--end", help="last date (YYYY-MM-DD)")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with TextIndex(args.index) as index:
+        opened = time.perf_counter() - started
+        if args.command == "build":
+            if args.accounts:
+                index.add_accounts(iter_records(args.accounts))
+            if args.activities:
+                index.add_activities(iter_records(args.activities))
+            index.commit()
+            print(f"{index.doc_count:,} documents in {len(index.segments)} segments "
+                  f"({time.perf_counter() - started:.2f}s)")
+        elif args.command == "compact":
+            index.compact()
+            print(f"{index.doc_count:,} documents in {len(index.segments)} segments "
+                  f"({time.perf_counter() - started:.2f}s)")
+        else:
+            started = time.perf_counter()
+            hits, total = index.search(args.query, args.limit, author=args.author, start=args.start, end=args.end,
+                                       account_id=args.account, prospect_id=args.prospect, kind=args.type)
+            elapsed = time.perf_counter() - started
+            for hit in hits:
+                print(json.dumps(hit))
+            print(f"{total:,} matches; opened {len(index.segments)} segments in {opened * 1e3:.1f} ms, "
+                  f"query {elapsed * 1e3:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
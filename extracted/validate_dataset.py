@@ -0,0 +1,246 @@
+import argparse
+import sys
+import time
+from array import array
+from collections import Counter
+
+from generator_io import iter_records
+from generator_metrics import peak_rss
+
+# Streaming referential-integrity validator for generated datasets.
+#
+# Checks, in one pass over each file (accounts, then prospects, then activities):
+#
+#   - ACC/PROS/ACT IDs are well formed and unique
+#   - every note's related_contact is a contact of the same account
+#   - every prospect's account_id exists
+#   - every activity's prospect_id exists and its account_id matches that prospect's
+#
+# Indexes are keyed by the numeric ID suffix instead of holding ID strings:
+# seen IDs are bitmaps (1 bit per number) and the prospect -> account mapping
+# is an array('I') indexed by PROS number (4 bytes per prospect). At 10M rows
+# that is a few tens of MB, and records are only ever held one at a time.
+#
+#   python validate_dataset.py --accounts accounts.ndjson --prospects prospects.ndjson \
+#       --activities activities.ndjson
+
+SAMPLES_PER_KIND = 5
+
+
+class IdBitmap:
+    """A growable set of non-negative integers, one bit each."""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+
+    # Function to add a number; returns False if it was already present
+    def add(self, number):
+        byte, bit = number >> 3, 1 << (number & 7)
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(max(byte + 1 - len(self.bits), len(self.bits))))
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def __contains__(self, number):
+        byte = number >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (number & 7)))
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class IntMap:
+    """A growable array('I') mapping non-negative integer keys to positive integer values (0 = unset)."""
+
+    def __init__(self):
+        self.values = array("I")
+
+    def __setitem__(self, key, value):
+        if key >= len(self.values):
+            self.values.extend(bytes(4 * max(key + 1 - len(self.values), len(self.values))))
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values[key] if key < len(self.values) else 0
+
+    @property
+    def nbytes(self):
+        return len(self.values) * self.values.itemsize
+
+
+class Violations:
+    """Violation counts per kind, keeping the first few samples of each."""
+
+    def __init__(self, samples_per_kind=SAMPLES_PER_KIND):
+        self.samples_per_kind = samples_per_kind
+        self.counts = Counter()
+        self.samples = {}
+
+    def add(self, kind, record_id, detail):
+        self.counts[kind] += 1
+        samples = self.samples.setdefault(kind, [])
+        if len(samples) < self.samples_per_kind:
+            samples.append(f"{record_id}: {detail}")
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def to_dict(self):
+        return {kind: {"count": count, "samples": self.samples[kind]} for kind, count in sorted(self.counts.items())}
+
+
+# Function to parse the number of an ID like "PROS0042" (None if missing or malformed)
+def _number(record_id, prefix):
+    if type(record_id) is str and record_id.startswith(prefix):
+        digits = record_id[len(prefix):]
+        if digits.isdigit():
+            return int(digits)
+    return None
+
+
+class DatasetValidator:
+    """Streams accounts, prospects and activities (in that order) through the integrity checks."""
+
+    def __init__(self, samples_per_kind=SAMPLES_PER_KIND):
+        self.violations = Violations(samples_per_kind)
+        self.accounts = IdBitmap()
+        self.prospects = IdBitmap()
+        self.activities = IdBitmap()
+        self.prospect_accounts = IntMap()
+        self.records = Counter()
+        self.timings = {}
+
+    def check_accounts(self, accounts):
+        violations, seen = self.violations, self.accounts
+        count = notes = 0
+        for account in accounts:
+            count += 1
+            account_id = account.get("account_id")
+            number = _number(account_id, "ACC")
+            if number is None:
+                violations.add("malformed_account_id", account_id, "not ACC<digits>")
+            elif not seen.add(number):
+                violations.add("duplicate_account_id", account_id, "account ID seen before")
+
+            contacts = account.get("contacts") or ()
+            contact_ids = {contact.get("contact_id") for contact in contacts}
+            if len(contact_ids) != len(contacts):
+                violations.add("duplicate_contact_id", account_id, "two contacts share a contact_id")
+            for note in account.get("notes") or ():
+                notes += 1
+                if note.get("related_contact") not in contact_ids:
+                    violations.add("note_contact_not_on_account", account_id,
+                                   f"note {note.get('note_id')} -> contact {note.get('related_contact')}")
+        self.records["accounts"] += count
+        self.records["notes"] += notes
+
+    def check_prospects(self, prospects):
+        violations, seen, accounts, prospect_accounts = (
+            self.violations, self.prospects, self.accounts, self.prospect_accounts)
+        count = 0
+        for prospect in prospects:
+            count += 1
+            prospect_id = prospect.get("prospect_id")
+            number = _number(prospect_id, "PROS")
+            if number is None:
+                violations.add("malformed_prospect_id", prospect_id, "not PROS<digits>")
+                continue
+            first_seen = seen.add(number)
+            if not first_seen:
+                violations.add("duplicate_prospect_id", prospect_id, "prospect ID seen before")
+            account_number = _number(prospect.get("account_id"), "ACC")
+            if account_number is None or account_number not in accounts:
+                violations.add("prospect_account_missing", prospect_id, f"account {prospect.get('account_id')}")
+            elif first_seen and account_number:
+                # Activities are checked against the first prospect with this ID
+                prospect_accounts[number] = account_number
+        self.records["prospects"] += count
+
+    def check_activities(self, activities):
+        violations, seen, prospects, prospect_account = (
+            self.violations, self.activities, self.prospects, self.prospect_accounts.get)
+        count = 0
+        for activity in activities:
+            count += 1
+            activity_id = activity.get("activity_id")
+            number = _number(activity_id, "ACT")
+            if number is None:
+                violations.add("malformed_activity_id", activity_id, "not ACT<digits>")
+            elif not seen.add(number):
+                violations.add("duplicate_activity_id", activity_id, "activity ID seen before")
+
+            prospect_number = _number(activity.get("prospect_id"), "PROS")
+            if prospect_number is None or prospect_number not in prospects:
+                violations.add("activity_prospect_missing", activity_id, f"prospect {activity.get('prospect_id')}")
+                continue
+            account_number = prospect_account(prospect_number)
+            if account_number and _number(activity.get("account_id"), "ACC") != account_number:
+                violations.add("activity_account_mismatch", activity_id,
+                               f"account {activity.get('account_id')} but prospect {activity.get('prospect_id')} "
+                               f"belongs to ACC{account_number:04d}")
+        self.records["activities"] += count
+
+    # Function to run one check over a file, timing it
+    def check_file(self, kind, path):
+        started = time.perf_counter()
+        before = self.records[kind]
+        getattr(self, f"check_{kind}")(iter_records(path))
+        elapsed = time.perf_counter() - started
+        self.timings[kind] = (self.records[kind] - before, elapsed)
+
+    def index_bytes(self):
+        return (self.accounts.nbytes + self.prospects.nbytes + self.activities.nbytes
+                + self.prospect_accounts.nbytes)
+
+    def to_dict(self):
+        return {
+            "records": dict(self.records),
+            "violations": self.violations.to_dict(),
+            "total_violations": len(self.violations),
+            "index_bytes": self.index_bytes(),
+            "timings": {kind: {"records": records, "seconds": round(seconds, 3),
+                               "records_per_second": round(records / seconds) if seconds else 0}
+                        for kind, (records, seconds) in self.timings.items()},
+        }
+
+
+# Function to validate dataset files; returns the validator with its results
+def validate_files(accounts_path=None, prospects_path=None, activities_path=None, samples_per_kind=SAMPLES_PER_KIND):
+    validator = DatasetValidator(samples_per_kind)
+    for kind, path in (("accounts", accounts_path), ("prospects", prospects_path), ("activities", activities_path)):
+        if path:
+            validator.check_file(kind, path)
+    return validator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check referential integrity of generated accounts/prospects/activities.")
+    parser.add_argument("--accounts", default="accounts.json", help="accounts file (JSON array or NDJSON)")
+    parser.add_argument("--prospects", default="prospects.json", help="prospects file")
+    parser.add_argument("--activities", default="activities.json", help="activities file")
+    parser.add_argument("--samples", type=int, default=SAMPLES_PER_KIND, help="sample violations kept per kind")
+    args = parser.parse_args()
+
+    validator = validate_files(args.accounts, args.prospects, args.activities, args.samples)
+    for kind, (records, seconds) in validator.timings.items():
+        print(f"{kind:<11} {records:>12,} records in {seconds:7.2f}s ({records / seconds if seconds else 0:>10,.0f}/s)")
+    print(f"indexes {validator.index_bytes() / 1e6:.1f} MB, peak RSS {peak_rss() / 1e6:.1f} MB")
+
+    if not validator.violations:
+        print("OK: no violations")
+        return
+    print(f"{len(validator.violations):,} violations:")
+    for kind, entry in validator.violations.to_dict().items():
+        print(f"  {kind:<30} {entry['count']:>10,}")
+        for sample in entry["samples"]:
+            print(f"      {sample}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+import heapq
+import json
+import math
+import os
+from array import array
+from collections import Counter
+from datetime import date
+
+from generator_providers import reference_date
+
+# Workload distribution profiles for the generators.
+#
+# By default every count is uniform (1-3 contacts, 0-5 notes, 1-3 prospects,
+# 3-7 activities) and every owner/rep is equally likely, which never produces
+# the hot accounts and hot reps seen in production. A WorkloadProfile swaps in
+# other shapes for:
+#
+#   contacts_per_account, notes_per_account,      per-account fan-out
+#   prospects_per_account, activities_per_prospect
+#   account_owner, sales_rep                      per-owner assignment
+#   activity_recency                              days-ago of past activities
+#
+# Every draw is O(1) whatever the shape: Zipf uses Walker/Vose alias tables
+# built once per value range, log-normal and power-law use closed-form
+# transforms clipped to the range. The uniform shape makes exactly the
+# rng.randint()/rng.choice() calls the generators always made, so the
+# "uniform" profile reproduces the old output byte for byte.
+#
+# Profiles are presets (PROFILES) or JSON files of the same shape:
+#
+#   {"prospects_per_account": {"shape": "zipf:1.1", "range": [1, 200]},
+#    "sales_rep": "zipf:1.0", "activity_recency": "lognormal:5,1.2"}
+#
+# SkewSummary watches the generated records (bounded memory: a few bytes per
+# account) and reports top-k accounts by row count, fan-out percentiles, Gini
+# coefficients and owner/rep shares, so benchmark runs can be compared.
+
+
+class AliasTable:
+    """Walker/Vose alias table: samples index i with probability weights[i] / sum(weights) in O(1)."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * n / total for weight in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def sample(self, rng):
+        i = int(rng.random() * len(self.alias))
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+
+class Uniform:
+    """Every value in [lo, hi] (or every choice) equally likely; the generators' original behaviour."""
+
+    spec = "uniform"
+
+    def sample(self, rng, lo, hi):
+        return rng.randint(lo, hi)
+
+    def choose(self, rng, values):
+        return rng.choice(values)
+
+
+class _Shape:
+    # Function to pick from a list by drawing an index from the shape (earlier values are "hotter")
+    def choose(self, rng, values):
+        return values[self.sample(rng, 0, len(values) - 1)]
+
+
+class Zipf(_Shape):
+    """P(lo + r - 1) proportional to r ** -s for ranks r = 1 .. hi - lo + 1."""
+
+    def __init__(self, s=1.0):
+        self.s = s
+        self.spec = f"zipf:{s:g}"
+        self._tables = {}
+
+    def __getstate__(self):
+        return {"s": self.s, "spec": self.spec, "_tables": {}}
+
+    def sample(self, rng, lo, hi):
+        size = hi - lo + 1
+        table = self._tables.get(size)
+        if table is None:
+            table = self._tables[size] = AliasTable([rank ** -self.s for rank in range(1, size + 1)])
+        return lo + table.sample(rng)
+
+
+class LogNormal(_Shape):
+    """int(lognormal) with the given median and sigma, clipped to [lo, hi]."""
+
+    def __init__(self, median=3.0, sigma=1.0):
+        self.mu = math.log(median)
+        self.sigma = sigma
+        self.spec = f"lognormal:{median:g},{sigma:g}"
+
+    def sample(self, rng, lo, hi):
+        return min(hi, max(lo, int(rng.lognormvariate(self.mu, self.sigma))))
+
+
+class PowerLaw(_Shape):
+    """Discretized Pareto tail from lo: P(X >= lo + k) ~ (k + 1) ** -(alpha - 1), clipped to hi."""
+
+    def __init__(self, alpha=2.0):
+        if alpha <= 1:
+            raise ValueError("power-law alpha must be greater than 1")
+        self.alpha = alpha
+        self.spec = f"powerlaw:{alpha:g}"
+
+    def sample(self, rng, lo, hi):
+        return min(hi, lo - 1 + int((1.0 - rng.random()) ** (-1.0 / (self.alpha - 1))))
+
+
+SHAPES = {"uniform": Uniform, "zipf": Zipf, "lognormal": LogNormal, "powerlaw": PowerLaw}
+
+
+# Function to parse a shape spec like "zipf:1.2" or "lognormal:4,0.8"
+def parse_shape(spec):
+    name, _, params = spec.partition(":")
+    if name not in SHAPES:
+        raise ValueError(f"unknown distribution {name!r} (expected one of {', '.join(SHAPES)})")
+    try:
+        args = [float(value) for value in params.split(",")] if params else []
+        return SHAPES[name](*args)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid parameters for {name}: {params!r}")
+
+
+COUNT_SETTINGS = ["contacts_per_account", "notes_per_account", "prospects_per_account", "activities_per_prospect"]
+# Smallest range start a count setting accepts (notes are attributed to a contact, so every account needs one)
+MIN_COUNTS = {"contacts_per_account": 1}
+CHOICE_SETTINGS = ["account_owner", "sales_rep", "activity_recency"]
+
+
+class WorkloadProfile:
+    """Distribution shape (and optionally value range) for each skewable setting.
+
+    Settings that aren't given stay uniform over the generator's own range.
+    """
+
+    def __init__(self, name="uniform", settings=None):
+        self.name = name
+        self.shapes = {}
+        self.ranges = {}
+        for setting, value in (settings or {}).items():
+            if setting not in COUNT_SETTINGS and setting not in CHOICE_SETTINGS:
+                raise ValueError(f"unknown workload setting {setting!r}")
+            if isinstance(value, str):
+                value = {"shape": value}
+            self.shapes[setting] = parse_shape(value.get("shape", "uniform"))
+            if "range" in value:
+                if setting not in COUNT_SETTINGS:
+                    raise ValueError(f"{setting} takes no range")
+                lo, hi = value["range"]
+                if not MIN_COUNTS.get(setting, 0) <= lo <= hi:
+                    raise ValueError(f"invalid range for {setting}: {value['range']}")
+                self.ranges[setting] = (int(lo), int(hi))
+
+    def __repr__(self):
+        return f"WorkloadProfile({self.name!r})"
+
+    # Function to draw a count for a fan-out setting, within the profile's range or the generator's default
+    def count(self, setting, rng, default_range):
+        lo, hi = self.ranges.get(setting, default_range)
+        return self.shapes.get(setting, UNIFORM).sample(rng, lo, hi)
+
+    # Function to pick an owner/rep for an assignment setting
+    def choose(self, setting, rng, values):
+        return self.shapes.get(setting, UNIFORM).choose(rng, values)
+
+    # Function to get the shape used for a setting (Uniform if the profile doesn't set it)
+    def shape(self, setting):
+        return self.shapes.get(setting, UNIFORM)
+
+    def to_dict(self):
+        settings = {}
+        for setting, shape in self.shapes.items():
+            settings[setting] = {"shape": shape.spec}
+            if setting in self.ranges:
+                settings[setting]["range"] = list(self.ranges[setting])
+        return {"name": self.name, "settings": settings}
+
+
+UNIFORM = Uniform()
+
+PROFILES = {
+    "uniform": {},
+    # Heavy-tailed presets with roughly the uniform means (about 2 contacts, 2-3 notes, 2
+    # prospects, 5 activities) but long tails: a few hot accounts carry hundreds of rows,
+    # the first owners/reps in each list get most of the work and activity dates bunch up
+    # near today
+    "zipf": {
+        "contacts_per_account": {"shape": "zipf:2.2", "range": [1, 25]},
+        "notes_per_account": {"shape": "zipf:1.8", "range": [0, 60]},
+        "prospects_per_account": {"shape": "zipf:2.2", "range": [1, 200]},
+        "activities_per_prospect": {"shape": "zipf:1.9", "range": [1, 300]},
+        "account_owner": "zipf:1.0",
+        "sales_rep": "zipf:1.0",
+        "activity_recency": "zipf:0.8",
+    },
+    "lognormal": {
+        "contacts_per_account": {"shape": "lognormal:1.5,1", "range": [1, 25]},
+        "notes_per_account": {"shape": "lognormal:2,1", "range": [0, 60]},
+        "prospects_per_account": {"shape": "lognormal:1.5,1", "range": [1, 200]},
+        "activities_per_prospect": {"shape": "lognormal:3.5,1", "range": [1, 300]},
+        "account_owner": "lognormal:1.5,1",
+        "sales_rep": "lognormal:1.5,1",
+        "activity_recency": "lognormal:5,1.2",
+    },
+    "powerlaw": {
+        "contacts_per_account": {"shape": "powerlaw:2.5", "range": [1, 25]},
+        "notes_per_account": {"shape": "powerlaw:2.2", "range": [0, 60]},
+        "prospects_per_account": {"shape": "powerlaw:2.5", "range": [1, 200]},
+        "activities_per_prospect": {"shape": "powerlaw:2.1", "range": [1, 300]},
+        "account_owner": "powerlaw:1.8",
+        "sales_rep": "powerlaw:1.8",
+        "activity_recency": "powerlaw:1.6",
+    },
+}
+
+DEFAULT_PROFILE = WorkloadProfile()
+
+
+# Function to load a profile by preset name or from a JSON file
+def load_profile(name_or_path):
+    if name_or_path is None or isinstance(name_or_path, WorkloadProfile):
+        return name_or_path or DEFAULT_PROFILE
+    if name_or_path in PROFILES:
+        return WorkloadProfile(name_or_path, PROFILES[name_or_path])
+    if os.path.exists(name_or_path):
+        with open(name_or_path) as f:
+            settings = json.load(f)
+        return WorkloadProfile(os.path.basename(name_or_path), settings.get("settings", settings))
+    raise ValueError(f"unknown workload profile {name_or_path!r} (presets: {', '.join(PROFILES)})")
+
+
+# Function to add the --profile/--skew-report options to a generator CLI
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", default="uniform",
+                        help=f"workload distribution profile: {', '.join(PROFILES)} or a JSON file")
+    parser.add_argument("--skew-report", help="write the skew summary as JSON to this path")
+
+
+# Skew summary ------------------------------------------------------------------
+
+def _grow(counts, number):
+    if number >= len(counts):
+        counts.extend([0] * (number + 1 - len(counts)))
+
+
+# Function to compute the Gini coefficient of a {value: frequency} histogram (0 = even, 1 = one holder)
+def gini(histogram):
+    total_count = sum(histogram.values())
+    total_value = sum(value * count for value, count in histogram.items())
+    if not total_count or not total_value:
+        return 0.0
+    # Sum over sorted values of (2i - n - 1) * x_i, done per run of equal values
+    weighted = 0.0
+    position = 0
+    for value in sorted(histogram):
+        count = histogram[value]
+        first, last = position + 1, position + count
+        weighted += value * (count * (first + last) - count * (total_count + 1))
+        position = last
+    return weighted / (total_count * total_value)
+
+
+def _histogram_percentile(histogram, percent):
+    total = sum(histogram.values())
+    target = max(1, math.ceil(total * percent / 100))
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= target:
+            return value
+    return 0
+
+
+def _distribution(histogram):
+    total = sum(histogram.values())
+    return {
+        "mean": round(sum(value * count for value, count in histogram.items()) / total, 3) if total else 0,
+        "p50": _histogram_percentile(histogram, 50),
+        "p90": _histogram_percentile(histogram, 90),
+        "p99": _histogram_percentile(histogram, 99),
+        "max": max(histogram, default=0),
+        "gini": round(gini(histogram), 4),
+    }
+
+
+def _shares(counter, top_k):
+    total = sum(counter.values())
+    return [{"name": name, "count": count, "share": round(count / total, 4)}
+            for name, count in counter.most_common(top_k)]
+
+
+class SkewSummary:
+    """Streaming skew statistics for a generated dataset.
+
+    Per-account counts live in arrays indexed by the ACC number (4 bytes per
+    account per counter), owners/reps/dates in small Counters, so memory stays
+    bounded however many rows flow through. Wrap the account and prospect-group
+    streams with observe_accounts()/observe_groups().
+    """
+
+    def __init__(self, top_k=10, today=None):
+        self.top_k = top_k
+        self.today = today or reference_date()
+        self.contacts = array("I")
+        self.notes = array("I")
+        self.prospects = array("I")
+        self.activities = array("I")
+        self.owners = Counter()
+        self.reps = Counter()
+        self.activity_dates = Counter()
+
+    # Function to pass accounts through while counting their contacts, notes and owners
+    def observe_accounts(self, accounts):
+        for account in accounts:
+            number = int(account["account_id"][3:])
+            _grow(self.contacts, number)
+            _grow(self.notes, number)
+            self.contacts[number] = len(account["contacts"])
+            self.notes[number] = len(account["notes"])
+            self.owners[account["account_owner"]] += 1
+            yield account
+
+    # Function to pass (prospect, activities) groups through while counting per-account fan-out
+    def observe_groups(self, groups):
+        for prospect, activities in groups:
+            number = int(prospect["account_id"][3:])
+            _grow(self.prospects, number)
+            _grow(self.activities, number)
+            self.prospects[number] += 1
+            self.activities[number] += len(activities)
+            self.reps[prospect["assigned_to"]] += len(activities)
+            for activity in activities:
+                if activity["status"] != "Scheduled":
+                    self.activity_dates[activity["date"]] += 1
+            yield prospect, activities
+
+    def _rows(self, number):
+        total = 0
+        for counts in (self.notes, self.prospects, self.activities):
+            if number < len(counts):
+                total += counts[number]
+        return total
+
+    def to_dict(self):
+        accounts = max(len(self.contacts), len(self.prospects), 1) - 1
+        numbers = range(1, accounts + 1)
+        rows = Counter(self._rows(number) for number in numbers)
+        total_rows = sum(value * count for value, count in rows.items())
+
+        top = heapq.nlargest(self.top_k, numbers, key=self._rows)
+        top_accounts = [{
+            "account_id": f"ACC{number:04d}",
+            "rows": self._rows(number),
+            "notes": self.notes[number] if number < len(self.notes) else 0,
+            "prospects": self.prospects[number] if number < len(self.prospects) else 0,
+            "activities": self.activities[number] if number < len(self.activities) else 0,
+        } for number in top]
+
+        one_percent = heapq.nlargest(max(1, accounts // 100), (self._rows(number) for number in numbers))
+        days_ago = Counter()
+        for day, count in self.activity_dates.items():
+            days_ago[(self.today - date.fromisoformat(day)).days] += count
+        past = sum(days_ago.values())
+
+        return {
+            "accounts": accounts,
+            "rows": total_rows,
+            "rows_per_account": _distribution(rows),
+            "top_1pct_row_share": round(sum(one_percent) / total_rows, 4) if total_rows else 0,
+            "contacts_per_account": _distribution(Counter(self.contacts[1:])),
+            "notes_per_account": _distribution(Counter(self.notes[1:])),
+            "prospects_per_account": _distribution(Counter(self.prospects[1:])),
+            "activities_per_account": _distribution(Counter(self.activities[1:])),
+            "top_accounts": top_accounts,
+            "top_owners_by_accounts": _shares(self.owners, self.top_k),
+            "top_reps_by_activities": _shares(self.reps, self.top_k),
+            "activity_days_ago": {
+                "p50": _histogram_percentile(days_ago, 50) if past else 0,
+                "p90": _histogram_percentile(days_ago, 90) if past else 0,
+                "within_1_day": round(sum(c for d, c in days_ago.items() if d <= 1) / past, 4) if past else 0,
+                "within_7_days": round(sum(c for d, c in days_ago.items() if d <= 7) / past, 4) if past else 0,
+            },
+        }
+
+    # Function to print a short human-readable summary (and optionally write the full one as JSON)
+    def report(self, profile=None, path=None):
+        summary = self.to_dict()
+        if profile is not None:
+            summary = dict(profile=profile.to_dict(), **summary)
+        rows = summary["rows_per_account"]
+        print(f"Skew: rows/account mean {rows['mean']} p50 {rows['p50']} p99 {rows['p99']} max {rows['max']} "
+              f"(gini {rows['gini']}); top 1% of accounts hold {summary['top_1pct_row_share']:.1%} of rows")
+        print("  top accounts: " + ", ".join(f"{a['account_id']} ({a['rows']})" for a in summary["top_accounts"][:5]))
+        if summary["top_reps_by_activities"]:
+            print("  top reps: " + ", ".join(f"{r['name']} {r['share']:.1%}"
+                                             for r in summary["top_reps_by_activities"][:3]))
+        if path:
+            with open(path, "w") as f:
+                json.dump(summary, f, indent=2)
+        return summary
+